@@ -13,24 +13,29 @@ from cms.utils.conf import get_cms_setting
 from cms.utils.i18n import force_language, get_language_list, get_language_object, get_language_tuple
 from cms.utils.urlutils import admin_reverse
 from django.contrib import admin, messages
+from django.contrib.admin import helpers
 from django.contrib.admin.models import CHANGE, LogEntry
 from django.contrib.admin.utils import get_deleted_objects
+from django.contrib.admin.views.main import ChangeList
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import PermissionDenied, ValidationError
 from django.db import router, transaction
-from django.http import Http404, HttpResponseForbidden, HttpResponseRedirect
+from django.http import Http404, HttpResponseForbidden, HttpResponseRedirect, JsonResponse
 from django.shortcuts import get_object_or_404, render
 from django.template.defaultfilters import escape
 from django.template.loader import get_template
+from django.template.response import TemplateResponse
 from django.urls import path
 from django.utils.decorators import method_decorator
 from django.utils.encoding import force_str
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators.http import require_POST
 
-from ..api import add_content
+from ..api import add_content, delete_articles, publish_articles, unpublish_articles
 from ..conf import settings
-from ..models import Article, Title
+from ..models import Article, PublishJob, Title
+from ..queue import enqueue, get_backend, get_status
+from ..search import match_title_prefixes
 from .forms import ArticleCreateForm, ArticleForm
 
 require_POST = method_decorator(require_POST)
@@ -38,6 +43,13 @@ require_POST = method_decorator(require_POST)
 _thread_locals = local()
 
 
+class ArticleChangeList(ChangeList):
+    def get_queryset(self, request):
+        return (
+            super().get_queryset(request).for_listing(languages=get_language_list(), description=False, taxonomy=False)
+        )
+
+
 class ArticleAdmin(PlaceholderAdminMixin, admin.ModelAdmin):
     change_list_template = "admin/cms_articles/article_changelist.html"
     search_fields = ("=id", "title_set__slug", "title_set__title", "title_set__description")
@@ -47,6 +59,7 @@ class ArticleAdmin(PlaceholderAdminMixin, admin.ModelAdmin):
     list_filter = ["tree", "attributes", "categories", "template", "changed_by"]
     date_hierarchy = "order_date"
     filter_horizontal = ["attributes", "categories"]
+    actions = ["publish_selected", "unpublish_selected", "delete_selected_articles"]
 
     preview_template = "admin/cms_articles/article/change_list_preview.html"
 
@@ -85,6 +98,68 @@ class ArticleAdmin(PlaceholderAdminMixin, admin.ModelAdmin):
             return lang_dropdown
         raise AttributeError(name)
 
+    def has_publish_permission(self, request):
+        return request.user.has_perm("cms_articles.publish_article")
+
+    def publish_selected(self, request, queryset):
+        language = get_language_from_request(request)
+        count = publish_articles(queryset, [language], changed_by=request.user)
+        self.message_user(
+            request,
+            _("%(count)d articles were successfully published in %(language)s.")
+            % {"count": count, "language": get_language_object(language)["name"]},
+        )
+
+    publish_selected.short_description = _("Publish selected articles")
+    publish_selected.allowed_permissions = ("publish",)
+
+    def unpublish_selected(self, request, queryset):
+        language = get_language_from_request(request)
+        count = unpublish_articles(queryset, [language], changed_by=request.user)
+        self.message_user(
+            request,
+            _("%(count)d articles were successfully unpublished in %(language)s.")
+            % {"count": count, "language": get_language_object(language)["name"]},
+        )
+
+    unpublish_selected.short_description = _("Unpublish selected articles")
+    unpublish_selected.allowed_permissions = ("publish",)
+
+    def delete_selected_articles(self, request, queryset):
+        """
+        Unlike the default delete_selected action, the confirmation page does not list all the related objects
+        and the articles are deleted in bulk (see cms_articles.api.delete_articles).
+        The deletions are recorded in the admin log, as by the default action.
+        """
+        if request.POST.get("post"):
+            count = delete_articles(queryset, deleted_by=request.user)
+            self.message_user(request, _("%(count)d articles were successfully deleted.") % {"count": count})
+            return None
+        context = {
+            **self.admin_site.each_context(request),
+            "title": _("Are you sure?"),
+            "opts": self.model._meta,
+            "count": queryset.count(),
+            # the whole changelist may be selected without listing the ids
+            "pks": None if request.POST.get("select_across") == "1" else list(queryset.values_list("pk", flat=True)),
+            "action_checkbox_name": helpers.ACTION_CHECKBOX_NAME,
+            "media": self.media,
+        }
+        request.current_app = self.admin_site.name
+        return TemplateResponse(request, "admin/cms_articles/article/delete_selected_confirmation.html", context)
+
+    delete_selected_articles.short_description = _("Delete selected articles")
+    delete_selected_articles.allowed_permissions = ("delete",)
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        # replaced by delete_selected_articles
+        actions.pop("delete_selected", None)
+        return actions
+
+    def get_changelist(self, request, **kwargs):
+        return ArticleChangeList
+
     def get_fieldsets(self, request, obj=None):
         language_dependent = [
             "title",
@@ -118,6 +193,7 @@ class ArticleAdmin(PlaceholderAdminMixin, admin.ModelAdmin):
             make_path("<int:article_id>/delete-translation/", self.delete_translation),
             make_path("<int:article_id>/<language>/publish/", self.publish_article),
             make_path("<int:article_id>/<language>/unpublish/", self.unpublish),
+            make_path("<int:article_id>/<language>/publish-status/", self.publish_status),
             make_path("<int:article_id>/<language>/preview/", self.preview_article),
         ]
 
@@ -134,6 +210,23 @@ class ArticleAdmin(PlaceholderAdminMixin, admin.ModelAdmin):
             )
         )
 
+    def get_search_results(self, request, queryset, search_term):
+        """
+        The autocomplete widgets (e.g. of ArticlePlugin) search the draft titles by the prefixes of their words
+        (see cms_articles.search.match_title_prefixes), so that they don't scan the whole title table
+        on each keystroke. The changelist uses all the search_fields.
+        """
+        resolver_match = getattr(request, "resolver_match", None)
+        if (
+            resolver_match is None
+            or resolver_match.url_name != "autocomplete"
+            or not search_term.strip()
+            or search_term.strip().isdigit()
+        ):
+            return super().get_search_results(request, queryset, search_term)
+        titles = match_title_prefixes(search_term, site=settings.SITE_ID, drafts=True).order_by()
+        return queryset.filter(pk__in=Title.objects.filter(pk__in=titles.values("title")).values("article")), False
+
     def save_model(self, request, obj, form, change):
         new = obj.id is None
         super().save_model(request, obj, form, change)
@@ -256,10 +349,15 @@ class ArticleAdmin(PlaceholderAdminMixin, admin.ModelAdmin):
             article = None
 
         # ensure user has permissions to publish this article
+        queued = False
         if article:
             if not self.has_change_permission(request):
                 return HttpResponseForbidden(_("You do not have permission to publish this article"))
-            article.publish(language)
+            if get_backend():
+                enqueue(article, language, changed_by=request.user)
+                queued = True
+            else:
+                article.publish(language)
         statics = request.GET.get("statics", "")
         if not statics and not article:
             raise Http404("No article or stack found for publishing.")
@@ -273,7 +371,10 @@ class ArticleAdmin(PlaceholderAdminMixin, admin.ModelAdmin):
                     all_published = False
         if article:
             if all_published:
-                messages.info(request, _("The content was successfully published."))
+                if queued:
+                    messages.info(request, _("The article was queued for publishing."))
+                else:
+                    messages.info(request, _("The content was successfully published."))
                 LogEntry.objects.log_action(
                     user_id=request.user.id,
                     content_type_id=ContentType.objects.get_for_model(Article).pk,
@@ -298,7 +399,7 @@ class ArticleAdmin(PlaceholderAdminMixin, admin.ModelAdmin):
         if admin_reverse("index") not in referrer:
             if all_published:
                 if article:
-                    if article.get_publisher_state(language) == PUBLISHER_STATE_PENDING:
+                    if queued or article.get_publisher_state(language) == PUBLISHER_STATE_PENDING:
                         path = article.get_absolute_url(language, fallback=True)
                     else:
                         public_article = Article.objects.get(publisher_public=article.pk)
@@ -325,11 +426,18 @@ class ArticleAdmin(PlaceholderAdminMixin, admin.ModelAdmin):
         if not article.publisher_public_id:
             return HttpResponseForbidden(_("This article was never published"))
         try:
-            article.unpublish(language)
-            message = _('The %(language)s article "%(article)s" was successfully unpublished') % {
-                "language": get_language_object(language)["name"],
-                "article": article,
-            }
+            if get_backend():
+                enqueue(article, language, PublishJob.ACTION_UNPUBLISH, changed_by=request.user)
+                message = _('The %(language)s article "%(article)s" was queued for unpublishing') % {
+                    "language": get_language_object(language)["name"],
+                    "article": article,
+                }
+            else:
+                article.unpublish(language)
+                message = _('The %(language)s article "%(article)s" was successfully unpublished') % {
+                    "language": get_language_object(language)["name"],
+                    "article": article,
+                }
             messages.info(request, message)
             LogEntry.objects.log_action(
                 user_id=request.user.id,
@@ -354,6 +462,16 @@ class ArticleAdmin(PlaceholderAdminMixin, admin.ModelAdmin):
             )
         return HttpResponseRedirect(path)
 
+    def publish_status(self, request, article_id, language):
+        """
+        Returns the status of the latest publish job of the article as JSON,
+        so that the toolbar can poll it after the publishing was queued.
+        """
+        article = get_object_or_404(self.model, pk=article_id, publisher_is_draft=True)
+        if not self.has_change_permission(request, article):
+            raise PermissionDenied
+        return JsonResponse({"job": get_status(article, language), "dirty": article.is_dirty(language)})
+
     def delete_translation(self, request, object_id, extra_context=None):
         if "language" in request.GET:
             language = request.GET["language"]
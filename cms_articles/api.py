@@ -6,20 +6,41 @@ WARNING: None of the functions defined in this module checks for permissions.
 You must implement the necessary permission checks in your own code before
 calling these methods!
 """
+
 import datetime
+from collections import Counter, defaultdict
+from functools import reduce
+from operator import or_
 
 from cms.api import add_plugin
+from cms.constants import PUBLISHER_STATE_DEFAULT, PUBLISHER_STATE_DIRTY
+from cms.models import CMSPlugin, Placeholder
+from cms.signals import post_publish, post_unpublish
 from cms.utils.i18n import get_language_list
 from cms.utils.permissions import current_user
+from django.contrib.admin.models import DELETION, LogEntry
+from django.contrib.contenttypes.models import ContentType
 from django.db import transaction
+from django.db.models import Q, QuerySet
 from django.template.defaultfilters import slugify
 from django.template.loader import get_template
 from django.utils.encoding import force_str
 from django.utils.timezone import now
+from django.utils.translation import get_language
 from djangocms_text.cms_plugins import TextPlugin
 
+from .cache import bump_generations, deferred_generations
 from .conf import settings
-from .models import Article, Title
+from .constants import LANGUAGE_STATE_DRAFT, LANGUAGE_STATE_PUBLISHED
+from .dispatch import (
+    bulk_publishing,
+    deleting,
+    post_delete_articles,
+    post_publish_articles,
+    post_unpublish_articles,
+    publishing,
+)
+from .models import Article, CategoryClosure, Title
 
 
 @transaction.atomic
@@ -200,3 +221,346 @@ def publish_article(article, language, changed_by=None):
         article.publish(language)
 
     return article.reload()
+
+
+def publish_articles(articles, languages=None, changed_by=None, chunk_size=None):
+    """
+    Publish many articles at once. This does the same as calling `publish()`
+    for each of the given draft articles and each of their languages (or the given languages only),
+    but it uses bulk queries and processes the articles in chunks, each in its own transaction.
+
+    The `post_publish` signal is sent for each article and language, when the chunk is committed,
+    followed by the `post_publish_articles` signal with all the articles of the chunk.
+
+    Returns the number of published articles.
+    """
+    return _process_in_chunks(
+        _publish_chunk, post_publish, post_publish_articles, articles, languages, changed_by, chunk_size
+    )
+
+
+def unpublish_articles(articles, languages=None, changed_by=None, chunk_size=None):
+    """
+    Unpublish many articles at once. This does the same as calling `unpublish()`
+    for each of the given draft articles and each of their published languages (or the given languages only),
+    but it uses bulk queries and processes the articles in chunks, each in its own transaction.
+
+    The `post_unpublish` signal is sent for each article and language, when the chunk is committed,
+    followed by the `post_unpublish_articles` signal with all the articles of the chunk.
+
+    Returns the number of unpublished articles.
+    """
+    return _process_in_chunks(
+        _unpublish_chunk, post_unpublish, post_unpublish_articles, articles, languages, changed_by, chunk_size
+    )
+
+
+def delete_articles(articles, chunk_size=None, deleted_by=None):
+    """
+    Deletes given articles (both the draft and the public versions)
+    with their titles, placeholders and plugins, processing them in chunks.
+    Each chunk is deleted in a single transaction using a fixed number of queries
+    (one or few per model) regardless of the number of articles, plugins or placeholders.
+    If deleted_by (a user) is given, the deletion of the draft articles is recorded in the admin log.
+    The post_delete_articles signal is sent once, when all the articles are deleted.
+    Returns the number of deleted (draft) articles.
+    """
+    return len(_delete_articles(articles, chunk_size, deleted_by)[0])
+
+
+def _delete_articles(articles, chunk_size=None, deleted_by=None):
+    """
+    Returns the pks of the deleted draft articles and the number of deleted objects per model label.
+    """
+    if not isinstance(articles, QuerySet):
+        articles = Article.objects.filter(pk__in=[article.pk for article in articles])
+    pks = list(
+        Article.objects.filter(Q(pk__in=articles.values("pk")) | Q(publisher_public__in=articles.values("pk")))
+        .filter(publisher_is_draft=True)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    chunk_size = chunk_size or settings.CMS_ARTICLES_PUBLISH_CHUNK_SIZE
+
+    deleted, trees, counts = [], set(), Counter()
+    for i in range(0, len(pks), chunk_size):
+        with transaction.atomic(), deleting():
+            if deleted_by is not None:
+                _log_deletion(pks[i : i + chunk_size], deleted_by)
+            chunk_deleted, chunk_trees, scopes, chunk_counts = _delete_chunk(pks[i : i + chunk_size])
+        bump_generations(*scopes)
+        deleted += chunk_deleted
+        trees.update(chunk_trees)
+        counts.update(chunk_counts)
+    if deleted:
+        post_delete_articles.send(sender=Article, pks=deleted, trees=trees)
+    return pks, counts
+
+
+def _log_deletion(pks, user):
+    # the same records as written by ModelAdmin.log_deletion, using one query for the titles and one insert
+    titles = {}
+    for article_id, language, title in (
+        Title.objects.filter(article__in=pks)
+        .order_by("article", "language")
+        .values_list("article", "language", "title")
+    ):
+        if article_id not in titles or language == get_language():
+            titles[article_id] = title
+    content_type = ContentType.objects.get_for_model(Article)
+    LogEntry.objects.bulk_create(
+        [
+            LogEntry(
+                user_id=user.pk,
+                content_type=content_type,
+                object_id=str(pk),
+                object_repr=titles.get(pk, str(pk))[:200],
+                action_flag=DELETION,
+            )
+            for pk in pks
+        ]
+    )
+
+
+def _delete_chunk(pks):
+    articles = Article.objects.filter(Q(pk__in=pks) | Q(publisher_public__in=pks))
+    # the cached content, which may contain the articles (see signals.article._bump_article_generations)
+    article_trees = list(articles.values_list("pk", "tree_id"))
+    trees = {tree_id for pk, tree_id in article_trees}
+    categories = set(
+        CategoryClosure.objects.filter(
+            descendant__in=Article.categories.through.objects.filter(article__in=articles).values("category")
+        ).values_list("ancestor", flat=True)
+    )
+    scopes = ["articles"]
+    scopes += ["tree:{}".format(tree_id) for tree_id in trees]
+    scopes += ["slugs:{}".format(tree_id) for tree_id in trees]
+    scopes += ["category:{}".format(pk) for pk in categories]
+
+    placeholders = list(
+        Article.placeholders.through.objects.filter(article__in=articles).values_list("placeholder", flat=True)
+    )
+    counts = Counter()
+    # the whole plugin trees are deleted, so there is no need for the tree maintenance
+    # done by treebeard's MP_NodeQuerySet.delete (which is one query per plugin)
+    counts.update(QuerySet.delete(CMSPlugin.objects.filter(placeholder__in=placeholders))[1])
+    counts.update(Placeholder.objects.filter(pk__in=placeholders).delete()[1])
+    # bypass ArticleQuerySet.delete, which calls this function
+    counts.update(QuerySet.delete(articles)[1])
+    return [pk for pk, tree_id in article_trees], trees, scopes, counts
+
+
+def _process_in_chunks(process_chunk, signal, batch_signal, articles, languages, changed_by, chunk_size):
+    if not isinstance(articles, QuerySet):
+        articles = Article.objects.filter(pk__in=[article.pk for article in articles])
+    pks = list(articles.filter(publisher_is_draft=True).order_by("pk").values_list("pk", flat=True))
+    chunk_size = chunk_size or settings.CMS_ARTICLES_PUBLISH_CHUNK_SIZE
+
+    # get username
+    if changed_by:
+        username = changed_by.get_username()
+    else:
+        username = "script"
+
+    processed = 0
+    for i in range(0, len(pks), chunk_size):
+        with transaction.atomic(), publishing():
+            drafts, article_languages = process_chunk(pks[i : i + chunk_size], languages, username)
+        # the receivers are called only when the chunk is committed,
+        # and the cached content is invalidated once for the whole chunk
+        with deferred_generations():
+            with bulk_publishing():
+                for draft in drafts:
+                    for language in sorted(article_languages[draft.pk]):
+                        signal.send(sender=Article, instance=draft, language=language)
+            if drafts:
+                batch_signal.send(
+                    sender=Article,
+                    articles=drafts,
+                    languages=sorted(set().union(*article_languages.values())),
+                )
+        processed += len(drafts)
+    return processed
+
+
+def _filter_by_language(lookup, articles_by_language):
+    """
+    Returns Q object matching the objects of given articles (ids) in the respective languages.
+    """
+    return reduce(or_, (Q(language=language, **{lookup: pks}) for language, pks in articles_by_language.items()))
+
+
+def _delete_plugins(articles_by_language):
+    """
+    Deletes all the plugins of given articles (ids) in the respective languages.
+    """
+    if not articles_by_language:
+        return
+    # the whole plugin trees are deleted, so there is no need for the tree maintenance
+    # done by treebeard's MP_NodeQuerySet.delete (which is one query per plugin)
+    plugins = CMSPlugin.objects.filter(_filter_by_language("placeholder__cms_articles__in", articles_by_language))
+    QuerySet.delete(plugins)
+
+
+def _bulk_create(model, objs, key):
+    """
+    Creates given objects and sets their primary keys (even on databases, which do not return them),
+    using the given unique field to find them.
+    """
+    model.objects.bulk_create(objs)
+    missing = {getattr(obj, key): obj for obj in objs if obj.pk is None}
+    if missing:
+        for value, pk in model.objects.filter(**{key + "__in": missing}).values_list(key, "pk"):
+            missing[value].pk = pk
+
+
+def _publish_chunk(pks, languages, username):
+    current_time = now()
+
+    draft_titles = Title.objects.filter(article__in=pks)
+    if languages is not None:
+        draft_titles = draft_titles.filter(language__in=languages)
+    draft_titles = list(draft_titles)
+    article_languages = defaultdict(list)
+    for title in draft_titles:
+        article_languages[title.article_id].append(title.language)
+    drafts = list(Article.objects.filter(pk__in=article_languages).select_related("publisher_public").order_by("pk"))
+
+    # update the draft and the public articles
+    publics = {}
+    for draft in drafts:
+        if not draft.publication_date:
+            draft.publication_date = current_time
+        draft.order_date = draft.publication_date
+        draft.changed_by = username
+        draft.changed_date = current_time
+        published_states = {language: LANGUAGE_STATE_PUBLISHED for language in article_languages[draft.pk]}
+        draft.language_states = dict(draft.language_states, **published_states)
+        if draft.publisher_public_id:
+            public = draft.publisher_public
+        else:
+            public = Article(created_by=draft.created_by, publisher_public=draft, publisher_is_draft=False)
+        draft._copy_attributes(public)
+        public.order_date = public.publication_date
+        public.live = public.in_publication_window(current_time)
+        public.languages = ",".join(sorted(set(public.get_languages()).union(article_languages[draft.pk])))
+        public.language_states = dict(public.language_states, **published_states)
+        public.changed_by = username
+        public.changed_date = current_time
+        publics[draft.pk] = public
+    new_publics = [public for public in publics.values() if public.pk is None]
+    Article.objects.bulk_update(
+        [public for public in publics.values() if public.pk],
+        [
+            "tree",
+            "template",
+            "publication_date",
+            "publication_end_date",
+            "login_required",
+            "order_date",
+            "live",
+            "languages",
+            "language_states",
+            "changed_by",
+            "changed_date",
+        ],
+    )
+    _bulk_create(Article, new_publics, "publisher_public_id")
+    for draft in drafts:
+        draft.publisher_public = publics[draft.pk]
+    Article.objects.bulk_update(
+        drafts, ["publication_date", "order_date", "language_states", "changed_by", "changed_date", "publisher_public"]
+    )
+
+    # copy the titles
+    title_fields = [
+        field.attname
+        for field in Title._meta.concrete_fields
+        if field.name not in ("id", "article", "publisher_is_draft", "publisher_public", "publisher_state", "published")
+    ]
+    public_titles = {
+        (title.article_id, title.language): title
+        for title in Title.objects.filter(
+            article__in=[public.pk for public in publics.values()],
+            language__in={title.language for title in draft_titles},
+        )
+    }
+    new_titles, old_titles = [], []
+    for title in draft_titles:
+        public = publics[title.article_id]
+        public_title = public_titles.get((public.pk, title.language)) or Title(article=public)
+        for field in title_fields:
+            setattr(public_title, field, getattr(title, field))
+        public_title.publisher_is_draft = False
+        public_title.publisher_public_id = title.pk
+        public_title.publisher_state = PUBLISHER_STATE_DEFAULT
+        public_title.published = True
+        (old_titles if public_title.pk else new_titles).append(public_title)
+    Title.objects.bulk_update(
+        old_titles, title_fields + ["publisher_is_draft", "publisher_public", "publisher_state", "published"]
+    )
+    _bulk_create(Title, new_titles, "publisher_public_id")
+    public_titles = {public_title.publisher_public_id: public_title for public_title in old_titles + new_titles}
+    for title in draft_titles:
+        title.publisher_public = public_titles[title.pk]
+        title.publisher_state = PUBLISHER_STATE_DEFAULT
+        title.published = True
+    Title.objects.bulk_update(draft_titles, ["publisher_public", "publisher_state", "published"])
+
+    # copy the contents (only the changed plugins are copied)
+    for draft in drafts:
+        for language in article_languages[draft.pk]:
+            draft._copy_contents(publics[draft.pk], language)
+
+    # copy the relations
+    public_pks = [public.pk for public in publics.values()]
+    for relation in ("attributes", "categories"):
+        field = Article._meta.get_field(relation)
+        through = field.remote_field.through
+        source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+        through.objects.filter(**{source + "__in": public_pks}).delete()
+        through.objects.bulk_create(
+            through(**{source + "_id": publics[article_id].pk, target + "_id": related_id})
+            for article_id, related_id in through.objects.filter(**{source + "__in": drafts}).values_list(
+                source, target
+            )
+        )
+
+    return drafts, article_languages
+
+
+def _unpublish_chunk(pks, languages, username):
+    current_time = now()
+
+    titles = Title.objects.filter(article__in=pks, published=True)
+    if languages is not None:
+        titles = titles.filter(language__in=languages)
+    titles = list(titles.values_list("pk", "article_id", "language"))
+    article_languages = defaultdict(list)
+    for title_id, article_id, language in titles:
+        article_languages[article_id].append(language)
+    drafts = list(Article.objects.filter(pk__in=article_languages).select_related("publisher_public").order_by("pk"))
+    publics = {draft.pk: draft.publisher_public_id for draft in drafts}
+
+    articles_by_language = defaultdict(list)
+    for title_id, article_id, language in titles:
+        articles_by_language[language].append(publics[article_id])
+    Title.objects.filter(pk__in=[title[0] for title in titles]).update(
+        published=False, publisher_state=PUBLISHER_STATE_DIRTY
+    )
+    if articles_by_language:
+        Title.objects.filter(_filter_by_language("article__in", articles_by_language)).update(published=False)
+    _delete_plugins(articles_by_language)
+    for draft in drafts:
+        draft_states = {language: LANGUAGE_STATE_DRAFT for language in article_languages[draft.pk]}
+        draft.language_states = dict(draft.language_states, **draft_states)
+        public = draft.publisher_public
+        public.language_states = dict(public.language_states, **draft_states)
+        for article in (draft, public):
+            article.changed_by = username
+            article.changed_date = current_time
+    Article.objects.bulk_update(
+        drafts + [draft.publisher_public for draft in drafts], ["language_states", "changed_by", "changed_date"]
+    )
+
+    return drafts, article_languages
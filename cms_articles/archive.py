@@ -1,15 +1,30 @@
-import calendar
+from collections import OrderedDict
 from datetime import date
 
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.functions import TruncDay
 from django.utils.functional import cached_property
+from django.utils.timezone import get_current_timezone_name, is_aware, localtime
 
+from .cache import get_generations, make_key
 from .conf import settings
 
 
 class Archive:
-    def __init__(self, articles, request):
+    """
+    Archive of given articles.
+
+    The whole (year, month, day) -> count histogram is computed using single
+    grouped query and it may be cached (if cache_key is given) until some
+    article is published or unpublished.
+    Only the periods containing some articles are provided to templates.
+    """
+
+    def __init__(self, articles, request, cache_key=None):
         self.articles = articles
         self.request = request
+        self.cache_key = cache_key
         self.year = self.month = self.day = None
         try:
             self.year = int(request.GET[settings.CMS_ARTICLES_YEAR_FIELD])
@@ -28,15 +43,79 @@ class Archive:
                     articles = articles.filter(order_date__day=self.day)
         return articles
 
+    def get_day_counts(self):
+        """
+        Returns queryset of (day, count) rows grouped by the day of order_date.
+        """
+        return (
+            self.articles.order_by()
+            .annotate(archive_day=TruncDay("order_date"))
+            .values_list("archive_day")
+            .annotate(count=Count("pk", distinct=True))
+        )
+
+    def get_histogram(self):
+        """
+        Returns list of (date, count) tuples ordered from the newest date.
+        Dates are computed in the current time zone.
+        """
+        counts = OrderedDict()
+        for day, count in self.get_day_counts():
+            if is_aware(day):
+                day = localtime(day)
+            day = day.date()
+            counts[day] = counts.get(day, 0) + count
+        return sorted(counts.items(), reverse=True)
+
+    @cached_property
+    def histogram(self):
+        if self.cache_key is None:
+            return self.get_histogram()
+        # the days are computed in the current time zone
+        key = make_key("archive", self.cache_key, get_current_timezone_name(), *get_generations("articles"))
+        histogram = cache.get(key)
+        if histogram is None:
+            histogram = self.get_histogram()
+            cache.set(key, histogram, settings.CMS_ARTICLES_ARCHIVE_CACHE_TIMEOUT)
+        return histogram
+
+    @cached_property
+    def tree(self):
+        years = OrderedDict()
+        for day, count in self.histogram:
+            months = years.setdefault(day.year, OrderedDict())
+            days = months.setdefault(day.month, OrderedDict())
+            days[day.day] = count
+        return years
+
+    @cached_property
+    def count(self):
+        return sum(count for day, count in self.histogram)
+
+    @cached_property
+    def selected_count(self):
+        """
+        The number of articles in the selected period.
+        """
+        if not self.year:
+            return self.count
+        months = self.tree.get(self.year, {})
+        if not self.month:
+            return sum(sum(days.values()) for days in months.values())
+        days = months.get(self.month, {})
+        if not self.day:
+            return sum(days.values())
+        return days.get(self.day, 0)
+
     @cached_property
     def last(self):
         try:
-            return self.articles.last().order_date
-        except AttributeError:
+            return self.histogram[-1][0]
+        except IndexError:
             return date.today()
 
     def years(self):
-        for year in range(date.today().year, self.last.year - 1, -1):
+        for year in self.tree:
             yield YearArchive(year, self)
 
     @cached_property
@@ -54,16 +133,12 @@ class YearArchive:
         self.articles = archive.articles.filter(order_date__year=year)
         self.active = archive.year == year
 
+    @cached_property
+    def count(self):
+        return sum(sum(days.values()) for days in self.archive.tree.get(self.year, {}).values())
+
     def months(self):
-        if self.year == date.today().year:
-            first = date.today().month
-        else:
-            first = 12
-        if self.year == self.archive.last.year:
-            last = self.archive.last.month
-        else:
-            last = 1
-        for month in range(first, last, -1):
+        for month in self.archive.tree.get(self.year, {}):
             yield MonthArchive(month, self)
 
     @cached_property
@@ -84,18 +159,18 @@ class MonthArchive:
         self.month = month
         self.year_archive = year_archive
         self.articles = year_archive.articles.filter(order_date__month=month)
-        self.active = year_archive.archive.month == month
+        self.active = year_archive.active and year_archive.archive.month == month
+
+    @cached_property
+    def day_counts(self):
+        return self.year_archive.archive.tree.get(self.year_archive.year, {}).get(self.month, {})
+
+    @cached_property
+    def count(self):
+        return sum(self.day_counts.values())
 
     def days(self):
-        if self.year == date.today().year and self.month == date.today().month:
-            first = date.today().day
-        else:
-            first = calendar.monthrange(self.year_archive.year, self.month)[1]
-        if self.year == self.year_archive.archive.last.year and self.month == self.year_archive.archive.last.month:
-            last = self.year_archive.archive.last.day
-        else:
-            last = 1
-        for day in range(first, last, -1):
+        for day in self.day_counts:
             yield DayArchive(day, self)
 
     @cached_property
@@ -118,7 +193,11 @@ class DayArchive:
         self.day = day
         self.month_archive = month_archive
         self.articles = month_archive.articles.filter(order_date__day=day)
-        self.active = month_archive.year_archive.archive.day == day
+        self.active = month_archive.active and month_archive.year_archive.archive.day == day
+
+    @cached_property
+    def count(self):
+        return self.month_archive.day_counts.get(self.day, 0)
 
     @cached_property
     def date(self):
@@ -0,0 +1,12 @@
+"""
+Benchmarks of the most frequent operations on synthetic data.
+
+Run them using the management command, which creates a temporary SQLite test database::
+
+    python manage.py cms_articles_benchmark --articles 10000 --trees 3 --output results.json
+"""
+
+from .data import build_dataset
+from .runner import run_benchmarks
+
+__all__ = ["build_dataset", "run_benchmarks"]
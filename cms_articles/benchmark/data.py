@@ -0,0 +1,100 @@
+import random
+from datetime import timedelta
+
+from cms.api import create_page, create_title as create_page_title
+from cms.utils.conf import get_cms_setting
+from cms.utils.i18n import get_language_list
+from django.utils.timezone import now
+
+from ..api import add_content, create_article, create_title
+from ..conf import settings
+from ..models import Article, Attribute, Category
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore et dolore "
+    "magna aliqua enim ad minim veniam quis nostrud exercitation ullamco laboris nisi aliquip ex ea commodo consequat"
+).split()
+
+
+class Dataset:
+    """
+    Synthetic articles together with the trees, categories and attributes they belong to.
+    """
+
+    def __init__(self, params, languages, trees, categories, attributes, articles):
+        self.params = params
+        self.languages = languages
+        self.trees = trees
+        self.categories = categories
+        self.attributes = attributes
+        self.articles = articles
+
+    def public_articles(self):
+        return Article.objects.public().filter(publisher_public__in=self.articles)
+
+
+def _words(rng, count):
+    return " ".join(rng.choice(WORDS) for i in range(count))
+
+
+def _create_page(title, languages, **kwargs):
+    page = create_page(title=title, template=get_cms_setting("TEMPLATES")[0][0], language=languages[0], **kwargs)
+    for language in languages[1:]:
+        create_page_title(language=language, title=title, page=page)
+    for language in languages:
+        page.publish(language)
+    return page
+
+
+def build_dataset(articles=1000, trees=1, languages=1, categories=10, attributes=5, seed=0, progress=None):
+    """
+    Creates given number of published articles with random dates, titles, content,
+    categories and attributes, spread across given number of trees and languages.
+    Optional callable `progress` is called with the number of articles created so far.
+    """
+    params = dict(
+        articles=articles, trees=trees, languages=languages, categories=categories, attributes=attributes, seed=seed
+    )
+    rng = random.Random(seed)
+    languages = get_language_list()[:languages]
+    template = settings.CMS_ARTICLES_TEMPLATES[0][0]
+
+    tree_pages = [
+        _create_page(
+            "Articles {}".format(i), languages, apphook="CMSArticlesApp", apphook_namespace="articles-{}".format(i)
+        )
+        for i in range(trees)
+    ]
+
+    # random tree of category pages
+    category_pages = []
+    for i in range(categories):
+        parent = rng.choice(category_pages) if category_pages and rng.random() < 0.7 else None
+        category_pages.append(_create_page("Category {}".format(i), languages, parent=parent))
+    category_objects = [Category.objects.create(page=page) for page in category_pages]
+
+    attribute_objects = [Attribute.objects.create(name="Attribute {}".format(i)) for i in range(attributes)]
+
+    article_objects = []
+    current_time = now()
+    for i in range(articles):
+        article = create_article(
+            tree=rng.choice(tree_pages),
+            template=template,
+            title=_words(rng, 5),
+            language=languages[0],
+            description=_words(rng, 30),
+            publication_date=current_time - timedelta(minutes=rng.randrange(5 * 365 * 24 * 60)),
+            attributes=rng.sample(attribute_objects, min(len(attribute_objects), rng.randrange(3))),
+            categories=rng.sample(category_objects, min(len(category_objects), rng.randrange(3))),
+        )
+        for language in languages[1:]:
+            create_title(article=article, language=language, title=_words(rng, 5), description=_words(rng, 30))
+        for language in languages:
+            add_content(article, language, "content", "<p>{}</p>".format(_words(rng, 200)))
+            article.publish(language)
+        article_objects.append(article)
+        if progress and (i + 1) % 100 == 0:
+            progress(i + 1)
+
+    return Dataset(params, languages, tree_pages, category_objects, attribute_objects, article_objects)
@@ -0,0 +1,207 @@
+import math
+import platform
+import random
+import time
+from importlib import metadata
+
+import cms
+import django
+from cms.api import add_plugin, create_page
+from cms.plugin_rendering import ContentRenderer
+from cms.utils.conf import get_cms_setting
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connection, reset_queries
+from django.template import Context
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+
+from .. import views
+from ..archive import Archive
+from ..cms_plugins import ArticlesPlugin
+from ..models import Article, Title
+from .data import WORDS
+
+
+def percentile(values, percent):
+    """
+    Returns the percentile of given values using the nearest-rank method.
+    """
+    values = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+def measure(func, repeat, setup=None):
+    """
+    Calls func(i) for i in range(repeat) and returns the statistics
+    of latencies (in milliseconds) and numbers of queries.
+    Optional setup(i) is called before each call and it is not measured.
+    """
+    latencies = []
+    queries = []
+    for i in range(repeat):
+        if setup:
+            setup(i)
+        # the log of queries has limited length
+        reset_queries()
+        with CaptureQueriesContext(connection) as context:
+            start = time.perf_counter()
+            func(i)
+            latencies.append((time.perf_counter() - start) * 1000)
+        queries.append(len(context.captured_queries))
+    return {
+        "repeat": repeat,
+        "latency_ms": {
+            "min": min(latencies),
+            "p50": percentile(latencies, 50),
+            "p90": percentile(latencies, 90),
+            "p99": percentile(latencies, 99),
+            "max": max(latencies),
+            "mean": sum(latencies) / repeat,
+        },
+        "queries": {
+            "min": min(queries),
+            "p50": percentile(queries, 50),
+            "max": max(queries),
+        },
+    }
+
+
+def _get_request(path="/", **params):
+    request = RequestFactory().get(path, params)
+    request.user = AnonymousUser()
+    request.session = {}
+    return request
+
+
+def bench_article_detail(dataset, rng, repeat):
+    articles = list(dataset.public_articles().select_related("tree"))
+    if not articles:
+        return {"skipped": "no published articles"}
+
+    def func(i):
+        article = rng.choice(articles)
+        request = _get_request(article.get_absolute_url())
+        request.current_page = article.tree
+        views.article(request, article.get_slug()).render()
+
+    return measure(func, repeat)
+
+
+def _bench_plugin(dataset, rng, repeat, cached):
+    page = create_page(title="Benchmark", template=get_cms_setting("TEMPLATES")[0][0], language=dataset.languages[0])
+    placeholder = page.placeholders.get(slot="content")
+    plugin = add_plugin(placeholder, ArticlesPlugin, dataset.languages[0], number=10)
+
+    def setup(i):
+        if not cached:
+            cache.clear()
+
+    def func(i):
+        request = _get_request("/benchmark/", page=rng.randint(1, 5))
+        request.current_page = page
+        ContentRenderer(request).render_plugin(plugin, Context({"request": request}))
+
+    # warm up the cache
+    cache.clear()
+    for i in range(5):
+        func(i)
+    return measure(func, repeat, setup)
+
+
+def bench_articles_plugin(dataset, rng, repeat):
+    return _bench_plugin(dataset, rng, repeat, cached=False)
+
+
+def bench_articles_plugin_cached(dataset, rng, repeat):
+    return _bench_plugin(dataset, rng, repeat, cached=True)
+
+
+def bench_archive(dataset, rng, repeat):
+    articles = Article.objects.public().published()
+
+    def func(i):
+        archive = Archive(articles, _get_request())
+        for year in archive.years():
+            for month in year.months():
+                for day in month.days():
+                    day.count
+
+    return measure(func, repeat)
+
+
+def bench_publish(dataset, rng, repeat):
+    articles = rng.sample(dataset.articles, min(repeat, len(dataset.articles)))
+    if not articles:
+        return {"skipped": "no articles"}
+    language = dataset.languages[0]
+    unpublish = measure(lambda i: articles[i % len(articles)].reload().unpublish(language), repeat)
+    # publish the same articles again
+    publish = measure(lambda i: articles[i % len(articles)].reload().publish(language), repeat)
+    return {"unpublish": unpublish, "publish": publish}
+
+
+def bench_search(dataset, rng, repeat):
+    def func(i):
+        list(Article.objects.search(rng.choice(WORDS), language=dataset.languages[0]))
+
+    return measure(func, repeat)
+
+
+def bench_title_index(dataset, rng, repeat):
+    try:
+        from ..search_indexes import TitleIndex
+    except ImportError as e:
+        return {"skipped": str(e)}
+
+    index = TitleIndex()
+    language = dataset.languages[0]
+    titles = list(index.get_index_queryset(language)[:repeat])
+    if not titles:
+        return {"skipped": "no published titles in {}".format(language)}
+
+    return measure(lambda i: index.full_prepare(titles[i % len(titles)]), repeat)
+
+
+BENCHMARKS = {
+    "article_detail": bench_article_detail,
+    "articles_plugin": bench_articles_plugin,
+    "articles_plugin_cached": bench_articles_plugin_cached,
+    "archive": bench_archive,
+    "publish": bench_publish,
+    "search": bench_search,
+    "title_index": bench_title_index,
+}
+
+
+def _get_version(package):
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def run_benchmarks(dataset, repeat=100, seed=0, benchmarks=None):
+    """
+    Runs given benchmarks (all by default) on given dataset.
+    Returns JSON serializable dictionary with the results.
+    """
+    rng = random.Random(seed)
+    results = {}
+    for name in benchmarks or BENCHMARKS:
+        results[name] = BENCHMARKS[name](dataset, rng, repeat)
+    return {
+        "created": now().isoformat(),
+        "versions": {
+            "cms_articles": _get_version("django-cms-articles"),
+            "cms": cms.__version__,
+            "django": django.get_version(),
+            "python": platform.python_version(),
+        },
+        "database": connection.vendor,
+        "dataset": dict(dataset.params, titles=Title.objects.filter(publisher_is_draft=False).count()),
+        "repeat": repeat,
+        "benchmarks": results,
+    }
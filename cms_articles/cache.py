@@ -0,0 +1,77 @@
+import hashlib
+import time
+from contextlib import contextmanager
+from threading import local
+
+from django.core.cache import cache
+
+KEY_PREFIX = "cms_articles"
+
+_deferred = local()
+
+
+def _generation_key(scope):
+    return "{}:generation:{}".format(KEY_PREFIX, scope)
+
+
+def _new_generation():
+    # use the current time, so that a generation lost by the cache backend
+    # is never reused by accident
+    return int(time.time() * 1000)
+
+
+def get_generations(*scopes):
+    """
+    Returns a tuple with the current generation of each of the given scopes.
+    """
+    keys = [_generation_key(scope) for scope in scopes]
+    generations = cache.get_many(keys)
+    missing = {key: _new_generation() for key in keys if key not in generations}
+    for key, generation in missing.items():
+        if cache.add(key, generation, None):
+            generations[key] = generation
+        else:
+            generations[key] = cache.get(key, generation)
+    return tuple(generations[key] for key in keys)
+
+
+def bump_generations(*scopes):
+    """
+    Invalidates all cache entries depending on any of the given scopes.
+    """
+    scopes_bumped_later = getattr(_deferred, "scopes", None)
+    if scopes_bumped_later is not None:
+        scopes_bumped_later.update(scopes)
+        return
+    for scope in scopes:
+        key = _generation_key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _new_generation(), None)
+
+
+@contextmanager
+def deferred_generations():
+    """
+    Collects the scopes bumped within the block and bumps each of them only once, when the block is left.
+    """
+    if getattr(_deferred, "scopes", None) is not None:
+        # nested block, the outermost one does the job
+        yield
+        return
+    _deferred.scopes = set()
+    try:
+        yield
+    finally:
+        scopes, _deferred.scopes = _deferred.scopes, None
+        bump_generations(*scopes)
+
+
+def make_key(name, *parts):
+    """
+    Returns cache key for given name and parts.
+    Parts are hashed to keep the key short and safe for all cache backends.
+    """
+    digest = hashlib.md5(":".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return "{}:{}:{}".format(KEY_PREFIX, name, digest)
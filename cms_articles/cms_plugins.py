@@ -1,11 +1,16 @@
 from cms.plugin_base import CMSPluginBase
 from cms.plugin_pool import plugin_pool
+from django.core.cache import cache
 from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
-from django.utils.translation import gettext_lazy as _
+from django.template.loader import get_template
+from django.utils.timezone import get_current_timezone_name
+from django.utils.translation import get_language, gettext_lazy as _
 
 from .archive import Archive
+from .cache import get_generations, make_key
 from .conf import settings
 from .models import ArticlePlugin, ArticlesCategoryPlugin, ArticlesPlugin
+from .pagination import CursorPaginator
 
 
 class ArticlePlugin(CMSPluginBase):
@@ -14,7 +19,8 @@ class ArticlePlugin(CMSPluginBase):
     model = ArticlePlugin
     cache = False
     text_enabled = True
-    raw_id_fields = ["article"]
+    # the admin search of the articles uses the prefixes of the titles (see ArticleAdmin.get_search_results)
+    autocomplete_fields = ["article"]
 
     def render(self, context, instance, placeholder):
         context.update(
@@ -40,26 +46,53 @@ class ArticlesPlugin(CMSPluginBase):
     cache = False
     text_enabled = True
 
+    cache_params = (
+        settings.CMS_ARTICLES_PAGE_FIELD,
+        settings.CMS_ARTICLES_CURSOR_FIELD,
+        settings.CMS_ARTICLES_YEAR_FIELD,
+        settings.CMS_ARTICLES_MONTH_FIELD,
+        settings.CMS_ARTICLES_DAY_FIELD,
+    )
+
     def render(self, context, instance, placeholder):
+        cache_key = self.get_cache_key(context, instance)
+        if cache_key is None:
+            return self.render_articles(context, instance, placeholder)
+
+        content = cache.get(cache_key)
+        if content is None:
+            self.render_articles(context, instance, placeholder)
+            template = get_template(self._get_render_template(context, instance, placeholder))
+            content = template.render(context.flatten())
+            cache.set(cache_key, content, settings.CMS_ARTICLES_PLUGIN_CACHE_TIMEOUT)
+        context["cached_content"] = content
+        return context
+
+    def render_articles(self, context, instance, placeholder):
         # get articles based on plugin settings
         articles = instance.get_articles(context)
 
         # provide archive
-        archive = Archive(articles, context["request"])
+        archive = Archive(articles, context["request"], cache_key=self.get_archive_cache_key(context, instance))
 
         # filter articles based on query
-        articles = archive.filter_articles()
+        articles = archive.filter_articles().for_listing()
 
         # paginate articles
-        paginator = Paginator(articles, instance.number)
-        try:
-            articles = paginator.page(context["request"].GET.get(settings.CMS_ARTICLES_PAGE_FIELD, 1))
-        except PageNotAnInteger:
-            # If page is not an integer, deliver first page.
-            articles = paginator.page(1)
-        except EmptyPage:
-            # If page is out of range (e.g. 9999), deliver last page of results.
-            articles = paginator.page(paginator.num_pages)
+        if instance.pagination == instance.PAGINATION_CURSOR:
+            # the count is taken from the archive, which is cached
+            paginator = CursorPaginator(articles, instance.number, count=lambda: archive.selected_count)
+            articles = paginator.page(context["request"].GET.get(settings.CMS_ARTICLES_CURSOR_FIELD))
+        else:
+            paginator = Paginator(articles, instance.number)
+            try:
+                articles = paginator.page(context["request"].GET.get(settings.CMS_ARTICLES_PAGE_FIELD, 1))
+            except PageNotAnInteger:
+                # If page is not an integer, deliver first page.
+                articles = paginator.page(1)
+            except EmptyPage:
+                # If page is out of range (e.g. 9999), deliver last page of results.
+                articles = paginator.page(paginator.num_pages)
         articles.page_field = settings.CMS_ARTICLES_PAGE_FIELD
 
         context.update(
@@ -73,8 +106,51 @@ class ArticlesPlugin(CMSPluginBase):
         return context
 
     def get_render_template(self, context, instance, placeholder):
+        if "cached_content" in context:
+            return "cms_articles/articles/cached.html"
         return "cms_articles/articles/%s.html" % instance.template
 
+    def get_archive_cache_key(self, context, instance):
+        try:
+            edit_mode = context["request"].toolbar.edit_mode_active
+        except (AttributeError, KeyError):
+            edit_mode = False
+
+        # drafts may change without being published
+        if edit_mode:
+            return None
+        return "{}:{}".format(instance.pk, instance.changed_date.isoformat())
+
+    def get_cache_scopes(self, instance):
+        key = make_key("plugin-scopes", instance.pk, instance.changed_date.isoformat())
+        scopes = cache.get(key)
+        if scopes is None:
+            scopes = instance.get_cache_scopes()
+            cache.set(key, scopes, settings.CMS_ARTICLES_PLUGIN_CACHE_TIMEOUT)
+        return scopes
+
+    def get_cache_key(self, context, instance):
+        """
+        Returns the key of rendered content or None, if the content should not be cached.
+        The key depends on the plugin, language, time zone (of the rendered dates), request parameters
+        and the generations of the plugin cache scopes, which change whenever relevant article is (un)published.
+        """
+        if not settings.CMS_ARTICLES_PLUGIN_CACHE_TIMEOUT:
+            return None
+        archive_key = self.get_archive_cache_key(context, instance)
+        if archive_key is None:
+            return None
+        request = context["request"]
+        return make_key(
+            "plugin",
+            archive_key,
+            get_language(),
+            get_current_timezone_name(),
+            request.path,
+            *(request.GET.get(param, "") for param in self.cache_params),
+            *get_generations(*self.get_cache_scopes(instance)),
+        )
+
 
 plugin_pool.register_plugin(ArticlesPlugin)
 
@@ -7,6 +7,9 @@ from cms.utils.urlutils import add_url_parameters, admin_reverse
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
+from .models import PublishJob
+from .queue import get_active_jobs, get_backend
+
 
 @toolbar_pool.register
 class CMSArticlesToolbar(CMSToolbar):
@@ -45,6 +48,16 @@ class CMSArticlesToolbar(CMSToolbar):
             classes = ["cms-btn-action", "cms-btn-publish", "cms-btn-publish-active", "cms-publish-article"]
 
             title = _("Publish article now")
+            # the publishing was queued and the status can be polled at the publish-status url,
+            # the stale running jobs don't disable the button (see cms_articles.queue.get_active_jobs)
+            job = None
+            if get_backend() is not None:
+                job = get_active_jobs().filter(article=self.article, language=self.current_lang).last()
+            if job is not None:
+                if job.action == PublishJob.ACTION_UNPUBLISH:
+                    title = _("Unpublishing article...")
+                else:
+                    title = _("Publishing article...")
 
             params = {}
             params["redirect"] = self.request.path_info
@@ -54,7 +67,9 @@ class CMSArticlesToolbar(CMSToolbar):
 
             url = add_url_parameters(url, params)
 
-            self.toolbar.add_button(title, url=url, extra_classes=classes, side=self.toolbar.RIGHT, disabled=False)
+            self.toolbar.add_button(
+                title, url=url, extra_classes=classes, side=self.toolbar.RIGHT, disabled=job is not None
+            )
 
     def request_hook(self):
         pass
@@ -24,6 +24,72 @@ CMS_ARTICLES_SLOT = "content"
 CMS_ARTICLES_USE_HAYSTACK = True
 
 CMS_ARTICLES_PAGE_FIELD = "page"
+CMS_ARTICLES_CURSOR_FIELD = "cursor"
 CMS_ARTICLES_YEAR_FIELD = "year"
 CMS_ARTICLES_MONTH_FIELD = "month"
 CMS_ARTICLES_DAY_FIELD = "day"
+
+# how long (in seconds) to cache the archive of articles plugins
+# the cache is invalidated whenever an article is published or unpublished
+CMS_ARTICLES_ARCHIVE_CACHE_TIMEOUT = 3600
+
+# how long (in seconds) to cache the rendered content of articles plugins (use 0 to disable)
+# the cache is invalidated whenever a relevant article is published or unpublished
+# and it never outlives the moment, when some article goes live or expires
+CMS_ARTICLES_PLUGIN_CACHE_TIMEOUT = 600
+
+# how long (in seconds) to cache the resolution of article slugs (including the unknown ones)
+# the cache is invalidated whenever an article in the tree is published, unpublished, changed or deleted
+CMS_ARTICLES_SLUG_CACHE_TIMEOUT = 3600
+
+# how many articles to process in a single transaction
+# when publishing or unpublishing articles in bulk (see cms_articles.api.publish_articles)
+CMS_ARTICLES_PUBLISH_CHUNK_SIZE = 100
+
+# dotted path of the backend used to publish articles from the admin in the background
+# (see cms_articles.queue), or None to publish them within the request
+CMS_ARTICLES_PUBLISH_QUEUE = None
+
+# number of threads used by cms_articles.queue.ThreadPoolBackend
+CMS_ARTICLES_PUBLISH_QUEUE_WORKERS = 2
+
+# how long (in minutes) a publish job may be running, before it is considered stale (e.g. its worker was killed)
+CMS_ARTICLES_PUBLISH_QUEUE_TIMEOUT = 30
+
+# how many queued titles to update in the search index at once (see cms_articles.search_indexes)
+CMS_ARTICLES_INDEX_BATCH_SIZE = 100
+
+# the weights of the title fields in the built-in search (see cms_articles.search),
+# "content" is the text of the plugins with search_fields
+CMS_ARTICLES_SEARCH_WEIGHTS = {
+    "title": 10,
+    "description": 3,
+    "meta_description": 3,
+    "content": 1,
+}
+
+# language specific tokenizers used by the built-in search, e.g. {"de": "myproject.search.german_tokenize"},
+# the tokenizer is called with text and language and returns a list of tokens (see cms_articles.search.tokenize)
+CMS_ARTICLES_SEARCH_TOKENIZERS = {}
+
+# the autocomplete of the article titles (see cms_articles.views.autocomplete)
+# the minimal length of the query, the maximal number of results,
+# and how long (in seconds) the public results may be cached by the browsers and proxies
+CMS_ARTICLES_AUTOCOMPLETE_MIN_LENGTH = 2
+CMS_ARTICLES_AUTOCOMPLETE_LIMIT = 10
+CMS_ARTICLES_AUTOCOMPLETE_CACHE_TIMEOUT = 300
+
+# the processors computing the content derived from the published titles (see cms_articles.content),
+# each processor is called with the title, its plugins and the TitleContent to update
+CMS_ARTICLES_CONTENT_PROCESSORS = [
+    "cms_articles.content.extract_text",
+    "cms_articles.content.count_words",
+    "cms_articles.content.make_excerpt",
+    "cms_articles.content.find_image",
+]
+
+# used to compute the reading time of the articles
+CMS_ARTICLES_WORDS_PER_MINUTE = 200
+
+# the number of words of the excerpt made of the content, when the title has no description
+CMS_ARTICLES_EXCERPT_WORDS = 50
@@ -0,0 +1,8 @@
+# The publication states of the languages of an article (see Article.language_states)
+LANGUAGE_STATE_DRAFT = "draft"
+LANGUAGE_STATE_DIRTY = "dirty"
+LANGUAGE_STATE_PUBLISHED = "published"
+LANGUAGE_STATE_PENDING = "pending"
+
+# the states of the published languages
+PUBLISHED_LANGUAGE_STATES = (LANGUAGE_STATE_DIRTY, LANGUAGE_STATE_PUBLISHED, LANGUAGE_STATE_PENDING)
@@ -0,0 +1,129 @@
+"""
+Content derived from the published titles.
+
+When an article is published, the processors configured in CMS_ARTICLES_CONTENT_PROCESSORS are called
+for each published title with its plugins and the TitleContent to update, e.g.:
+
+    def count_links(title, plugins, content):
+        content.data["links"] = content.text.count("http")
+
+The results are stored in the TitleContent table, so that the templates and the built-in search
+don't need to process the plugins again (see Article.get_derived_content).
+The haystack index (see cms_articles.search_indexes) still renders the plugins of the searchable placeholders,
+as the plain text is made of the search_fields of all the plugins only.
+"""
+
+import html
+import math
+import re
+from collections import defaultdict
+
+from cms.models import CMSPlugin
+from django.db.models import ForeignKey
+from django.utils.html import strip_tags
+from django.utils.module_loading import import_string
+from django.utils.text import Truncator
+
+from .conf import settings
+from .models import Article, Title, TitleContent
+from .utils.plugins import _downcast
+
+
+def get_processors():
+    return [import_string(path) for path in settings.CMS_ARTICLES_CONTENT_PROCESSORS]
+
+
+def html_to_text(value):
+    """
+    Returns the plain text of given HTML with the whitespace collapsed.
+    """
+    return re.sub(r"\s+", " ", html.unescape(strip_tags(str(value or "")))).strip()
+
+
+def get_title_plugins(titles):
+    """
+    Returns the plugins of given titles in the order of the placeholders and the plugin tree: {title: [plugins]}.
+    The plugins are loaded using one query for all the titles and one query per plugin type.
+    """
+    placeholder_articles = dict(
+        Article.placeholders.through.objects.filter(article__in={title.article_id for title in titles}).values_list(
+            "placeholder", "article"
+        )
+    )
+    plugins = CMSPlugin.objects.filter(
+        placeholder__in=list(placeholder_articles), language__in={title.language for title in titles}
+    ).order_by("placeholder", "path")
+    article_plugins = defaultdict(list)
+    for plugin in _downcast(list(plugins)):
+        article_plugins[placeholder_articles[plugin.placeholder_id], plugin.language].append(plugin)
+    return {title: article_plugins[title.article_id, title.language] for title in titles}
+
+
+def extract_text(title, plugins, content):
+    """
+    Extracts the plain text of the plugins with search_fields.
+    """
+    content.text = " ".join(
+        filter(
+            None,
+            (
+                html_to_text(getattr(plugin, field))
+                for plugin in plugins
+                for field in getattr(plugin, "search_fields", ())
+            ),
+        )
+    )
+
+
+def count_words(title, plugins, content):
+    """
+    Counts the words of the extracted text and estimates the reading time (in minutes).
+    """
+    content.word_count = len(content.text.split())
+    content.reading_time = math.ceil(content.word_count / settings.CMS_ARTICLES_WORDS_PER_MINUTE)
+
+
+def make_excerpt(title, plugins, content):
+    """
+    Makes the excerpt of the description, or of the extracted text, if there is no description.
+    """
+    content.excerpt = html_to_text(title.description) or Truncator(content.text).words(
+        settings.CMS_ARTICLES_EXCERPT_WORDS
+    )
+
+
+def find_image(title, plugins, content):
+    """
+    Finds the image of the title, or the first image used by the plugins.
+    """
+    content.image_id = title.image_id
+    image_model = Title._meta.get_field("image").related_model
+    for plugin in plugins:
+        if content.image_id:
+            break
+        for field in plugin._meta.concrete_fields:
+            if isinstance(field, ForeignKey) and issubclass(field.related_model, image_model):
+                content.image_id = getattr(plugin, field.attname)
+                if content.image_id:
+                    break
+
+
+def update_title_content(articles, languages=None):
+    """
+    Runs the processors for the published public titles of given public articles (in given languages)
+    and stores their results. The content of the unpublished titles is removed.
+    """
+    titles = Title.objects.filter(article__in=articles, publisher_is_draft=False)
+    if languages is not None:
+        titles = titles.filter(language__in=languages)
+    titles = list(titles)
+    TitleContent.objects.filter(title__in=[title.pk for title in titles]).delete()
+
+    processors = get_processors()
+    contents = []
+    for title, plugins in get_title_plugins([title for title in titles if title.published]).items():
+        content = TitleContent(title=title)
+        for processor in processors:
+            processor(title, plugins, content)
+        contents.append(content)
+    TitleContent.objects.bulk_create(contents, batch_size=500)
@@ -0,0 +1,72 @@
+"""
+Signals sent by the bulk operations defined in cms_articles.api.
+
+They are defined outside of cms_articles.signals,
+which imports the admin (and so the api) to connect the receivers.
+"""
+
+from contextlib import contextmanager
+from threading import local
+
+from django.dispatch import Signal
+
+# sent once for each processed chunk (after it is committed) with arguments:
+# sender=Article, articles=list of the draft articles, languages=list of the languages
+post_publish_articles = Signal()
+post_unpublish_articles = Signal()
+
+# sent once, when all the articles are deleted, with arguments:
+# sender=Article, pks=list of the ids of the deleted draft and public articles, trees=set of the tree ids
+post_delete_articles = Signal()
+
+_state = local()
+
+
+@contextmanager
+def _flag(name):
+    previous = getattr(_state, name, False)
+    setattr(_state, name, True)
+    try:
+        yield
+    finally:
+        setattr(_state, name, previous)
+
+
+def publishing():
+    """
+    Marks the current thread as publishing (or unpublishing) articles.
+    The plugin receivers do not mark the titles as dirty meanwhile,
+    as the publishing code sets the publisher state of the titles itself.
+    """
+    return _flag("publishing")
+
+
+def is_publishing():
+    return getattr(_state, "publishing", False)
+
+
+def bulk_publishing():
+    """
+    Marks the current thread as sending the post_publish / post_unpublish signals
+    for the articles published (or unpublished) in bulk by cms_articles.api.
+    The receivers able to process the whole chunk skip them meanwhile
+    and handle the post_publish_articles / post_unpublish_articles signals instead.
+    """
+    return _flag("bulk_publishing")
+
+
+def is_bulk_publishing():
+    return getattr(_state, "bulk_publishing", False)
+
+
+def deleting():
+    """
+    Marks the current thread as deleting articles in bulk.
+    The article and title receivers do not clean up after each deleted object meanwhile,
+    as the deleting code does it for all the articles at once.
+    """
+    return _flag("deleting")
+
+
+def is_deleting():
+    return getattr(_state, "deleting", False)
@@ -8,11 +8,22 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument("wordpress_xml", nargs="+", type=str)
+        parser.add_argument(
+            "--progress-step",
+            type=int,
+            default=10,
+            help="Report the progress after each given number of megabytes (default 10, 0 to disable)",
+        )
+        parser.add_argument("--batch-size", type=int, default=500, help="Number of records saved at once")
 
     def handle(self, *args, **options):
         for wordpress_xml in options["wordpress_xml"]:
             try:
-                result = import_wordpress(wordpress_xml)
+                result = import_wordpress(
+                    wordpress_xml,
+                    self.get_progress(wordpress_xml, options["progress_step"]),
+                    options["batch_size"],
+                )
             except Exception as e:
                 self.stderr.write(self.style.ERROR('Failed to import "{}": {}.'.format(wordpress_xml, e)))
                 raise CommandError(e)
@@ -25,3 +36,18 @@ class Command(BaseCommand):
                     )
                 )
             )
+
+    def get_progress(self, wordpress_xml, step):
+        if not step:
+            return None
+        step *= 1024 * 1024
+        reported = [0]
+
+        def progress(position, total):
+            if position > reported[0] and (position - reported[0] >= step or position == total):
+                reported[0] = position
+                self.stdout.write(
+                    '"{}": {:.1f} / {:.1f} MB'.format(wordpress_xml, position / 1024 / 1024, (total or 0) / 1024 / 1024)
+                )
+
+        return progress
@@ -1,9 +1,11 @@
 import logging
+import os
 from json import dumps
-from xml.etree.ElementTree import ElementTree
+from xml.etree.ElementTree import ParseError, iterparse
 
 from cms.utils.compat.dj import is_installed
 from dateutil.parser import parse
+from django.db import transaction
 from django.utils.timezone import make_aware
 
 from ..conf import settings
@@ -28,144 +30,317 @@ else:
         pass
 
 
-def import_wordpress(xmlfile):
-    from .models import Author, Category, Item
+WP = "{http://wordpress.org/export/1.2/}"
+WP_EXCERPT = "{http://wordpress.org/export/1.2/excerpt/}"
+DC = "{http://purl.org/dc/elements/1.1/}"
+CONTENT = "{http://purl.org/rss/1.0/modules/content/}"
 
-    try:
-        rss = ElementTree(file=xmlfile).getroot()
-        assert rss.tag == "rss"
-    except Exception as e:
-        raise Exception("Failed to parse file {}: {}".format(xmlfile, e))
 
-    imported_items = 0
-    errors = []
+class ProgressReader:
+    """
+    Wraps given file and reports the number of bytes consumed to the progress callback
+    called with the number of bytes read and the total size (or None, if it is not known).
+    """
 
-    # import authors
-    authors = {}
-    for author in rss.findall("*/{http://wordpress.org/export/1.2/}author"):
-        author_id = "unknown"
-        try:
-            # first of all try to parse author_id for use in potential error messages
-            author_id = int(author.find("{http://wordpress.org/export/1.2/}author_id").text)
-            login = author.find("{http://wordpress.org/export/1.2/}author_login").text
-            email = author.find("{http://wordpress.org/export/1.2/}author_email").text
-            first_name = author.find("{http://wordpress.org/export/1.2/}author_first_name").text
-            last_name = author.find("{http://wordpress.org/export/1.2/}author_last_name").text
-        except Exception as e:
-            error = "Failed to parse author with author_id {}: {}".format(author_id, e)
-            logging.warning(error)
-            errors.append(error)
+    def __init__(self, file, progress=None):
+        self.file = file
+        self.progress = progress
+        self.position = 0
+        self.total = getattr(file, "size", None)
+        if self.total is None:
+            try:
+                self.total = os.fstat(file.fileno()).st_size
+            except (AttributeError, OSError, ValueError):
+                pass
+
+    def read(self, size=-1):
+        data = self.file.read(size)
+        self.position += len(data)
+        if self.progress:
+            self.progress(self.position, self.total)
+        return data
+
+
+def iter_wordpress(xmlfile, progress=None):
+    """
+    Parses given WordPress export (file name or file object) incrementally
+    and yields the authors, categories and items as ("author" | "category" | "item", element) tuples.
+    Each element is complete when it is yielded and it is cleared afterwards,
+    so that the memory usage does not grow with the size of the file.
+    """
+    tags = {WP + "author": "author", WP + "category": "category", "item": "item"}
+    if isinstance(xmlfile, (str, os.PathLike)):
+        with open(xmlfile, "rb") as file:
+            yield from iter_wordpress(file, progress)
+        return
+
+    if hasattr(xmlfile, "seek"):
+        xmlfile.seek(0)
+    depth = 0
+    channel = None
+    for event, element in iterparse(ProgressReader(xmlfile, progress), events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if depth == 1 and element.tag != "rss":
+                raise ParseError("unexpected root element {}".format(element.tag))
+            elif depth == 2:
+                channel = element
             continue
+        if depth == 3:
+            if element.tag in tags:
+                yield tags[element.tag], element
+            # the processed children of the channel are not needed anymore
+            element.clear()
+            channel.remove(element)
+        depth -= 1
+
+
+def parse_author(author):
+    return dict(
+        author_id=int(author.find(WP + "author_id").text),
+        login=author.find(WP + "author_login").text,
+        email=author.find(WP + "author_email").text,
+        first_name=author.find(WP + "author_first_name").text,
+        last_name=author.find(WP + "author_last_name").text,
+    )
+
+
+def parse_category(category):
+    return dict(
+        term_id=int(category.find(WP + "term_id").text),
+        name=category.find(WP + "cat_name").text,
+        slug=category.find(WP + "category_nicename").text,
+        parent=category.find(WP + "category_parent").text,
+    )
+
+
+def parse_item(item):
+    pub_date = item.find("pubDate").text
+    return dict(
+        post_id=int(item.find(WP + "post_id").text),
+        title=item.find("title").text or "",
+        link=item.find("link").text or "",
+        pub_date=pub_date and parse(pub_date),
+        created_by=item.find(DC + "creator").text,
+        guid=item.find("guid").text,
+        description=item.find("description").text or "",
+        content=item.find(CONTENT + "encoded").text or "",
+        excerpt=item.find(WP_EXCERPT + "encoded").text or "",
+        post_date=make_aware(parse(item.find(WP + "post_date").text)),
+        post_name=item.find(WP + "post_name").text or "",
+        status=item.find(WP + "status").text,
+        post_parent=int(item.find(WP + "post_parent").text),
+        post_type=item.find(WP + "post_type").text,
+        postmeta=dumps(
+            dict(
+                (pm.find(WP + "meta_key").text, pm.find(WP + "meta_value").text) for pm in item.findall(WP + "postmeta")
+            )
+        ),
+        categories=[cat.attrib["nicename"] for cat in item.findall("category")],
+    )
+
+
+def _get_id(element, tag):
+    # used in the error messages, even if the element can not be parsed
+    try:
+        return int(element.find(tag).text)
+    except Exception:
+        return "unknown"
+
+
+def upsert(model, key, records):
+    """
+    Inserts or updates given records ({key value: {field: value}}) using a fixed number of queries.
+    Returns the saved instances by the key values.
+    """
+    existing = model.objects.in_bulk(list(records), field_name=key)
+    for value, obj in existing.items():
+        for field, field_value in records[value].items():
+            setattr(obj, field, field_value)
+    fields = sorted({field for data in records.values() for field in data} - {key})
+    if existing and fields:
+        model.objects.bulk_update(existing.values(), fields)
+    model.objects.bulk_create([model(**data) for value, data in records.items() if value not in existing])
+    return model.objects.in_bulk(list(records), field_name=key)
+
+
+def update_or_create(model, key, data):
+    return model.objects.update_or_create(
+        defaults={field: value for field, value in data.items() if field != key}, **{key: data[key]}
+    )[0]
+
+
+def save_items(records, categories):
+    """
+    Saves given items ({post_id: {field: value}}) with their categories ({post_id: [Category]}) in bulk.
+    """
+    from .models import Item
+
+    items = upsert(Item, "post_id", records)
+    through = Item.categories.through
+    through.objects.filter(item__in=list(items.values())).delete()
+    through.objects.bulk_create(
+        [
+            through(item=item, category=category)
+            for post_id, item in items.items()
+            for category in {category.pk: category for category in categories[post_id]}.values()
+        ]
+    )
+    return items
+
+
+def save_item(data, categories):
+    from .models import Item
+
+    item = update_or_create(Item, "post_id", data)
+    item.categories.set(categories)
+    return item
+
+
+def save_batch(records, save_records, save_record, error_message, errors):
+    """
+    Saves given records ({key value: record}) at once, or one by one, if it fails,
+    so that the errors are reported for each failing record. Returns the saved instances by the key values.
+    """
+    try:
+        with transaction.atomic():
+            return save_records(records)
+    except Exception:
+        pass
+    saved = {}
+    for value, record in records.items():
         try:
-            author = Author.objects.get_or_create(
-                author_id=author_id,
-                login=login,
-                email=email,
-                first_name=first_name,
-                last_name=last_name,
-            )[0]
+            with transaction.atomic():
+                saved[value] = save_record(record)
         except Exception as e:
-            error = "Failed to save author with author_id {}: {}".format(author_id, e)
+            error = error_message.format(value, e)
             logging.warning(error)
             errors.append(error)
-            continue
-        authors[login] = author
+    return saved
+
 
-    # import categories
+def import_wordpress(xmlfile, progress=None, batch_size=500):
+    """
+    Imports the authors, categories and items from given WordPress export (file name or file object).
+    The file is parsed incrementally, the progress callback is called with the number of bytes consumed
+    and the total size of the file (see ProgressReader).
+    The records are saved in batches of given size, keyed by author_id, term_id and post_id.
+    If the file is truncated or malformed, the records parsed before the syntax error are saved
+    before the exception is raised, so that importing the fixed file again updates them.
+    """
+    from .models import Author, Category
+
+    imported_items = 0
+    errors = []
+    authors = {}
     categories = {}
-    for category in rss.findall("*/{http://wordpress.org/export/1.2/}category"):
-        term_id = "unknown"
-        try:
-            # first of all try to parse term_id for use in potential error messages
-            term_id = int(category.find("{http://wordpress.org/export/1.2/}term_id").text)
-            name = category.find("{http://wordpress.org/export/1.2/}cat_name").text
-            slug = category.find("{http://wordpress.org/export/1.2/}category_nicename").text
-            parent = category.find("{http://wordpress.org/export/1.2/}category_parent").text
-        except Exception as e:
-            error = "Failed to parse category with term_id {}: {}".format(term_id, e)
-            logging.warning(error)
-            errors.append(error)
-            raise
-        try:
-            category = Category.objects.get_or_create(
-                term_id=term_id,
-                name=name,
-                slug=slug,
-                parent=parent,
-            )[0]
-        except Exception as e:
-            error = "Failed to save category with term_id {}: {}".format(term_id, e)
-            logging.warning(error)
-            errors.append(error)
-            continue
-        categories[slug] = category
+    # the parsed records waiting to be saved, by their keys
+    pending_authors = {}
+    pending_categories = {}
+    pending_items = {}
+    item_categories = {}
 
-    # import items
-    for item in rss.findall("*/item"):
-        post_id = "unknown"
-        try:
-            # first of all try to parse post_id for use in potential error messages
-            post_id = int(item.find("{http://wordpress.org/export/1.2/}post_id").text)
-            title = item.find("title").text or ""
-            link = item.find("link").text or ""
-            pub_date = item.find("pubDate").text
-            created_by = item.find("{http://purl.org/dc/elements/1.1/}creator").text
-            guid = item.find("guid").text
-            description = item.find("description").text or ""
-            content = item.find("{http://purl.org/rss/1.0/modules/content/}encoded").text or ""
-            excerpt = item.find("{http://wordpress.org/export/1.2/excerpt/}encoded").text or ""
-            post_date = make_aware(parse(item.find("{http://wordpress.org/export/1.2/}post_date").text))
-            post_name = item.find("{http://wordpress.org/export/1.2/}post_name").text or ""
-            status = item.find("{http://wordpress.org/export/1.2/}status").text
-            post_parent = int(item.find("{http://wordpress.org/export/1.2/}post_parent").text)
-            post_type = item.find("{http://wordpress.org/export/1.2/}post_type").text
-            postmeta = dumps(
-                dict(
-                    (
-                        pm.find("{http://wordpress.org/export/1.2/}meta_key").text,
-                        pm.find("{http://wordpress.org/export/1.2/}meta_value").text,
-                    )
-                    for pm in item.findall("{http://wordpress.org/export/1.2/}postmeta")
-                )
+    def save_authors():
+        saved = save_batch(
+            pending_authors,
+            lambda records: upsert(Author, "author_id", records),
+            lambda data: update_or_create(Author, "author_id", data),
+            "Failed to save author with author_id {}: {}",
+            errors,
+        )
+        authors.update((author.login, author) for author in saved.values())
+        pending_authors.clear()
+
+    def save_categories():
+        saved = save_batch(
+            pending_categories,
+            lambda records: upsert(Category, "term_id", records),
+            lambda data: update_or_create(Category, "term_id", data),
+            "Failed to save category with term_id {}: {}",
+            errors,
+        )
+        categories.update((category.slug, category) for category in saved.values())
+        pending_categories.clear()
+
+    def save_pending_items():
+        nonlocal imported_items
+        imported_items += len(
+            save_batch(
+                pending_items,
+                lambda records: save_items(records, item_categories),
+                lambda data: save_item(data, item_categories[data["post_id"]]),
+                "Failed to save item with post_id {}: {}",
+                errors,
             )
-            cats = [
-                categories[cat.attrib["nicename"]]
-                for cat in item.findall("category")
-                if cat.attrib["nicename"] in categories
-            ]
-        except Exception as e:
-            error = "Failed to parse item with post_id {}: {}".format(post_id, e)
-            logging.warning(error)
-            errors.append(error)
-            continue
-        try:
-            item = Item.objects.update_or_create(
-                post_id=post_id,
-                defaults=dict(
-                    title=title,
-                    link=link,
-                    pub_date=pub_date and parse(pub_date),
-                    created_by=authors.get(created_by),
-                    guid=guid,
-                    description=description,
-                    content=content,
-                    excerpt=excerpt,
-                    post_id=post_id,
-                    post_date=post_date,
-                    post_name=post_name,
-                    status=status,
-                    post_parent=post_parent,
-                    post_type=post_type,
-                    postmeta=postmeta,
-                ),
-            )[0]
-            item.categories.set(cats)
-        except Exception as e:
-            error = "Failed to save item with post_id {}: {}".format(post_id, e)
-            logging.warning(error)
-            errors.append(error)
-            continue
-        imported_items += 1
+        )
+        pending_items.clear()
+        item_categories.clear()
+
+    try:
+        for kind, element in iter_wordpress(xmlfile, progress):
+            if kind == "author":
+                # import author
+                author_id = _get_id(element, WP + "author_id")
+                try:
+                    data = parse_author(element)
+                except Exception as e:
+                    error = "Failed to parse author with author_id {}: {}".format(author_id, e)
+                    logging.warning(error)
+                    errors.append(error)
+                    continue
+                pending_authors[author_id] = data
+                if len(pending_authors) >= batch_size:
+                    save_authors()
+
+            elif kind == "category":
+                # import category
+                term_id = _get_id(element, WP + "term_id")
+                try:
+                    data = parse_category(element)
+                except Exception as e:
+                    error = "Failed to parse category with term_id {}: {}".format(term_id, e)
+                    logging.warning(error)
+                    errors.append(error)
+                    raise
+                pending_categories[term_id] = data
+                if len(pending_categories) >= batch_size:
+                    save_categories()
+
+            else:
+                # import item
+                post_id = _get_id(element, WP + "post_id")
+                try:
+                    data = parse_item(element)
+                except Exception as e:
+                    error = "Failed to parse item with post_id {}: {}".format(post_id, e)
+                    logging.warning(error)
+                    errors.append(error)
+                    continue
+                # the items refer to the authors and categories exported before them
+                if pending_authors:
+                    save_authors()
+                if pending_categories:
+                    save_categories()
+                item_categories[post_id] = [categories[slug] for slug in data.pop("categories") if slug in categories]
+                data["created_by"] = authors.get(data["created_by"])
+                pending_items[post_id] = data
+                if len(pending_items) >= batch_size:
+                    save_pending_items()
+    except ParseError as e:
+        parse_error = e
+    else:
+        parse_error = None
+
+    # the records parsed before the end of file (or before a syntax error)
+    if pending_authors:
+        save_authors()
+    if pending_categories:
+        save_categories()
+    if pending_items:
+        save_pending_items()
+    if parse_error:
+        raise Exception("Failed to parse file {}: {}".format(xmlfile, parse_error))
+
     return {
         "authors": len(authors),
         "categories": len(categories),
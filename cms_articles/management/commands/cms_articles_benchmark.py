@@ -0,0 +1,64 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from ...benchmark import build_dataset, run_benchmarks
+from ...benchmark.runner import BENCHMARKS
+
+
+class Command(BaseCommand):
+    help = (
+        "Builds synthetic articles in a temporary SQLite test database, "
+        "measures the latency and the number of queries of the most frequent operations "
+        "and writes the results as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--articles", type=int, default=1000, help="Number of articles (default 1000)")
+        parser.add_argument("--trees", type=int, default=1, help="Number of article trees (default 1)")
+        parser.add_argument("--languages", type=int, default=1, help="Number of languages (default 1)")
+        parser.add_argument("--categories", type=int, default=10, help="Number of categories (default 10)")
+        parser.add_argument("--attributes", type=int, default=5, help="Number of attributes (default 5)")
+        parser.add_argument("--repeat", type=int, default=100, help="Number of runs of each benchmark (default 100)")
+        parser.add_argument("--seed", type=int, default=0, help="Seed of the random data (default 0)")
+        parser.add_argument(
+            "--benchmark",
+            action="append",
+            choices=list(BENCHMARKS),
+            dest="benchmarks",
+            help="Run only given benchmark (may be used multiple times)",
+        )
+        parser.add_argument("--output", default="-", help="Path to the output JSON file (default stdout)")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("The benchmarks run on SQLite only.")
+
+        setup_test_environment(debug=False)
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self.stderr.write("Building the dataset...")
+            dataset = build_dataset(
+                articles=options["articles"],
+                trees=options["trees"],
+                languages=options["languages"],
+                categories=options["categories"],
+                attributes=options["attributes"],
+                seed=options["seed"],
+                progress=lambda count: self.stderr.write("{} articles created".format(count)),
+            )
+            self.stderr.write("Running the benchmarks...")
+            results = run_benchmarks(dataset, options["repeat"], options["seed"], options["benchmarks"])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        output = json.dumps(results, indent=2)
+        if options["output"] == "-":
+            self.stdout.write(output)
+        else:
+            with open(options["output"], "w") as f:
+                f.write(output)
+            self.stderr.write(self.style.SUCCESS('Results written to "{}".'.format(options["output"])))
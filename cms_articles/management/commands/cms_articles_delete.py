@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...api import delete_articles
+from ...models import Article
+
+
+class Command(BaseCommand):
+    help = "Deletes many articles (both the draft and the public versions) at once"
+
+    def add_arguments(self, parser):
+        parser.add_argument("ids", nargs="*", type=int, help="Ids of the (draft) articles")
+        parser.add_argument("--tree", type=int, action="append", default=[], help="Id of the tree (may be repeated)")
+        parser.add_argument("--all", action="store_true", help="Delete all articles")
+        parser.add_argument("--chunk-size", type=int, help="Number of articles deleted in a single transaction")
+
+    def handle(self, *args, **options):
+        articles = Article.objects.drafts()
+        if options["ids"]:
+            articles = articles.filter(pk__in=options["ids"])
+        if options["tree"]:
+            articles = articles.filter(tree__in=options["tree"])
+        if not (options["ids"] or options["tree"] or options["all"]):
+            raise CommandError("Give some article ids, --tree or --all.")
+
+        count = delete_articles(articles, chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS("Deleted {} articles.".format(count)))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...api import publish_articles, unpublish_articles
+from ...models import Article
+
+
+class Command(BaseCommand):
+    help = "Publishes (or unpublishes) many articles at once"
+
+    def add_arguments(self, parser):
+        parser.add_argument("ids", nargs="*", type=int, help="Ids of the (draft) articles")
+        parser.add_argument("--tree", type=int, action="append", default=[], help="Id of the tree (may be repeated)")
+        parser.add_argument("--all", action="store_true", help="Process all articles")
+        parser.add_argument(
+            "--language", action="append", help="Language to (un)publish (may be repeated, default all languages)"
+        )
+        parser.add_argument("--unpublish", action="store_true", help="Unpublish the articles instead")
+        parser.add_argument("--chunk-size", type=int, help="Number of articles processed in a single transaction")
+
+    def handle(self, *args, **options):
+        articles = Article.objects.drafts()
+        if options["ids"]:
+            articles = articles.filter(pk__in=options["ids"])
+        if options["tree"]:
+            articles = articles.filter(tree__in=options["tree"])
+        if not (options["ids"] or options["tree"] or options["all"]):
+            raise CommandError("Give some article ids, --tree or --all.")
+
+        if options["unpublish"]:
+            count = unpublish_articles(articles, options["language"], chunk_size=options["chunk_size"])
+            self.stdout.write(self.style.SUCCESS("Unpublished {} articles.".format(count)))
+        else:
+            count = publish_articles(articles, options["language"], chunk_size=options["chunk_size"])
+            self.stdout.write(self.style.SUCCESS("Published {} articles.".format(count)))
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...queue import run_pending
+
+
+class Command(BaseCommand):
+    help = "Publishes and unpublishes the articles queued by the admin (see CMS_ARTICLES_PUBLISH_QUEUE)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep running and process new jobs when queued")
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1,
+            help="How long (in seconds) to wait for new jobs when running in loop (default 1)",
+        )
+        parser.add_argument("--limit", type=int, help="The maximum number of jobs processed at once")
+
+    def handle(self, *args, **options):
+        while True:
+            processed = run_pending(options["limit"])
+            if processed:
+                self.stdout.write(self.style.SUCCESS("Processed {} jobs.".format(processed)))
+            if not options["loop"]:
+                break
+            if not processed:
+                time.sleep(options["interval"])
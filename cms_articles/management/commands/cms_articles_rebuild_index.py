@@ -0,0 +1,107 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+
+def _init_worker():
+    # needed when the worker processes are spawned instead of forked
+    django.setup()
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the search index of the article titles in chunks of titles, "
+        "optionally spreading the work across several processes"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--using",
+            action="append",
+            default=[],
+            help="The haystack connection to update (may be repeated, default all connections)",
+        )
+        parser.add_argument("--chunk-size", type=int, default=500, help="Number of titles indexed at once")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=0,
+            help="Number of worker processes (default 0, the titles are indexed in the current process)",
+        )
+        parser.add_argument("--clear", action="store_true", help="Remove the titles from the index first")
+
+    def handle(self, *args, **options):
+        from haystack import connections as haystack_connections
+
+        from ...models import Title
+        from ...search_indexes import get_title_index, index_titles
+
+        for using in options["using"] or list(haystack_connections.connections_info):
+            index = get_title_index(using)
+            if options["clear"]:
+                haystack_connections[using].get_backend().clear(models=[Title])
+
+            # only the ids are kept in memory, the titles are loaded chunk by chunk
+            pks = list(index.index_queryset(using=using).values_list("pk", flat=True))
+            chunks = [pks[i : i + options["chunk_size"]] for i in range(0, len(pks), options["chunk_size"])]
+            progress = Progress(self, using, len(pks))
+            if options["workers"]:
+                self.index_in_parallel(index_titles, using, chunks, options["workers"], progress)
+            else:
+                for chunk in chunks:
+                    progress.update(index_titles(using, chunk))
+            progress.finish()
+
+    def index_in_parallel(self, index_titles, using, chunks, workers, progress):
+        # the worker processes must not share the database connections of this process
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            chunks = iter(chunks)
+            pending = set()
+            while True:
+                # at most two chunks per worker are waiting, so that the memory usage is bounded
+                while len(pending) < 2 * workers:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        break
+                    pending.add(executor.submit(index_titles, using, chunk))
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    progress.update(future.result())
+
+
+class Progress:
+    """
+    Reports the number of indexed titles and the throughput.
+    """
+
+    def __init__(self, command, using, total):
+        self.command = command
+        self.using = using
+        self.total = total
+        self.indexed = 0
+        self.start = time.monotonic()
+
+    def get_rate(self):
+        elapsed = time.monotonic() - self.start
+        return self.indexed / elapsed if elapsed else 0
+
+    def update(self, indexed):
+        self.indexed += indexed
+        self.command.stdout.write(
+            "{}: {}/{} titles ({:.1f} titles/s)".format(self.using, self.indexed, self.total, self.get_rate())
+        )
+
+    def finish(self):
+        self.command.stdout.write(
+            self.command.style.SUCCESS(
+                "{}: indexed {} titles in {:.1f}s ({:.1f} titles/s).".format(
+                    self.using, self.indexed, time.monotonic() - self.start, self.get_rate()
+                )
+            )
+        )
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+
+from ...models import Article
+
+
+class Command(BaseCommand):
+    help = (
+        "Updates articles, whose publication window has opened or closed, "
+        "and sends the signals invalidating cached content"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep running and update articles when needed")
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=60,
+            help="The longest time (in seconds) between two updates when running in loop (default 60)",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            updated = Article.objects.all().update_live()
+            if updated:
+                self.stdout.write(self.style.SUCCESS("Updated {} articles.".format(updated)))
+            if not options["loop"]:
+                break
+            time.sleep(self.get_delay(options["interval"]))
+
+    def get_delay(self, interval):
+        # wake up exactly when the next article goes live or expires
+        next_change = Article.objects.public().get_next_publication_change()
+        if next_change is None:
+            return interval
+        return min(interval, max((next_change - now()).total_seconds(), 0))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ...content import update_title_content
+from ...models import Article, Title
+from ...search import update_search_tokens, update_title_prefixes
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the derived content and the index of the built-in search for all published articles "
+        "and the autocomplete of all titles"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=500, help="Number of articles indexed at once")
+
+    def handle(self, *args, **options):
+        pks = list(Article.objects.public().order_by("pk").values_list("pk", flat=True))
+        chunk_size = options["chunk_size"]
+        for i in range(0, len(pks), chunk_size):
+            with transaction.atomic():
+                # the search tokens are made of the derived content
+                update_title_content(pks[i : i + chunk_size])
+                update_search_tokens(pks[i : i + chunk_size])
+        self.stdout.write(self.style.SUCCESS("Indexed {} articles.".format(len(pks))))
+
+        pks = list(Title.objects.order_by("pk").values_list("pk", flat=True))
+        for i in range(0, len(pks), chunk_size):
+            with transaction.atomic():
+                update_title_prefixes(pks[i : i + chunk_size])
+        self.stdout.write(self.style.SUCCESS("Indexed {} titles for autocomplete.".format(len(pks))))
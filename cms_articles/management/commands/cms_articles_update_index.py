@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import is_naive, make_aware, now
+
+from ...utils.index import flush_index_queue, get_changed_titles, queue_titles
+
+
+class Command(BaseCommand):
+    help = (
+        "Updates the search index with the titles of the articles changed since given time "
+        "and with the titles waiting in the index queue"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", help="Update the articles changed since given date and time (ISO 8601)")
+        parser.add_argument("--age", type=float, help="Update the articles changed in the last AGE hours")
+        parser.add_argument("--batch-size", type=int, help="Number of titles updated at once")
+
+    def handle(self, *args, **options):
+        since = self.get_since(options)
+        if since is not None:
+            queue_titles(get_changed_titles(since).values_list("pk", flat=True), flush=False)
+        processed = flush_index_queue(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS("Updated {} titles.".format(processed)))
+
+    def get_since(self, options):
+        if options["since"] and options["age"] is not None:
+            raise CommandError("Give either --since or --age.")
+        if options["age"] is not None:
+            return now() - timedelta(hours=options["age"])
+        if options["since"]:
+            since = parse_datetime(options["since"])
+            if since is None:
+                raise CommandError("Invalid date and time: {}".format(options["since"]))
+            return make_aware(since) if is_naive(since) else since
+        return None
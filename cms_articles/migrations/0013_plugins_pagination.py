@@ -0,0 +1,33 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms_articles", "0012_protect_keys"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="articlescategoryplugin",
+            name="pagination",
+            field=models.CharField(
+                choices=[("pages", "numbered pages"), ("cursor", "previous / next only (faster for large archives)")],
+                default="pages",
+                help_text="Numbered pages need to count all the articles and get slower with every next page.",
+                max_length=10,
+                verbose_name="Pagination",
+            ),
+        ),
+        migrations.AddField(
+            model_name="articlesplugin",
+            name="pagination",
+            field=models.CharField(
+                choices=[("pages", "numbered pages"), ("cursor", "previous / next only (faster for large archives)")],
+                default="pages",
+                help_text="Numbered pages need to count all the articles and get slower with every next page.",
+                max_length=10,
+                verbose_name="Pagination",
+            ),
+        ),
+    ]
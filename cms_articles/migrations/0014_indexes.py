@@ -0,0 +1,50 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms_articles", "0013_plugins_pagination"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="article",
+            name="tree",
+            field=models.ForeignKey(
+                db_index=False,
+                help_text="The page the article is accessible at.",
+                limit_choices_to={
+                    "application_urls": "CMSArticlesApp",
+                    "node__site_id": 1,
+                    "publisher_is_draft": False,
+                },
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="cms_articles",
+                to="cms.Page",
+                verbose_name="tree",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                fields=["tree", "publisher_is_draft", "order_date", "publication_date", "publication_end_date"],
+                name="cms_articles_article_listing",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="title",
+            index=models.Index(
+                fields=["slug", "publisher_is_draft", "published", "language"], name="cms_articles_title_slug"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="title",
+            index=models.Index(
+                condition=models.Q(("published", True), ("publisher_is_draft", False)),
+                fields=["slug", "article", "language"],
+                name="cms_articles_public_slug",
+            ),
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations, models
+
+
+def set_relation_ids(apps, schema_editor):
+    for model_name, relations in (
+        ("ArticlesPlugin", ("attributes", "trees", "categories")),
+        ("ArticlesCategoryPlugin", ("attributes",)),
+    ):
+        model = apps.get_model("cms_articles", model_name)
+        for plugin in model.objects.prefetch_related(*relations):
+            plugin.relation_ids = {
+                relation: sorted(obj.pk for obj in getattr(plugin, relation).all()) for relation in relations
+            }
+            plugin.save(update_fields=["relation_ids"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms_articles", "0014_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="articlescategoryplugin",
+            name="relation_ids",
+            field=models.JSONField(default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name="articlesplugin",
+            name="relation_ids",
+            field=models.JSONField(default=dict, editable=False),
+        ),
+        migrations.RunPython(set_relation_ids, migrations.RunPython.noop),
+    ]
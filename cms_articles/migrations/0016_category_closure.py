@@ -0,0 +1,73 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+STEPLEN = 4
+
+
+def create_categories(apps, schema_editor):
+    """
+    Creates the categories of pages with category plugins,
+    which used to be created when the plugin was rendered.
+    """
+    ArticlesCategoryPlugin = apps.get_model("cms_articles", "ArticlesCategoryPlugin")
+    Category = apps.get_model("cms_articles", "Category")
+    Page = apps.get_model("cms", "Page")
+
+    for plugin in ArticlesCategoryPlugin.objects.all():
+        page = Page.objects.filter(placeholders=plugin.placeholder_id).first()
+        if page is None:
+            category_ids = []
+        else:
+            if not page.publisher_is_draft:
+                page = Page.objects.get(publisher_public=page)
+            category_ids = [Category.objects.get_or_create(page=page)[0].pk]
+        plugin.relation_ids = dict(plugin.relation_ids, categories=category_ids)
+        plugin.save(update_fields=["relation_ids"])
+
+
+def build_closure(apps, schema_editor):
+    Category = apps.get_model("cms_articles", "Category")
+    CategoryClosure = apps.get_model("cms_articles", "CategoryClosure")
+
+    categories = dict(Category.objects.values_list("page__node__path", "pk"))
+    CategoryClosure.objects.bulk_create(
+        CategoryClosure(ancestor_id=categories[path[:i]], descendant_id=pk, depth=(len(path) - i) // STEPLEN)
+        for path, pk in categories.items()
+        for i in range(STEPLEN, len(path) + 1, STEPLEN)
+        if path[:i] in categories
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0020_old_tree_cleanup"),
+        ("cms_articles", "0015_plugins_relation_ids"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CategoryClosure",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("depth", models.PositiveSmallIntegerField()),
+                (
+                    "ancestor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to="cms_articles.category"
+                    ),
+                ),
+                (
+                    "descendant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to="cms_articles.category"
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("ancestor", "descendant")},
+            },
+        ),
+        migrations.RunPython(create_categories, migrations.RunPython.noop),
+        migrations.RunPython(build_closure, migrations.RunPython.noop),
+    ]
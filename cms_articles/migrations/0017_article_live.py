@@ -0,0 +1,35 @@
+from django.db import migrations, models
+from django.db.models import Q
+from django.utils.timezone import now
+
+
+def set_live(apps, schema_editor):
+    Article = apps.get_model("cms_articles", "Article")
+    current_time = now()
+    Article.objects.filter(
+        Q(publication_date__lte=current_time) | Q(publication_date__isnull=True),
+        Q(publication_end_date__gt=current_time) | Q(publication_end_date__isnull=True),
+        publisher_is_draft=False,
+    ).update(live=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms_articles", "0016_category_closure"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="live",
+            field=models.BooleanField(db_index=True, default=False, editable=False, verbose_name="live"),
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                condition=models.Q(("live", True)), fields=["tree", "order_date"], name="cms_articles_live_listing"
+            ),
+        ),
+        migrations.RunPython(set_live, migrations.RunPython.noop),
+    ]
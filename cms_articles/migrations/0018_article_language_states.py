@@ -0,0 +1,52 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+# cms.constants
+PUBLISHER_STATE_DIRTY = 1
+PUBLISHER_STATE_PENDING = 4
+
+
+def get_language_state(published, publisher_state):
+    if publisher_state == PUBLISHER_STATE_PENDING:
+        return "pending"
+    if not published:
+        return "draft"
+    if publisher_state == PUBLISHER_STATE_DIRTY:
+        return "dirty"
+    return "published"
+
+
+def set_language_states(apps, schema_editor):
+    Article = apps.get_model("cms_articles", "Article")
+    Title = apps.get_model("cms_articles", "Title")
+
+    language_states = {}
+    for article_id, language, published, publisher_state in Title.objects.values_list(
+        "article", "language", "published", "publisher_state"
+    ):
+        language_states.setdefault(article_id, {})[language] = get_language_state(published, publisher_state)
+    articles = [Article(pk=pk, language_states=states) for pk, states in language_states.items()]
+    Article.objects.bulk_update(articles, ["language_states"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms_articles", "0017_article_live"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="language_states",
+            field=models.JSONField(default=dict, editable=False),
+        ),
+        migrations.AlterField(
+            model_name="article",
+            name="order_date",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False, verbose_name="publication or creation time"
+            ),
+        ),
+        migrations.RunPython(set_language_states, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,72 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms_articles", "0018_article_language_states"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PublishJob",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("language", models.CharField(max_length=15, verbose_name="language")),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[("publish", "publish"), ("unpublish", "unpublish")],
+                        default="publish",
+                        max_length=10,
+                        verbose_name="action",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "pending"),
+                            ("running", "running"),
+                            ("done", "done"),
+                            ("failed", "failed"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                        verbose_name="status",
+                    ),
+                ),
+                ("changed_by", models.CharField(max_length=255, verbose_name="changed by")),
+                ("error", models.TextField(blank=True, verbose_name="error")),
+                ("created", models.DateTimeField(auto_now_add=True, verbose_name="created")),
+                ("started", models.DateTimeField(null=True, verbose_name="started")),
+                ("finished", models.DateTimeField(null=True, verbose_name="finished")),
+                (
+                    "article",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="publish_jobs",
+                        to="cms_articles.article",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "publish job",
+                "verbose_name_plural": "publish jobs",
+                "ordering": ["pk"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="publishjob",
+            index=models.Index(fields=["status", "id"], name="cms_articles_job_queue"),
+        ),
+        migrations.AddConstraint(
+            model_name="publishjob",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("status", "pending")),
+                fields=("article", "language"),
+                name="cms_articles_job_pending",
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms_articles", "0019_publishjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IndexQueue",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("title_id", models.IntegerField(unique=True)),
+                ("modified", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
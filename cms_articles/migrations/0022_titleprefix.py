@@ -0,0 +1,43 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sites", "0002_alter_domain_unique"),
+        ("cms_articles", "0021_searchtoken"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TitlePrefix",
+            fields=[
+                ("id", models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("prefix", models.CharField(max_length=10)),
+                ("language", models.CharField(max_length=15)),
+                ("draft", models.BooleanField()),
+                ("position", models.PositiveSmallIntegerField()),
+                (
+                    "site",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="+", to="sites.site"),
+                ),
+                (
+                    "title",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to="cms_articles.title"
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="titleprefix",
+            index=models.Index(
+                fields=["prefix", "language", "site", "draft", "position"], name="cms_articles_title_prefix"
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="titleprefix",
+            unique_together={("title", "prefix")},
+        ),
+    ]
@@ -0,0 +1,46 @@
+import django.db.models.deletion
+import filer.fields.image
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.FILER_IMAGE_MODEL),
+        ("cms_articles", "0022_titleprefix"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TitleContent",
+            fields=[
+                (
+                    "title",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="derived",
+                        serialize=False,
+                        to="cms_articles.title",
+                    ),
+                ),
+                ("text", models.TextField(blank=True, default="")),
+                ("word_count", models.PositiveIntegerField(default=0)),
+                ("reading_time", models.PositiveIntegerField(default=0)),
+                ("excerpt", models.TextField(blank=True, default="")),
+                ("data", models.JSONField(blank=True, default=dict)),
+                ("updated", models.DateTimeField(auto_now=True)),
+                (
+                    "image",
+                    filer.fields.image.FilerImageField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.FILER_IMAGE_MODEL,
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -1,7 +1,25 @@
 from .article import Article
 from .attribute import Attribute
-from .category import Category
+from .category import Category, CategoryClosure
+from .content import TitleContent
+from .index import IndexQueue
+from .job import PublishJob
 from .plugins import ArticlePlugin, ArticlesCategoryPlugin, ArticlesPlugin
+from .search import SearchToken, TitlePrefix
 from .title import Title
 
-(Category, Article, Title, Attribute, ArticlePlugin, ArticlesPlugin, ArticlesCategoryPlugin)
+(
+    Category,
+    CategoryClosure,
+    Article,
+    Title,
+    Attribute,
+    ArticlePlugin,
+    ArticlesPlugin,
+    ArticlesCategoryPlugin,
+    PublishJob,
+    IndexQueue,
+    SearchToken,
+    TitlePrefix,
+    TitleContent,
+)
@@ -2,13 +2,13 @@
 from __future__ import unicode_literals
 
 from collections import OrderedDict
+from copy import copy
 
 from cms import constants
 from cms.exceptions import LanguageError, PublicIsUnmodifiable, PublicVersionNeeded
-from cms.models import Page
+from cms.models import Page, Placeholder
 from cms.utils import i18n
-from cms.utils.copy_plugins import copy_plugins_to
-from django.db import models
+from django.db import connections, models
 from django.utils.encoding import force_str
 from django.utils.functional import cached_property
 from django.utils.html import strip_tags
@@ -16,17 +16,50 @@ from django.utils.timezone import now
 from django.utils.translation import get_language, gettext_lazy as _
 
 from ..conf import settings
+from ..constants import (
+    LANGUAGE_STATE_DIRTY,
+    LANGUAGE_STATE_PENDING,
+    LANGUAGE_STATE_PUBLISHED,
+    PUBLISHED_LANGUAGE_STATES,
+)
 from .attribute import Attribute
 from .category import Category
 from .managers import ArticleManager
+from .mixins import SnapshotMixin
+
+
+def get_dirty_language_states(language_states, languages=None):
+    """
+    Returns the language states after the titles (in given languages) were marked as dirty.
+    """
+    return {
+        language: (
+            LANGUAGE_STATE_DIRTY
+            if state == LANGUAGE_STATE_PUBLISHED and (languages is None or language in languages)
+            else state
+        )
+        for language, state in language_states.items()
+    }
+
 
+class Article(SnapshotMixin, models.Model):
+    # These are the fields whose values are compared when saving
+    # an Article object to know if it has changed.
+    editable_fields = [
+        "publication_date",
+        "publication_end_date",
+        "tree_id",
+        "template",
+        "login_required",
+    ]
 
-class Article(models.Model):
     tree = models.ForeignKey(
         Page,
         verbose_name=_("tree"),
         related_name="cms_articles",
         on_delete=models.PROTECT,
+        # covered by the composite index cms_articles_article_listing
+        db_index=False,
         help_text=_("The page the article is accessible at."),
         limit_choices_to={
             "publisher_is_draft": False,
@@ -68,7 +101,9 @@ class Article(models.Model):
         help_text=_("When to expire the article. Leave empty to never expire."),
         db_index=True,
     )
-    order_date = models.DateTimeField(_("publication or creation time"), auto_now_add=True, editable=False)
+    order_date = models.DateTimeField(_("publication or creation time"), default=now, editable=False)
+    # public article within its publication window, maintained by save() and by the scheduler
+    live = models.BooleanField(_("live"), default=False, editable=False, db_index=True)
     login_required = models.BooleanField(_("login required"), default=False)
 
     # Placeholders (plugins)
@@ -85,6 +120,8 @@ class Article(models.Model):
         editable=False,
     )
     languages = models.CharField(max_length=255, editable=False, blank=True, null=True)
+    # publication state of each language (see cms_articles.constants), kept up to date with the titles
+    language_states = models.JSONField(default=dict, editable=False)
 
     # X Frame Options for clickjacking protection
     @cached_property
@@ -107,6 +144,19 @@ class Article(models.Model):
         verbose_name = _("article")
         verbose_name_plural = _("articles")
         app_label = "cms_articles"
+        indexes = [
+            # articles of given trees ordered by date
+            models.Index(
+                fields=["tree", "publisher_is_draft", "order_date", "publication_date", "publication_end_date"],
+                name="cms_articles_article_listing",
+            ),
+            # the same for live articles only, on backends supporting partial indexes
+            models.Index(
+                fields=["tree", "order_date"],
+                name="cms_articles_live_listing",
+                condition=models.Q(live=True),
+            ),
+        ]
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -182,6 +232,7 @@ class Article(models.Model):
             publisher_state=constants.PUBLISHER_STATE_DEFAULT,
             published=True,
         )
+        self.language_states[language] = LANGUAGE_STATE_PUBLISHED
 
         self._publisher_keep_state = True
         self.save()
@@ -206,7 +257,8 @@ class Article(models.Model):
             title._publisher_keep_state = True
             title.save()
 
-            old_title = Title.objects.get(pk=old_pk)
+            # the title of this article updates its language_states
+            old_title = self.title_set.get(pk=old_pk)
             old_title.publisher_public = title
             old_title.publisher_state = title.publisher_state
             old_title.published = True
@@ -219,40 +271,31 @@ class Article(models.Model):
 
     def _copy_contents(self, target, language):
         """
-        Copy all the plugins to a new article.
+        Copy the plugins to the public article.
+        Only the plugins, which have changed since the last publish, are copied (see sync_plugins).
         :param target: The article where the new content should be stored
         """
-        # TODO: Make this into a 'graceful' copy instead of deleting and overwriting
-        # copy the placeholders (and plugins on those placeholders!)
         from cms.models.pluginmodel import CMSPlugin
 
-        for plugin in CMSPlugin.objects.filter(placeholder__cms_articles=target, language=language).order_by("-depth"):
-            inst, cls = plugin.get_plugin_instance()
-            if inst and getattr(inst, "cmsplugin_ptr_id", False):
-                inst.cmsplugin_ptr = plugin
-                inst.cmsplugin_ptr._no_reorder = True
-                inst.delete(no_mp=True)
-            else:
-                plugin._no_reorder = True
-                plugin.delete(no_mp=True)
+        from ..signals.plugins import DirtyPlaceholders
+        from ..utils.plugins import sync_plugins
+
         new_phs = []
-        target_phs = target.placeholders.all()
+        target_phs = {ph.slot: ph for ph in target.placeholders.all()}
         for ph in self.get_placeholders():
-            plugins = ph.get_plugins_list(language)
-            found = False
-            for target_ph in target_phs:
-                if target_ph.slot == ph.slot:
-                    ph = target_ph
-                    found = True
-                    break
-            if not found:
-                ph.pk = None  # make a new instance
-                ph.save()
-                new_phs.append(ph)
-                # update the article copy
-            if plugins:
-                copy_plugins_to(plugins, ph)
+            target_ph = target_phs.pop(ph.slot, None)
+            if target_ph is None:
+                # make a new instance (the placeholders of this article may be cached)
+                target_ph = copy(ph)
+                target_ph.pk = None
+                target_ph.save()
+                new_phs.append(target_ph)
+            sync_plugins(ph, target_ph, language)
         target.placeholders.add(*new_phs)
+        # the plugins of placeholders not used anymore
+        CMSPlugin.objects.filter(placeholder__in=target_phs.values(), language=language).delete()
+        # the changes made earlier in the current transaction are published now
+        DirtyPlaceholders.discard([ph.pk for ph in self.get_placeholders()], language)
 
     def _copy_attributes(self, target):
         target.tree = self.tree
@@ -266,10 +309,10 @@ class Article(models.Model):
         target.categories.set(self.categories.all())
 
     def delete(self, *args, **kwargs):
-        articles = [self.pk]
-        if self.publisher_public_id:
-            articles.append(self.publisher_public_id)
-        self.__class__.objects.filter(pk__in=articles).delete()
+        from ..api import _delete_articles
+
+        counts = _delete_articles([self])[1]
+        return sum(counts.values()), dict(counts)
 
     def save(self, no_signals=False, commit=True, **kwargs):
         """
@@ -307,7 +350,8 @@ class Article(models.Model):
         if created:
             self.created_by = self.changed_by
 
-        self.order_date = self.publication_date or self.creation_date
+        self.order_date = self.publication_date or self.creation_date or now()
+        self.live = not self.publisher_is_draft and self.in_publication_window()
 
         if commit:
             super().save(**kwargs)
@@ -323,39 +367,37 @@ class Article(models.Model):
         keep_state = getattr(self, "_publisher_keep_state", None)
         if self.publisher_is_draft and not keep_state and self.is_new_dirty():
             self.title_set.all().update(publisher_state=constants.PUBLISHER_STATE_DIRTY)
+            self.language_states = get_dirty_language_states(self.language_states)
         if keep_state:
             delattr(self, "_publisher_keep_state")
         return super().save_base(*args, **kwargs)
 
     def is_new_dirty(self):
-        if self.pk:
-            fields = [
-                "publication_date",
-                "publication_end_date",
-                "tree",
-                "template",
-                "login_required",
-            ]
-            try:
-                old_article = Article.objects.get(pk=self.pk)
-            except Article.DoesNotExist:
-                return True
-            for field in fields:
-                old_val = getattr(old_article, field)
-                new_val = getattr(self, field)
-                if not old_val == new_val:
-                    return True
-            if not self.attributes.all() == old_article.attributes.all():
-                return True
-            if not self.categories.all() == old_article.categories.all():
-                return True
+        # the changes of attributes and categories are tracked by m2m_changed_article_relations
+        return self.has_changed(*self.editable_fields)
+
+    def in_publication_window(self, current_time=None):
+        if current_time is None:
+            current_time = now()
+        if self.publication_date and self.publication_date > current_time:
+            return False
+        if self.publication_end_date and self.publication_end_date <= current_time:
             return False
         return True
 
     def is_published(self, language, force_reload=False):
+        if not force_reload and language in self.language_states:
+            return self.language_states[language] in PUBLISHED_LANGUAGE_STATES
         return self.get_title_obj(language, False, force_reload=force_reload).published
 
     def get_publisher_state(self, language, force_reload=False):
+        # the publisher state of unpublished titles is not stored in language_states
+        if not force_reload and self.language_states.get(language) in PUBLISHED_LANGUAGE_STATES:
+            return {
+                LANGUAGE_STATE_DIRTY: constants.PUBLISHER_STATE_DIRTY,
+                LANGUAGE_STATE_PUBLISHED: constants.PUBLISHER_STATE_DEFAULT,
+                LANGUAGE_STATE_PENDING: constants.PUBLISHER_STATE_PENDING,
+            }[self.language_states[language]]
         try:
             return self.get_title_obj(language, False, force_reload=force_reload).publisher_state
         except AttributeError:
@@ -432,7 +474,8 @@ class Article(models.Model):
         public_title.published = False
 
         public_title.save()
-        public_article = self.publisher_public
+        # the article of the public title has the language_states up to date
+        public_article = public_title.article
         public_placeholders = public_article.get_placeholders()
         for pl in public_placeholders:
             pl.cmsplugin_set.filter(language=language).delete()
@@ -472,7 +515,7 @@ class Article(models.Model):
     def get_published_languages(self):
         if self.publisher_is_draft:
             return self.get_languages()
-        return sorted([language for language in self.get_languages() if self.is_published(language)])
+        return sorted(language for language in self.get_languages() if self.is_published(language))
 
     # Title object access
 
@@ -520,6 +563,15 @@ class Article(models.Model):
         """
         return self.get_title_obj_attribute("description", language, fallback, force_reload)
 
+    def get_derived_content(self, language=None, fallback=True, force_reload=False):
+        """
+        get the content derived from the published title depending on the given language
+        (see cms_articles.content), or None for the draft articles
+        """
+        if self.publisher_is_draft:
+            return None
+        return self.get_title_obj_attribute("derived", language, fallback, force_reload)
+
     def get_placeholders(self):
         if not hasattr(self, "_placeholder_cache"):
             self._placeholder_cache = self.placeholders.all()
@@ -559,13 +611,22 @@ class Article(models.Model):
         """
         get content for the description meta tag for the article depending on the given language
         """
-        return self.get_title_obj_attribute("meta_description", language, fallback, force_reload) or strip_tags(
-            self.get_title_obj_attribute("description", language, fallback, force_reload)
-        )
+        meta_description = self.get_title_obj_attribute("meta_description", language, fallback, force_reload)
+        if meta_description:
+            return meta_description
+        derived = self.get_derived_content(language, fallback, force_reload)
+        if derived is not None:
+            return derived.excerpt
+        return strip_tags(self.get_title_obj_attribute("description", language, fallback, force_reload))
 
     def _get_title_cache(self, language, fallback, force_reload):
         if not language:
             language = get_language()
+        # titles prefetched by ArticleQuerySet.for_listing
+        listing_titles = self.__dict__.pop("_listing_titles", None)
+        if listing_titles is not None and not force_reload:
+            for title in listing_titles:
+                self.title_cache.setdefault(title.language, title)
         load = False
         if not hasattr(self, "title_cache") or force_reload:
             load = True
@@ -581,6 +642,8 @@ class Article(models.Model):
             from .title import Title
 
             titles = Title.objects.filter(article=self)
+            if not self.publisher_is_draft:
+                titles = titles.select_related("derived")
             for title in titles:
                 self.title_cache[title.language] = title
             if language in self.title_cache:
@@ -633,9 +696,16 @@ class Article(models.Model):
             if placeholder.slot in placeholders:
                 existing[placeholder.slot] = placeholder
 
-        for placeholder in placeholders:
-            if placeholder not in existing:
-                existing[placeholder] = self.placeholders.create(slot=placeholder)
+        missing = [Placeholder(slot=slot) for slot in placeholders if slot not in existing]
+        if missing:
+            if connections[Placeholder.objects.db].features.can_return_rows_from_bulk_insert:
+                Placeholder.objects.bulk_create(missing)
+            else:
+                # the primary keys are needed to add the placeholders to the article
+                for placeholder in missing:
+                    placeholder.save()
+            self.placeholders.add(*missing)
+            existing.update((placeholder.slot, placeholder) for placeholder in missing)
         return existing
 
     def get_declared_placeholders(self):
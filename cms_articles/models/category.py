@@ -1,7 +1,7 @@
 from itertools import chain
 
-from cms.models import Page
-from django.db import models
+from cms.models import Page, TreeNode
+from django.db import models, transaction
 from django.utils.encoding import force_str
 from django.utils.translation import gettext_lazy as _
 
@@ -29,3 +29,49 @@ class Category(models.Model):
                 (force_str(self.page),),
             )
         )
+
+
+class CategoryClosureManager(models.Manager):
+    def rebuild(self, categories=None):
+        """
+        Recomputes the ancestors of given categories (all categories by default).
+        The ancestors are found using the paths of the category pages' nodes.
+        """
+        if categories is None:
+            categories = Category.objects.all()
+        steplen = TreeNode.steplen
+        paths = dict(categories.values_list("pk", "page__node__path"))
+        prefixes = {path[:i] for path in paths.values() for i in range(steplen, len(path) + 1, steplen)}
+        ancestors = dict(Category.objects.filter(page__node__path__in=prefixes).values_list("page__node__path", "pk"))
+        with transaction.atomic():
+            self.filter(descendant__in=list(paths)).delete()
+            self.bulk_create(
+                self.model(ancestor_id=ancestors[path[:i]], descendant_id=pk, depth=(len(path) - i) // steplen)
+                for pk, path in paths.items()
+                for i in range(steplen, len(path) + 1, steplen)
+                if path[:i] in ancestors
+            )
+
+    def rebuild_subtree(self, path):
+        """
+        Recomputes the ancestors of categories with pages in the subtree of the node with given path,
+        e.g. after the node has been moved.
+        """
+        self.rebuild(Category.objects.filter(page__node__path__startswith=path))
+
+
+class CategoryClosure(models.Model):
+    """
+    Pairs of categories and their (indirect) ancestors, including the category itself
+    with depth 0, so that sub-categories can be found without scanning the page tree.
+    """
+
+    ancestor = models.ForeignKey(Category, related_name="+", on_delete=models.CASCADE)
+    descendant = models.ForeignKey(Category, related_name="+", on_delete=models.CASCADE)
+    depth = models.PositiveSmallIntegerField()
+
+    objects = CategoryClosureManager()
+
+    class Meta:
+        app_label = "cms_articles"
+        unique_together = (("ancestor", "descendant"),)
@@ -0,0 +1,28 @@
+from django.db import models
+from filer.fields.image import FilerImageField
+
+from .title import Title
+
+
+class TitleContent(models.Model):
+    """
+    Content derived from the published title and the plugins of the article (see cms_articles.content).
+    It is computed once per title and language, when the article is published.
+    """
+
+    title = models.OneToOneField(Title, on_delete=models.CASCADE, primary_key=True, related_name="derived")
+    text = models.TextField(blank=True, default="")
+    word_count = models.PositiveIntegerField(default=0)
+    # in minutes
+    reading_time = models.PositiveIntegerField(default=0)
+    excerpt = models.TextField(blank=True, default="")
+    image = FilerImageField(related_name="+", on_delete=models.SET_NULL, blank=True, null=True)
+    # results of custom processors
+    data = models.JSONField(default=dict, blank=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = "cms_articles"
+
+    def __str__(self):
+        return str(self.title)
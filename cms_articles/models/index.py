@@ -0,0 +1,14 @@
+from django.db import models
+
+
+class IndexQueue(models.Model):
+    """
+    Titles waiting to be updated in (or removed from) the search index (see cms_articles.search_indexes).
+    Each title is queued only once, no matter how many times it was changed.
+    """
+
+    title_id = models.IntegerField(unique=True)
+    modified = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = "cms_articles"
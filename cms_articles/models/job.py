@@ -0,0 +1,85 @@
+from cms import constants
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from .article import Article
+
+
+class PublishJob(models.Model):
+    """
+    Publishing or unpublishing of an article (in one language) queued by the admin
+    and processed in the background (see cms_articles.queue).
+    """
+
+    ACTION_PUBLISH = "publish"
+    ACTION_UNPUBLISH = "unpublish"
+    ACTION_CHOICES = [
+        (ACTION_PUBLISH, _("publish")),
+        (ACTION_UNPUBLISH, _("unpublish")),
+    ]
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, _("pending")),
+        (STATUS_RUNNING, _("running")),
+        (STATUS_DONE, _("done")),
+        (STATUS_FAILED, _("failed")),
+    ]
+
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name="publish_jobs")
+    language = models.CharField(_("language"), max_length=15)
+    action = models.CharField(_("action"), max_length=10, choices=ACTION_CHOICES, default=ACTION_PUBLISH)
+    status = models.CharField(_("status"), max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    changed_by = models.CharField(_("changed by"), max_length=constants.PAGE_USERNAME_MAX_LENGTH)
+    error = models.TextField(_("error"), blank=True)
+    created = models.DateTimeField(_("created"), auto_now_add=True)
+    started = models.DateTimeField(_("started"), null=True)
+    finished = models.DateTimeField(_("finished"), null=True)
+
+    class Meta:
+        app_label = "cms_articles"
+        verbose_name = _("publish job")
+        verbose_name_plural = _("publish jobs")
+        ordering = ["pk"]
+        indexes = [models.Index(fields=["status", "id"], name="cms_articles_job_queue")]
+        constraints = [
+            # jobs for the same article and language are coalesced while pending
+            models.UniqueConstraint(
+                fields=["article", "language"],
+                condition=models.Q(status="pending"),
+                name="cms_articles_job_pending",
+            ),
+        ]
+
+    def __str__(self):
+        return "{} {} ({})".format(self.get_action_display(), self.article_id, self.language)
+
+    @property
+    def is_active(self):
+        return self.status in (self.STATUS_PENDING, self.STATUS_RUNNING)
+
+    def get_queue_position(self):
+        """
+        Returns the number of pending jobs, which are going to be processed before this one.
+        """
+        if self.status != self.STATUS_PENDING:
+            return 0
+        return PublishJob.objects.filter(status=self.STATUS_PENDING, pk__lt=self.pk).count()
+
+    def get_status(self):
+        """
+        Returns the status of the job as a JSON serializable dict.
+        """
+        return {
+            "id": self.pk,
+            "action": self.action,
+            "status": self.status,
+            "queue_position": self.get_queue_position(),
+            "error": self.error,
+            "created": self.created.isoformat(),
+            "started": self.started and self.started.isoformat(),
+            "finished": self.finished and self.finished.isoformat(),
+        }
@@ -1,7 +1,7 @@
 from cms.publisher import PublisherManager
 from cms.utils.i18n import get_fallback_languages
 from django.contrib.sites.models import Site
-from django.db.models import Q
+from django.db.models import OuterRef, Subquery
 
 from .query import ArticleQuerySet
 
@@ -16,47 +16,29 @@ class ArticleManager(PublisherManager):
         return ArticleQuerySet(self.model)
 
     def search(self, q, language=None, current_site_only=True):
-        """Simple search function
+        """
+        Returns the public articles containing all the words of given query in given language,
+        ordered by relevance (see cms_articles.search).
 
-        Plugins can define a 'search_fields' tuple similar to ModelAdmin classes
+        The title, description, meta description and the plugins with 'search_fields' are searched.
         """
-        from cms.plugin_pool import plugin_pool
+        from ..search import get_matches
 
         qs = self.get_queryset()
         qs = qs.public()
 
         if current_site_only:
-            site = Site.objects.get_current()
-            qs = qs.filter(tree__site=site)
-
-        qt = Q(title_set__title__icontains=q)
-
-        # find 'searchable' plugins and build query
-        qp = Q()
-        plugins = plugin_pool.get_all_plugins()
-        for plugin in plugins:
-            cmsplugin = plugin.model
-            if not (hasattr(cmsplugin, "search_fields") and hasattr(cmsplugin, "cmsplugin_ptr")):
-                continue
-            field = cmsplugin.cmsplugin_ptr.field
-            related_query_name = field.related_query_name()
-            if related_query_name and not related_query_name.startswith("+"):
-                for field in cmsplugin.search_fields:
-                    qp |= Q(
-                        **{
-                            "placeholders__cmsplugin__{0}__{1}__icontains".format(
-                                related_query_name,
-                                field,
-                            ): q
-                        }
-                    )
-        if language:
-            qt &= Q(title_set__language=language)
-            qp &= Q(cmsplugin__language=language)
+            qs = qs.on_site(Site.objects.get_current())
 
-        qs = qs.filter(qt | qp)
+        matches = get_matches(q, language)
+        if matches is None:
+            return qs.none()
 
-        return qs.distinct()
+        return (
+            qs.filter(pk__in=matches.values("article"))
+            .annotate(search_score=Subquery(matches.filter(article=OuterRef("pk")).values("score")))
+            .order_by("-search_score", "-order_date")
+        )
 
 
 class TitleManager(PublisherManager):
@@ -115,6 +97,8 @@ class TitleManager(PublisherManager):
             data["article"] = article
             data["language"] = language
             return self.create(**data)
+        # keep the language_states of the given article up to date
+        obj.article = article
         for name in base_fields:
             if name in form.base_fields:
                 value = cleaned_data.get(name, None)
@@ -0,0 +1,54 @@
+class SnapshotMixin:
+    """
+    Remembers the field values loaded from the database,
+    so that the changes can be detected without querying the database again.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = instance._get_field_values()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using, fields)
+        values = self._get_field_values()
+        if fields is not None:
+            attnames = {self._meta.get_field(field).attname for field in fields}
+            values = {attname: value for attname, value in values.items() if attname in attnames}
+        self._loaded_values = dict(getattr(self, "_loaded_values", {}), **values)
+
+    def save_base(self, *args, **kwargs):
+        super().save_base(*args, **kwargs)
+        values = self._get_field_values()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            attnames = {self._meta.get_field(field).attname for field in update_fields}
+            values = {attname: value for attname, value in values.items() if attname in attnames}
+        self._loaded_values = dict(getattr(self, "_loaded_values", {}), **values)
+
+    def _get_field_values(self):
+        deferred = self.get_deferred_fields()
+        return {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+            if field.attname not in deferred
+        }
+
+    def get_loaded_value(self, attname, default=None):
+        """
+        Returns the value of given field as it was loaded from (or last saved to) the database.
+        """
+        return getattr(self, "_loaded_values", {}).get(attname, default)
+
+    def has_changed(self, *attnames):
+        """
+        Returns True, if any of the given fields has changed since the instance was loaded (or saved),
+        or if it is not known (e.g. for new instances).
+        """
+        loaded_values = getattr(self, "_loaded_values", None)
+        if self.pk is None or loaded_values is None:
+            return True
+        return any(
+            attname not in loaded_values or loaded_values[attname] != getattr(self, attname) for attname in attnames
+        )
@@ -6,7 +6,7 @@ from django.utils.translation import gettext_lazy as _
 from ..conf import settings
 from .article import Article
 from .attribute import Attribute
-from .category import Category
+from .category import Category, CategoryClosure
 
 
 class ArticlePlugin(CMSPlugin):
@@ -41,9 +41,23 @@ class ArticlePlugin(CMSPlugin):
 
 
 class ArticlesPluginBase(CMSPlugin):
+    PAGINATION_PAGES = "pages"
+    PAGINATION_CURSOR = "cursor"
+    PAGINATION_CHOICES = (
+        (PAGINATION_PAGES, _("numbered pages")),
+        (PAGINATION_CURSOR, _("previous / next only (faster for large archives)")),
+    )
+
     number = models.PositiveSmallIntegerField(
         _("Number of last articles"), default=3, validators=[MinValueValidator(1)]
     )
+    pagination = models.CharField(
+        _("Pagination"),
+        max_length=10,
+        choices=PAGINATION_CHOICES,
+        default=PAGINATION_PAGES,
+        help_text=_("Numbered pages need to count all the articles and get slower with every next page."),
+    )
     template = models.CharField(
         _("Template"),
         max_length=100,
@@ -52,6 +66,11 @@ class ArticlesPluginBase(CMSPlugin):
         help_text=_("The template used to render plugin."),
     )
     attributes = models.ManyToManyField(Attribute, verbose_name=_("attributes"), related_name="+", blank=True)
+    # ids of the related objects, so that the plugin may be rendered without querying the relations
+    relation_ids = models.JSONField(default=dict, editable=False)
+
+    # many-to-many relations stored in relation_ids
+    relations = ("attributes",)
 
     class Meta:
         abstract = True
@@ -59,6 +78,20 @@ class ArticlesPluginBase(CMSPlugin):
     def copy_relations(self, oldinstance):
         self.attributes.set(oldinstance.attributes.all())
 
+    def get_relation_ids(self, relation):
+        return self.relation_ids.get(relation, [])
+
+    def get_current_relation_ids(self):
+        return {relation: sorted(getattr(self, relation).values_list("pk", flat=True)) for relation in self.relations}
+
+    def update_relation_ids(self):
+        """
+        Stores the ids of the related objects in relation_ids.
+        Called whenever any of the relations is changed.
+        """
+        self.relation_ids = self.get_current_relation_ids()
+        type(self).objects.filter(pk=self.pk).update(relation_ids=self.relation_ids)
+
     def get_articles(self, context):
         try:
             edit_mode = context["request"].toolbar.edit_mode_active
@@ -70,11 +103,20 @@ class ArticlesPluginBase(CMSPlugin):
         else:
             articles = Article.objects.public().published()
 
-        for attribute in self.attributes.all():
-            articles = articles.filter(attributes=attribute)
+        attribute_ids = self.get_relation_ids("attributes")
+        if attribute_ids:
+            articles = articles.with_attributes(attribute_ids)
 
         return articles
 
+    def get_cache_scopes(self):
+        """
+        Returns the cache scopes of the articles possibly rendered by the plugin.
+        Cached content is invalidated whenever an article in any of the scopes
+        is published or unpublished.
+        """
+        return ["articles"]
+
 
 class ArticlesPlugin(ArticlesPluginBase):
     trees = models.ManyToManyField(
@@ -90,20 +132,29 @@ class ArticlesPlugin(ArticlesPluginBase):
     )
     categories = models.ManyToManyField(Category, verbose_name=_("categories"), related_name="+", blank=True)
 
+    relations = ("attributes", "trees", "categories")
+
     def __str__(self):
         return _("last {} articles").format(self.number)
 
     def get_articles(self, context):
         articles = super().get_articles(context)
 
-        if self.trees.count():
-            articles = articles.filter(tree__in=self.trees.all())
+        tree_ids = self.get_relation_ids("trees")
+        if tree_ids:
+            articles = articles.filter(tree_id__in=tree_ids)
 
-        if self.categories.count():
-            articles = articles.filter(categories__in=self.categories.all())
+        category_ids = self.get_relation_ids("categories")
+        if category_ids:
+            articles = articles.in_categories(category_ids)
 
         return articles
 
+    def get_cache_scopes(self):
+        scopes = ["tree:{}".format(pk) for pk in self.get_relation_ids("trees")]
+        scopes += ["category:{}".format(pk) for pk in self.get_relation_ids("categories")]
+        return scopes or super().get_cache_scopes()
+
     def copy_relations(self, oldinstance):
         self.trees.set(oldinstance.trees.all())
         self.categories.set(oldinstance.categories.all())
@@ -120,24 +171,41 @@ class ArticlesCategoryPlugin(ArticlesPluginBase):
     def __str__(self):
         return _("last {} articles in this category").format(self.number)
 
+    def get_current_relation_ids(self):
+        """
+        Adds the category of the page the plugin is placed on, creating it if necessary.
+        """
+        relation_ids = super().get_current_relation_ids()
+        page = self.placeholder.page if self.placeholder_id else None
+        if page is None:
+            relation_ids["categories"] = []
+        else:
+            category = Category.objects.get_or_create(page=page.get_draft_object())[0]
+            relation_ids["categories"] = [category.pk]
+        return relation_ids
+
     def get_articles(self, context):
         # no page - no category
-        if self.placeholder.page is None:
-            return []
-
-        page = self.placeholder.page.get_draft_object()
-        try:
-            category = page.cms_articles_category
-        except Category.DoesNotExist:
-            category = Category.objects.create(page=page)
+        category_ids = self.get_relation_ids("categories")
+        if not category_ids:
+            return Article.objects.none()
 
         articles = super().get_articles(context)
 
         if self.subcategories:
             if not self.placeholder.page.is_home:
-                articles = articles.filter(categories__page__node__path__startswith=page.node.path)
+                articles = articles.in_categories(
+                    CategoryClosure.objects.filter(ancestor__in=category_ids).values("descendant")
+                )
             # if self.placeholder.page.is_home, take all
         else:
-            articles = articles.filter(categories=category)
+            articles = articles.in_categories(category_ids)
 
         return articles
+
+    def get_cache_scopes(self):
+        # articles from sub-categories invalidate their ancestor categories too
+        scopes = ["category:{}".format(pk) for pk in self.get_relation_ids("categories")]
+        if not scopes or self.subcategories and self.placeholder.page.is_home:
+            return super().get_cache_scopes()
+        return scopes
@@ -1,4 +1,19 @@
+from collections import defaultdict
+
+from cms.constants import PUBLISHER_STATE_DIRTY, PUBLISHER_STATE_PENDING
+from cms.exceptions import LanguageError
 from cms.models.query import PageQuerySet
+from cms.utils.i18n import get_fallback_languages
+from django.db.models import Count, Exists, Min, OuterRef, Prefetch, Q
+from django.utils.timezone import now
+from django.utils.translation import get_language
+
+
+def _publication_window(current_time):
+    return (
+        Q(publication_date__lte=current_time) | Q(publication_date__isnull=True),
+        Q(publication_end_date__gt=current_time) | Q(publication_end_date__isnull=True),
+    )
 
 
 class ArticleQuerySet(PageQuerySet):
@@ -8,3 +23,166 @@ class ArticleQuerySet(PageQuerySet):
         if site is None:
             site = get_current_site()
         return self.filter(tree__node__site=site)
+
+    def published(self, site=None, language=None):
+        """
+        Unlike PageQuerySet.published, the titles are checked using EXISTS,
+        so that articles published in several languages are not duplicated,
+        and the publication window is checked using the live flag (see update_live),
+        so that the query does not depend on the current time.
+        """
+        from .title import Title
+
+        titles = Title.objects.filter(article=OuterRef("pk"))
+        published = titles.filter(published=True)
+        if language:
+            published = published.filter(language=language)
+        return self.on_site(site).filter(
+            Exists(published),
+            ~Exists(titles.filter(publisher_state=PUBLISHER_STATE_PENDING)),
+            live=True,
+        )
+
+    def delete(self):
+        """
+        Deletes the articles (both the draft and the public versions) using cms_articles.api.delete_articles.
+        Returns the total number of deleted objects and the numbers per model label, like QuerySet.delete.
+        """
+        from ..api import _delete_articles
+
+        counts = _delete_articles(self)[1]
+        return sum(counts.values()), dict(counts)
+
+    def in_publication_window(self, current_time=None):
+        return self.filter(*_publication_window(current_time or now()))
+
+    def update_live(self):
+        """
+        Sets the live flag of public articles, whose publication window has opened or closed,
+        and sends post_publish / post_unpublish signals for each of them.
+        Returns the number of updated articles.
+        """
+        from cms.signals import post_publish, post_unpublish
+
+        from .title import Title
+
+        current_time = now()
+        window = _publication_window(current_time)
+        public = self.public().select_related("publisher_public")
+        updated = 0
+        for articles, live, signal in (
+            (public.filter(*window, live=False), True, post_publish),
+            (public.filter(live=True).exclude(*window), False, post_unpublish),
+        ):
+            # skip articles updated by concurrent run
+            articles = [
+                article
+                for article in articles
+                if self.model.objects.filter(pk=article.pk, live=not live).update(live=live)
+            ]
+            updated += len(articles)
+            # the published languages of all the articles are loaded at once
+            languages = defaultdict(list)
+            for article_id, language in (
+                Title.objects.filter(article__in=articles, published=True)
+                .order_by("language")
+                .values_list("article", "language")
+            ):
+                languages[article_id].append(language)
+            for article in articles:
+                # the signals are sent with the draft article, the same way as when (un)publishing
+                for language in languages[article.pk]:
+                    signal.send(sender=self.model, instance=article.publisher_public, language=language)
+        return updated
+
+    def mark_dirty(self, languages=None):
+        """
+        Marks the titles of the draft articles (in given languages) as dirty
+        and updates the language_states of the articles.
+        """
+        from .article import get_dirty_language_states
+        from .title import Title
+
+        articles = list(self.filter(publisher_is_draft=True).only("pk", "language_states"))
+        titles = Title.objects.using(self.db).filter(article__in=articles)
+        if languages is not None:
+            titles = titles.filter(language__in=languages)
+        titles.update(publisher_state=PUBLISHER_STATE_DIRTY)
+        for article in articles:
+            article.language_states = get_dirty_language_states(article.language_states, languages)
+        self.model.objects.using(self.db).bulk_update(articles, ["language_states"])
+
+    def with_attributes(self, attributes):
+        """
+        Returns articles having all the given attributes (given by ids).
+        """
+        through = self.model.attributes.through
+        attributes = set(attributes)
+        if not attributes:
+            return self
+        if len(attributes) == 1:
+            return self.filter(Exists(through.objects.filter(article=OuterRef("pk"), attribute__in=attributes)))
+        matching = (
+            through.objects.filter(attribute__in=attributes)
+            .values("article")
+            .annotate(matched=Count("attribute", distinct=True))
+            .filter(matched=len(attributes))
+            .values("article")
+        )
+        return self.filter(pk__in=matching)
+
+    def in_categories(self, categories):
+        """
+        Returns articles in any of the given categories (ids or queryset).
+        """
+        through = self.model.categories.through
+        return self.filter(Exists(through.objects.filter(article=OuterRef("pk"), category__in=categories)))
+
+    def for_listing(self, language=None, description=True, taxonomy=True, languages=None):
+        """
+        Prefetches everything needed to render a list of articles
+        using a fixed number of queries regardless of the number of articles:
+
+        - titles in the given language and its fallbacks (used as `title_cache`)
+          with their images and derived content,
+        - trees (each tree is loaded only once) with their nodes and titles,
+        - attributes and categories (if `taxonomy` is True).
+
+        Use `description=False` to defer loading of the (possibly long) description
+        and `languages` to load titles in the given languages instead.
+        """
+        from cms.models import Page
+
+        from .title import Title
+
+        if languages is None:
+            if not language:
+                language = get_language()
+            try:
+                languages = [language] + get_fallback_languages(language)
+            except LanguageError:
+                languages = [language]
+
+        titles = Title.objects.filter(language__in=languages).select_related("image", "derived__image")
+        if not description:
+            titles = titles.defer("description")
+
+        lookups = [
+            Prefetch("title_set", queryset=titles, to_attr="_listing_titles"),
+            Prefetch("tree", queryset=Page.objects.select_related("node").prefetch_related("title_set")),
+        ]
+        if taxonomy:
+            lookups += ["attributes", "categories"]
+        return self.prefetch_related(*lookups)
+
+    def get_next_publication_change(self):
+        """
+        Returns the nearest future time, when some article goes live or expires.
+        """
+        current_time = now()
+        dates = [
+            self.filter(publication_date__gt=current_time).aggregate(date=Min("publication_date"))["date"],
+            self.filter(publication_end_date__gt=current_time).aggregate(date=Min("publication_end_date"))["date"],
+        ]
+        dates = [date for date in dates if date]
+        return min(dates) if dates else None
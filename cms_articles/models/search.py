@@ -0,0 +1,51 @@
+from django.contrib.sites.models import Site
+from django.db import models
+
+from .article import Article
+from .title import Title
+
+
+class SearchToken(models.Model):
+    """
+    Inverted index of the published titles used by ArticleManager.search (see cms_articles.search).
+    """
+
+    token = models.CharField(max_length=64)
+    language = models.CharField(max_length=15)
+    # the public article of the title, so that the articles are found without joining the titles
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name="+")
+    title = models.ForeignKey(Title, on_delete=models.CASCADE, related_name="search_tokens")
+    field = models.CharField(max_length=32)
+    weight = models.FloatField()
+
+    class Meta:
+        app_label = "cms_articles"
+        indexes = [models.Index(fields=["token", "language", "article"], name="cms_articles_search_token")]
+
+    def __str__(self):
+        return self.token
+
+
+class TitlePrefix(models.Model):
+    """
+    Prefixes of the words of the titles used by the autocomplete (see cms_articles.search.match_title_prefixes).
+    The draft titles and the published public titles of live articles are indexed.
+    """
+
+    prefix = models.CharField(max_length=10)
+    language = models.CharField(max_length=15)
+    site = models.ForeignKey(Site, on_delete=models.CASCADE, related_name="+")
+    draft = models.BooleanField()
+    title = models.ForeignKey(Title, on_delete=models.CASCADE, related_name="+")
+    # position of the first word of the title with the prefix (the titles starting with the prefix come first)
+    position = models.PositiveSmallIntegerField()
+
+    class Meta:
+        app_label = "cms_articles"
+        unique_together = (("title", "prefix"),)
+        indexes = [
+            models.Index(fields=["prefix", "language", "site", "draft", "position"], name="cms_articles_title_prefix")
+        ]
+
+    def __str__(self):
+        return self.prefix
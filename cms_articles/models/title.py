@@ -3,18 +3,25 @@ from __future__ import unicode_literals
 
 from datetime import timedelta
 
-from cms.constants import PUBLISHER_STATE_DIRTY
+from cms.constants import PUBLISHER_STATE_DIRTY, PUBLISHER_STATE_PENDING
 from django.db import models
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from djangocms_text.fields import HTMLField
 from filer.fields.image import FilerImageField
 
+from ..constants import (
+    LANGUAGE_STATE_DIRTY,
+    LANGUAGE_STATE_DRAFT,
+    LANGUAGE_STATE_PENDING,
+    LANGUAGE_STATE_PUBLISHED,
+)
 from .article import Article
 from .managers import TitleManager
+from .mixins import SnapshotMixin
 
 
-class Title(models.Model):
+class Title(SnapshotMixin, models.Model):
     # These are the fields whose values are compared when saving
     # a Title object to know if it has changed.
     editable_fields = [
@@ -66,6 +73,19 @@ class Title(models.Model):
     class Meta:
         unique_together = (("language", "article"),)
         app_label = "cms_articles"
+        indexes = [
+            # slug resolution
+            models.Index(
+                fields=["slug", "publisher_is_draft", "published", "language"],
+                name="cms_articles_title_slug",
+            ),
+            # slug resolution of published titles, on backends supporting partial indexes
+            models.Index(
+                fields=["slug", "article", "language"],
+                name="cms_articles_public_slug",
+                condition=models.Q(publisher_is_draft=False, published=True),
+            ),
+        ]
 
     def __str__(self):
         return "%s (%s, %s)" % (self.title, self.slug, self.language)
@@ -73,6 +93,18 @@ class Title(models.Model):
     def is_dirty(self):
         return self.publisher_state == PUBLISHER_STATE_DIRTY
 
+    def get_language_state(self):
+        """
+        Returns the publication state of the language (stored in Article.language_states).
+        """
+        if self.publisher_state == PUBLISHER_STATE_PENDING:
+            return LANGUAGE_STATE_PENDING
+        if not self.published:
+            return LANGUAGE_STATE_DRAFT
+        if self.publisher_state == PUBLISHER_STATE_DIRTY:
+            return LANGUAGE_STATE_DIRTY
+        return LANGUAGE_STATE_PUBLISHED
+
     def save_base(self, *args, **kwargs):
         """Overridden save_base. If an instance is draft, and was changed, mark
         it as dirty.
@@ -85,7 +117,7 @@ class Title(models.Model):
 
         # Published articles should always have a publication date
         # if the article is published we set the publish date if not set yet.
-        if self.article.publication_date is None and self.published:
+        if self.published and self.article.publication_date is None:
             self.article.publication_date = timezone.now() - timedelta(seconds=5)
 
         if self.publisher_is_draft and not keep_state and self.is_new_dirty():
@@ -96,17 +128,4 @@ class Title(models.Model):
         return super().save_base(*args, **kwargs)
 
     def is_new_dirty(self):
-        if not self.pk:
-            return True
-
-        try:
-            old_title = Title.objects.get(pk=self.pk)
-        except Title.DoesNotExist:
-            return True
-
-        for field in self.editable_fields:
-            old_val = getattr(old_title, field)
-            new_val = getattr(self, field)
-            if not old_val == new_val:
-                return True
-        return False
+        return self.has_changed(*self.editable_fields)
@@ -0,0 +1,134 @@
+import base64
+import binascii
+from collections.abc import Sequence
+from datetime import datetime
+from math import ceil
+
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from .conf import settings
+
+NEXT = "n"
+PREVIOUS = "p"
+
+
+def encode_cursor(direction, article):
+    value = "{}|{}|{}".format(direction, article.order_date.isoformat(), article.pk)
+    return base64.urlsafe_b64encode(value.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Returns tuple (direction, order_date, pk) or raises ValueError.
+    """
+    try:
+        value = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        direction, order_date, pk = value.split("|")
+    except (binascii.Error, UnicodeError, TypeError) as e:
+        raise ValueError(e)
+    if direction not in (NEXT, PREVIOUS):
+        raise ValueError(direction)
+    return direction, datetime.fromisoformat(order_date), int(pk)
+
+
+class CursorPaginator:
+    """
+    Paginates articles using keyset (seek) method on (order_date, id).
+
+    Unlike django.core.paginator.Paginator, it needs neither COUNT(*) nor OFFSET
+    to get a page, so the deep pages are as fast as the first one.
+    The total count is only evaluated on demand. Optional callable `count`
+    may be given to provide the count from some cheaper source.
+    """
+
+    def __init__(self, object_list, per_page, count=None):
+        self.object_list = object_list.order_by("-order_date", "-pk")
+        self.per_page = int(per_page)
+        self._count = count
+
+    @cached_property
+    def count(self):
+        if self._count is not None:
+            return self._count()
+        return self.object_list.count()
+
+    @cached_property
+    def num_pages(self):
+        return max(ceil(self.count / self.per_page), 1)
+
+    def page(self, cursor=None):
+        """
+        Returns page of articles following (or preceding) given cursor.
+        Invalid cursor results in the first page.
+        """
+        try:
+            direction, order_date, pk = decode_cursor(cursor)
+        except ValueError:
+            return self._first_page()
+
+        if direction == NEXT:
+            object_list = list(
+                self.object_list.filter(Q(order_date__lt=order_date) | Q(order_date=order_date, pk__lt=pk))[
+                    : self.per_page + 1
+                ]
+            )
+            has_next = len(object_list) > self.per_page
+            return CursorPage(object_list[: self.per_page], self, has_previous=True, has_next=has_next)
+
+        object_list = list(
+            self.object_list.filter(Q(order_date__gt=order_date) | Q(order_date=order_date, pk__gt=pk)).order_by(
+                "order_date", "pk"
+            )[: self.per_page + 1]
+        )
+        if len(object_list) <= self.per_page:
+            # there is nothing before, so this is actually the first page
+            return self._first_page()
+        object_list = object_list[: self.per_page]
+        object_list.reverse()
+        return CursorPage(object_list, self, has_previous=True, has_next=True)
+
+    def _first_page(self):
+        object_list = list(self.object_list[: self.per_page + 1])
+        has_next = len(object_list) > self.per_page
+        return CursorPage(object_list[: self.per_page], self, has_previous=False, has_next=has_next)
+
+
+class CursorPage(Sequence):
+    cursor_field = settings.CMS_ARTICLES_CURSOR_FIELD
+
+    def __init__(self, object_list, paginator, has_previous, has_next):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_previous = has_previous and bool(object_list)
+        self._has_next = has_next
+
+    def __repr__(self):
+        return "<Cursor page of {} articles>".format(len(self))
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_previous() or self.has_next()
+
+    @cached_property
+    def next_cursor(self):
+        if self.has_next():
+            return encode_cursor(NEXT, self.object_list[-1])
+        return None
+
+    @cached_property
+    def previous_cursor(self):
+        if self.has_previous():
+            return encode_cursor(PREVIOUS, self.object_list[0])
+        return None
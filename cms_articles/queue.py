@@ -0,0 +1,178 @@
+"""
+Background publishing of articles.
+
+When CMS_ARTICLES_PUBLISH_QUEUE is set, the admin does not publish articles within the request.
+It stores a PublishJob instead, which is processed by the configured backend:
+
+- DatabaseBackend leaves the job in the database for the cms_articles_publish_worker command,
+- ThreadPoolBackend processes the job in a thread of the current process (meant for development and tests).
+
+Other backends (e.g. using a task queue) only need to implement submit(job_id) calling run_job(job_id).
+"""
+
+import logging
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import partial
+
+from cms.utils.permissions import current_user
+from django.db import IntegrityError, connections, transaction
+from django.db.models import Q
+from django.utils.module_loading import import_string
+from django.utils.timezone import now
+
+from .conf import settings
+from .models import PublishJob
+
+logger = logging.getLogger(__name__)
+
+_backends = {}
+
+
+class DatabaseBackend:
+    """
+    The jobs are processed by the cms_articles_publish_worker command.
+    """
+
+    def submit(self, job_id):
+        pass
+
+
+class ThreadPoolBackend:
+    """
+    The jobs are processed by a pool of threads of the current process.
+    """
+
+    def __init__(self, max_workers=None):
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.CMS_ARTICLES_PUBLISH_QUEUE_WORKERS,
+            thread_name_prefix="cms_articles_publish",
+        )
+
+    def submit(self, job_id):
+        return self.executor.submit(self.run, job_id)
+
+    def run(self, job_id):
+        try:
+            return run_job(job_id)
+        finally:
+            # the connections of the worker threads are not closed by the request handling
+            connections.close_all()
+
+
+def get_backend():
+    """
+    Returns the configured backend or None, if the articles are published within the request.
+    """
+    path = settings.CMS_ARTICLES_PUBLISH_QUEUE
+    if not path:
+        return None
+    if path not in _backends:
+        _backends[path] = import_string(path)()
+    return _backends[path]
+
+
+def enqueue(article, language, action=PublishJob.ACTION_PUBLISH, changed_by=None):
+    """
+    Queues publishing (or unpublishing) of given draft article in given language.
+    A pending job for the same article and language is reused, so that the article is processed only once.
+    The job is submitted to the backend, when the current transaction is committed.
+    """
+    username = changed_by.get_username() if changed_by else "script"
+    while True:
+        try:
+            # the savepoint keeps the current transaction usable, if a concurrent request queued a job meanwhile
+            with transaction.atomic():
+                job, created = PublishJob.objects.get_or_create(
+                    article=article,
+                    language=language,
+                    status=PublishJob.STATUS_PENDING,
+                    defaults={"action": action, "changed_by": username},
+                )
+        except IntegrityError:
+            continue
+        if created:
+            break
+        # the pending job may have been started meanwhile, then a new one is queued
+        if PublishJob.objects.filter(pk=job.pk, status=PublishJob.STATUS_PENDING).update(
+            action=action, changed_by=username
+        ):
+            job.action, job.changed_by = action, username
+            return job
+    transaction.on_commit(partial(get_backend().submit, job.pk))
+    return job
+
+
+def run_job(job_id):
+    """
+    Runs given job, unless it is not pending anymore (e.g. it was taken by another worker).
+    The errors are stored in the job. Returns True, if the job was run.
+    """
+    if not PublishJob.objects.filter(pk=job_id, status=PublishJob.STATUS_PENDING).update(
+        status=PublishJob.STATUS_RUNNING, started=now()
+    ):
+        return False
+    job = PublishJob.objects.select_related("article").get(pk=job_id)
+    try:
+        with transaction.atomic(), current_user(job.changed_by):
+            if job.action == PublishJob.ACTION_PUBLISH:
+                job.article.publish(job.language)
+            else:
+                job.article.unpublish(job.language)
+    except Exception:
+        logger.exception("Failed to %s article %s (%s)", job.action, job.article_id, job.language)
+        job.status = PublishJob.STATUS_FAILED
+        job.error = traceback.format_exc()
+    else:
+        job.status = PublishJob.STATUS_DONE
+    job.finished = now()
+    job.save(update_fields=["status", "error", "finished"])
+    return True
+
+
+def get_active_jobs():
+    """
+    Returns the jobs, which are pending or running for less than CMS_ARTICLES_PUBLISH_QUEUE_TIMEOUT minutes.
+    """
+    cutoff = now() - timedelta(minutes=settings.CMS_ARTICLES_PUBLISH_QUEUE_TIMEOUT)
+    return PublishJob.objects.filter(
+        Q(status=PublishJob.STATUS_PENDING) | Q(status=PublishJob.STATUS_RUNNING, started__gte=cutoff)
+    )
+
+
+def fail_stale_jobs():
+    """
+    Marks the jobs running for more than CMS_ARTICLES_PUBLISH_QUEUE_TIMEOUT minutes as failed,
+    as their worker has most probably died (e.g. it was killed during a deploy).
+    The publishing of the article was rolled back with the worker's transaction, so it may be queued again.
+    Returns the number of failed jobs.
+    """
+    cutoff = now() - timedelta(minutes=settings.CMS_ARTICLES_PUBLISH_QUEUE_TIMEOUT)
+    return PublishJob.objects.filter(status=PublishJob.STATUS_RUNNING, started__lt=cutoff).update(
+        status=PublishJob.STATUS_FAILED,
+        error="The job was not finished within {} minutes.".format(settings.CMS_ARTICLES_PUBLISH_QUEUE_TIMEOUT),
+        finished=now(),
+    )
+
+
+def run_pending(limit=None):
+    """
+    Runs the pending jobs in the order they were queued. Returns the number of jobs run.
+    The stale running jobs are marked as failed first (see fail_stale_jobs).
+    """
+    stale = fail_stale_jobs()
+    if stale:
+        logger.warning("Marked %s stale publish jobs as failed", stale)
+    job_ids = PublishJob.objects.filter(status=PublishJob.STATUS_PENDING).values_list("pk", flat=True)
+    if limit:
+        job_ids = job_ids[:limit]
+    return sum(run_job(job_id) for job_id in list(job_ids))
+
+
+def get_status(article, language):
+    """
+    Returns the status of the latest job of given article and language (or None).
+    """
+    job = PublishJob.objects.filter(article=article, language=language).order_by("-pk").first()
+    return job and job.get_status()
@@ -0,0 +1,241 @@
+"""
+Built-in full-text search of the published articles.
+
+The text of the published titles (and of their plugins with search_fields) is split into tokens,
+which are stored in the SearchToken table with the weight of the field (see CMS_ARTICLES_SEARCH_WEIGHTS).
+The tokens are updated whenever an article is published or unpublished,
+use the cms_articles_search_index command to build them for the existing articles.
+"""
+
+import re
+import unicodedata
+from collections import Counter, defaultdict
+
+from cms.models import CMSPlugin
+from cms.plugin_pool import plugin_pool
+from django.db.models import Count, F, Sum
+from django.utils.html import strip_tags
+from django.utils.module_loading import import_string
+
+from .conf import settings
+from .models import Article, SearchToken, Title, TitleContent, TitlePrefix
+from .utils.plugins import _downcast
+
+TOKEN_MAX_LENGTH = SearchToken._meta.get_field("token").max_length
+PREFIX_MAX_LENGTH = TitlePrefix._meta.get_field("prefix").max_length
+
+_tokenizers = {}
+
+
+def tokenize(text, language=None):
+    """
+    Splits given text (possibly HTML) into lower case words without accents.
+    """
+    text = unicodedata.normalize("NFKD", strip_tags(text or "").lower())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return [token[:TOKEN_MAX_LENGTH] for token in re.findall(r"\w+", text)]
+
+
+def get_tokenizer(language):
+    """
+    Returns the tokenizer configured for given language (or its base language) in CMS_ARTICLES_SEARCH_TOKENIZERS.
+    """
+    if language not in _tokenizers:
+        tokenizers = settings.CMS_ARTICLES_SEARCH_TOKENIZERS
+        path = tokenizers.get(language) or tokenizers.get((language or "").split("-")[0])
+        _tokenizers[language] = import_string(path) if path else tokenize
+    return _tokenizers[language]
+
+
+def get_searchable_plugins():
+    """
+    Returns the plugin models with search_fields by the plugin types.
+    """
+    return {
+        plugin.__name__: plugin.model
+        for plugin in plugin_pool.get_all_plugins()
+        if getattr(plugin.model, "search_fields", None)
+    }
+
+
+def get_title_texts(titles):
+    """
+    Returns the texts of given public titles: {title: [(field, text)]}.
+    The content is the text derived at publish time (see cms_articles.content), if available,
+    otherwise it is loaded using one query for all the titles and one query per plugin type.
+    """
+    derived = dict(TitleContent.objects.filter(title__in=[title.pk for title in titles]).values_list("title", "text"))
+    missing = [title for title in titles if title.pk not in derived]
+    searchable = get_searchable_plugins()
+    placeholder_articles = dict(
+        Article.placeholders.through.objects.filter(article__in={title.article_id for title in missing}).values_list(
+            "placeholder", "article"
+        )
+    )
+    plugins = CMSPlugin.objects.filter(
+        placeholder__in=list(placeholder_articles),
+        language__in={title.language for title in missing},
+        plugin_type__in=list(searchable),
+    ).order_by("pk")
+    content = defaultdict(list)
+    for plugin in _downcast(list(plugins)):
+        if isinstance(plugin, tuple(searchable.values())):
+            content[placeholder_articles[plugin.placeholder_id], plugin.language].extend(
+                str(getattr(plugin, field) or "") for field in plugin.search_fields
+            )
+
+    return {
+        title: [
+            ("title", title.title),
+            ("description", title.description),
+            ("meta_description", title.meta_description),
+            (
+                "content",
+                derived[title.pk] if title.pk in derived else " ".join(content[title.article_id, title.language]),
+            ),
+        ]
+        for title in titles
+    }
+
+
+def update_search_tokens(articles, languages=None):
+    """
+    Rebuilds the search tokens of the public titles of given public articles (in given languages).
+    Only the published titles of the live articles are indexed (see ArticleQuerySet.update_live).
+    """
+    titles = Title.objects.filter(article__in=articles, publisher_is_draft=False).select_related("article")
+    if languages is not None:
+        titles = titles.filter(language__in=languages)
+    titles = list(titles)
+    SearchToken.objects.filter(title__in=[title.pk for title in titles]).delete()
+
+    weights = settings.CMS_ARTICLES_SEARCH_WEIGHTS
+    tokens = []
+    for title, texts in get_title_texts([title for title in titles if title.published and title.article.live]).items():
+        tokenizer = get_tokenizer(title.language)
+        title_weights = Counter()
+        for field, text in texts:
+            for token in tokenizer(text, title.language):
+                title_weights[token, field] += weights.get(field, 1)
+        tokens += [
+            SearchToken(
+                token=token,
+                language=title.language,
+                article_id=title.article_id,
+                title=title,
+                field=field,
+                weight=weight,
+            )
+            for (token, field), weight in title_weights.items()
+        ]
+    SearchToken.objects.bulk_create(tokens, batch_size=500)
+
+
+def remove_search_tokens(articles, languages=None):
+    """
+    Removes the search tokens of given public articles (in given languages).
+    """
+    tokens = SearchToken.objects.filter(article__in=articles)
+    if languages is not None:
+        tokens = tokens.filter(language__in=languages)
+    tokens.delete()
+
+
+def get_matches(query, language=None):
+    """
+    Returns the ids of the public articles matching all the words of given query with their scores
+    as a values queryset with the "article" and "score" keys (or None for empty query).
+    """
+    tokens = set(get_tokenizer(language)(query, language))
+    if not tokens:
+        return None
+    matches = SearchToken.objects.filter(token__in=tokens)
+    if language:
+        matches = matches.filter(language=language)
+    return (
+        matches.values("article")
+        .annotate(score=Sum("weight"), matched=Count("token", distinct=True))
+        .filter(matched=len(tokens))
+        .values("article", "score")
+    )
+
+
+def get_title_prefixes(text, language):
+    """
+    Returns the prefixes of the words of given text with the position of the first word having the prefix.
+    The one-letter prefixes are only indexed for one-letter words.
+    """
+    prefixes = {}
+    for position, word in enumerate(get_tokenizer(language)(text, language)):
+        for length in range(min(2, len(word)), min(len(word), PREFIX_MAX_LENGTH) + 1):
+            prefixes.setdefault(word[:length], position)
+    return prefixes
+
+
+def update_title_prefixes(titles):
+    """
+    Rebuilds the autocomplete prefixes of given titles (or title ids).
+    """
+    titles = list(
+        Title.objects.filter(pk__in=[getattr(title, "pk", title) for title in titles]).select_related(
+            "article__tree__node"
+        )
+    )
+    TitlePrefix.objects.filter(title__in=titles).delete()
+    TitlePrefix.objects.bulk_create(
+        [
+            TitlePrefix(
+                prefix=prefix,
+                language=title.language,
+                site_id=title.article.tree.node.site_id,
+                draft=title.publisher_is_draft,
+                title=title,
+                position=min(position, 32767),
+            )
+            for title in titles
+            if title.publisher_is_draft or title.published and title.article.live
+            for prefix, position in get_title_prefixes(title.title, title.language).items()
+        ],
+        batch_size=500,
+    )
+
+
+def match_title_prefixes(query, language=None, site=None, drafts=False):
+    """
+    Returns the titles, whose words start with all the words of given query,
+    as a values queryset with the "title" and "rank" keys ordered by the rank (lower is better).
+    """
+    words = list(dict.fromkeys(word[:PREFIX_MAX_LENGTH] for word in get_tokenizer(language)(query, language)))
+    prefixes = TitlePrefix.objects.filter(prefix__in=words, draft=drafts)
+    if language:
+        prefixes = prefixes.filter(language=language)
+    if site:
+        prefixes = prefixes.filter(site=site)
+    if not words:
+        return prefixes.none().values("title")
+    if len(words) == 1:
+        # each title has a single row per prefix, so that no grouping is needed
+        return prefixes.annotate(rank=F("position")).values("title", "rank").order_by("rank", "-title")
+    return (
+        prefixes.values("title")
+        .annotate(matched=Count("prefix"), rank=Sum("position"))
+        .filter(matched=len(words))
+        .values("title", "rank")
+        .order_by("rank", "-title")
+    )
+
+
+def autocomplete(query, language, site, drafts=False, limit=None):
+    """
+    Returns the (draft or public) titles, whose words start with all the words of given query.
+    """
+    if len(query.strip()) < settings.CMS_ARTICLES_AUTOCOMPLETE_MIN_LENGTH:
+        return []
+    title_ids = [
+        match["title"]
+        for match in match_title_prefixes(query, language, site, drafts)[
+            : limit or settings.CMS_ARTICLES_AUTOCOMPLETE_LIMIT
+        ]
+    ]
+    titles = Title.objects.select_related("article__tree").in_bulk(title_ids)
+    return [titles[pk] for pk in title_ids if pk in titles]
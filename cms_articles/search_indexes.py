@@ -1,14 +1,19 @@
+from collections import defaultdict
+
 from aldryn_search.helpers import get_plugin_index_data
 from aldryn_search.signals import add_to_index, remove_from_index
 from aldryn_search.utils import clean_join, get_index_base
-from cms.models import CMSPlugin
+from cms.models import CMSPlugin, Placeholder
 from cms.signals import post_publish, post_unpublish
-from django.db.models import Q
+from django.db.models import Prefetch
 from django.dispatch.dispatcher import receiver
-from django.utils import timezone
+from haystack import connections as haystack_connections
 
 from .conf import settings
-from .models import Title
+from .dispatch import is_bulk_publishing, post_publish_articles, post_unpublish_articles
+from .models import Article, Title
+from .utils.index import queue_titles
+from .utils.plugins import _downcast
 
 
 class TitleIndex(get_index_base()):
@@ -55,22 +60,64 @@ class TitleIndex(get_index_base()):
 
         CMS_ARTICLES_PLACEHOLDERS_SEARCH_LIST = {}
         """
+        return self.filter_placeholders(article.placeholders.all())
+
+    def filter_placeholders(self, placeholders):
+        """
+        Filters given placeholders according to CMS_ARTICLES_PLACEHOLDERS_SEARCH_LIST (see get_article_placeholders).
+        """
         placeholders_search_list = getattr(settings, "CMS_ARTICLES_PLACEHOLDERS_SEARCH_LIST", {})
 
         included = placeholders_search_list.get("include", [])
         excluded = placeholders_search_list.get("exclude", [])
         diff = set(included) - set(excluded)
         if diff:
-            return article.placeholders.filter(slot__in=diff)
+            return placeholders.filter(slot__in=diff)
         elif excluded:
-            return article.placeholders.exclude(slot__in=excluded)
+            return placeholders.exclude(slot__in=excluded)
         else:
-            return article.placeholders.all()
+            return placeholders
+
+    def prefetch_search_plugins(self, titles):
+        """
+        Loads the plugins used by get_search_data for all given titles at once
+        (one query per language and one query per plugin type),
+        so that the titles are indexed without any further plugin queries.
+        """
+        titles_by_language = defaultdict(list)
+        for title in titles:
+            titles_by_language[title.language].append(title)
+        placeholders = self.filter_placeholders(Placeholder.objects.all())
+        for language, language_titles in titles_by_language.items():
+            placeholder_articles = dict(
+                Article.placeholders.through.objects.filter(
+                    article__in={title.article_id for title in language_titles}, placeholder__in=placeholders
+                ).values_list("placeholder", "article")
+            )
+            plugins = list(
+                # the document order, as in get_search_data, is kept when the plugins are grouped by article
+                self.get_plugin_queryset(language)
+                .filter(placeholder__in=list(placeholder_articles))
+                .order_by("path")
+            )
+            # the instances are used by CMSPlugin.get_plugin_instance (see get_plugin_index_data)
+            for plugin, instance in zip(plugins, _downcast(plugins)):
+                if instance is not plugin:
+                    instance._render_meta = plugin._render_meta
+                    plugin._inst = instance
+            plugins_by_article = defaultdict(list)
+            for plugin in plugins:
+                plugins_by_article[placeholder_articles[plugin.placeholder_id]].append(plugin)
+            for title in language_titles:
+                title._search_plugins = plugins_by_article[title.article_id]
 
     def get_search_data(self, obj, language, request):
         current_article = obj.article
-        placeholders = self.get_article_placeholders(current_article)
-        plugins = self.get_plugin_queryset(language).filter(placeholder__in=placeholders)
+        plugins = getattr(obj, "_search_plugins", None)
+        if plugins is None:
+            placeholders = self.get_article_placeholders(current_article)
+            # the document order (the default order of CMSPlugin.objects), the same as in prefetch_search_plugins
+            plugins = self.get_plugin_queryset(language).filter(placeholder__in=placeholders).order_by("path")
         text_bits = []
 
         for base_plugin in plugins:
@@ -97,15 +144,14 @@ class TitleIndex(get_index_base()):
         return Title
 
     def get_index_queryset(self, language):
+        # there are no multi-valued joins, so there is no need for distinct()
         queryset = (
             Title.objects.public()
-            .filter(
-                Q(article__publication_date__lt=timezone.now()) | Q(article__publication_date__isnull=True),
-                Q(article__publication_end_date__gte=timezone.now()) | Q(article__publication_end_date__isnull=True),
-                language=language,
+            .filter(article__live=True, language=language)
+            .prefetch_related(
+                Prefetch("article", queryset=Article.objects.for_listing(language, description=False, taxonomy=False))
             )
-            .select_related("article")
-            .distinct()
+            .order_by("pk")
         )
         return queryset
 
@@ -115,15 +161,64 @@ class TitleIndex(get_index_base()):
         return kwargs.get("object_action") in self.object_actions
 
 
-@receiver(post_publish, dispatch_uid="publish_cms_article")
+def get_title_index(using):
+    return haystack_connections[using].get_unified_index().get_index(Title)
+
+
+def index_titles(using, pks):
+    """
+    Indexes the titles with given ids (a chunk of the index queryset) using given haystack connection.
+    It is called by the cms_articles_rebuild_index command, possibly in a worker process.
+    Returns the number of indexed titles.
+    """
+    index = get_title_index(using)
+    titles = list(index.index_queryset(using=using).filter(pk__in=pks))
+    index.prefetch_search_plugins(titles)
+    if titles:
+        haystack_connections[using].get_backend().update(index, titles)
+    return len(titles)
+
+
+def update_titles(title_ids):
+    """
+    Updates given (public) titles in the search index,
+    or removes them, if they are not published anymore or they were deleted.
+    """
+    titles = Title.objects.public().select_related("article").in_bulk(title_ids)
+    for title_id in title_ids:
+        title = titles.get(title_id)
+        if title is not None and title.published and title.article.live:
+            add_to_index.send(sender=Title, instance=title, object_action="publish")
+        else:
+            remove_from_index.send(sender=Title, instance=title or Title(pk=title_id), object_action="unpublish")
+
+
+def _queue_public_title(article, language):
+    # the index is updated, when the transaction is committed (see cms_articles.utils.index)
+    queue_titles(
+        Title.objects.filter(article=article.publisher_public_id, language=language).values_list("pk", flat=True)
+    )
+
+
+@receiver(post_publish, sender=Article, dispatch_uid="publish_cms_article")
 def publish_cms_article(sender, instance, language, **kwargs):
-    title = instance.publisher_public.get_title_obj(language)
-    print("##################### publish_cms_article", title)
-    add_to_index.send(sender=Title, instance=title, object_action="publish")
+    # the articles published in bulk are queued for the whole chunk (see publish_cms_articles)
+    if not is_bulk_publishing():
+        _queue_public_title(instance, language)
 
 
-@receiver(post_unpublish, dispatch_uid="unpublish_cms_article")
+@receiver(post_unpublish, sender=Article, dispatch_uid="unpublish_cms_article")
 def unpublish_cms_article(sender, instance, language, **kwargs):
-    title = instance.publisher_public.get_title_obj(language)
-    print("##################### unpublish_cms_article", title)
-    remove_from_index.send(sender=Title, instance=title, object_action="unpublish")
+    if not is_bulk_publishing():
+        _queue_public_title(instance, language)
+
+
+@receiver(post_publish_articles, sender=Article, dispatch_uid="publish_cms_articles")
+@receiver(post_unpublish_articles, sender=Article, dispatch_uid="unpublish_cms_articles")
+def publish_cms_articles(sender, articles, languages, **kwargs):
+    # the titles of the whole chunk are queued and the queue is flushed once
+    queue_titles(
+        Title.objects.filter(
+            article__in=[article.publisher_public_id for article in articles], language__in=languages
+        ).values_list("pk", flat=True)
+    )
@@ -1,11 +1,32 @@
-from cms.signals import post_placeholder_operation
+from cms.models import CMSPlugin, Page
+from cms.signals import post_obj_operation, post_placeholder_operation, post_publish, post_unpublish
+from django.apps import apps
 from django.db.models import signals
+from django.utils.autoreload import file_changed
 
 from ..admin.article import ArticleAdmin
-from ..models import Article, Title
-from .article import post_save_article, pre_delete_article, pre_save_article
-from .plugins import post_reorder_plugins, pre_delete_plugins, pre_save_plugins
-from .title import pre_delete_title, pre_save_title
+from ..dispatch import post_publish_articles, post_unpublish_articles
+from ..models import Article, ArticlesCategoryPlugin, ArticlesPlugin, Attribute, Category, Title
+from ..utils.placeholder import clear_placeholders_memo
+from .article import (
+    m2m_changed_article_relations,
+    post_publish_article,
+    post_publish_chunk,
+    post_save_article,
+    post_unpublish_article,
+    pre_delete_article,
+)
+from .category import post_move_page, post_save_category
+from .plugins import (
+    m2m_changed_plugin_relations,
+    post_delete_category,
+    post_reorder_plugins,
+    post_save_category_plugin,
+    pre_delete_plugin_relation,
+    pre_delete_plugins,
+    pre_save_plugins,
+)
+from .title import post_delete_title, post_save_title, pre_delete_title, pre_save_title
 
 # Signals we listen to
 
@@ -13,13 +34,55 @@ post_placeholder_operation.connect(
     post_reorder_plugins, sender=ArticleAdmin, dispatch_uid="cms_articles_post_reorder_plugins"
 )
 
-signals.pre_save.connect(pre_save_plugins, dispatch_uid="cms_articles_pre_save_plugin")
-signals.pre_delete.connect(pre_delete_plugins, dispatch_uid="cms_articles_pre_delete_plugin")
+for model in apps.get_models():
+    if issubclass(model, CMSPlugin):
+        signals.pre_save.connect(pre_save_plugins, sender=model, dispatch_uid="cms_articles_pre_save_plugin")
+        signals.pre_delete.connect(pre_delete_plugins, sender=model, dispatch_uid="cms_articles_pre_delete_plugin")
+
+for model in (ArticlesPlugin, ArticlesCategoryPlugin):
+    for relation in model.relations:
+        through = getattr(model, relation).through
+        signals.m2m_changed.connect(
+            m2m_changed_plugin_relations,
+            sender=through,
+            dispatch_uid="cms_articles_m2m_changed_{}".format(through._meta.model_name),
+        )
+signals.post_save.connect(
+    post_save_category_plugin, sender=ArticlesCategoryPlugin, dispatch_uid="cms_articles_post_save_category_plugin"
+)
+signals.post_delete.connect(
+    post_delete_category, sender=Category, dispatch_uid="cms_articles_post_delete_category_plugin"
+)
+for model in (Attribute, Category, Page):
+    signals.pre_delete.connect(
+        pre_delete_plugin_relation,
+        sender=model,
+        dispatch_uid="cms_articles_pre_delete_{}_plugin_relation".format(model._meta.model_name),
+    )
 
-signals.pre_save.connect(pre_save_article, sender=Article, dispatch_uid="cms_articles_pre_save_article")
 signals.post_save.connect(post_save_article, sender=Article, dispatch_uid="cms_articles_post_save_article")
 signals.pre_delete.connect(pre_delete_article, sender=Article, dispatch_uid="cms_articles_pre_delete_article")
+for relation in ("attributes", "categories"):
+    through = getattr(Article, relation).through
+    signals.m2m_changed.connect(
+        m2m_changed_article_relations,
+        sender=through,
+        dispatch_uid="cms_articles_m2m_changed_{}".format(through._meta.model_name),
+    )
+
+post_publish.connect(post_publish_article, sender=Article, dispatch_uid="cms_articles_post_publish_article")
+post_unpublish.connect(post_unpublish_article, sender=Article, dispatch_uid="cms_articles_post_unpublish_article")
+post_publish_articles.connect(post_publish_chunk, sender=Article, dispatch_uid="cms_articles_post_publish_chunk")
+post_unpublish_articles.connect(post_publish_chunk, sender=Article, dispatch_uid="cms_articles_post_unpublish_chunk")
 
 
 signals.pre_save.connect(pre_save_title, sender=Title, dispatch_uid="cms_articles_pre_save_article")
 signals.pre_delete.connect(pre_delete_title, sender=Title, dispatch_uid="cms_articles_pre_delete_article")
+signals.post_save.connect(post_save_title, sender=Title, dispatch_uid="cms_articles_post_save_title")
+signals.post_delete.connect(post_delete_title, sender=Title, dispatch_uid="cms_articles_post_delete_title")
+
+signals.post_save.connect(post_save_category, sender=Category, dispatch_uid="cms_articles_post_save_category")
+post_obj_operation.connect(post_move_page, dispatch_uid="cms_articles_post_move_page")
+
+# the templates may have been modified
+file_changed.connect(clear_placeholders_memo, dispatch_uid="cms_articles_clear_placeholders_memo")
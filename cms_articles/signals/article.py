@@ -2,18 +2,42 @@ import warnings
 
 from django.template import TemplateDoesNotExist
 
-from ..models import Article
+from ..cache import bump_generations
+from ..content import update_title_content
+from ..dispatch import is_bulk_publishing, is_deleting
+from ..models import Article, CategoryClosure, Title
+from ..models.article import get_dirty_language_states
+from ..search import remove_search_tokens, update_search_tokens, update_title_prefixes
 
 
-def pre_save_article(instance, **kwargs):
-    instance.old_article = None
-    try:
-        instance.old_article = Article.objects.get(pk=instance.pk)
-    except Article.DoesNotExist:
-        pass
+def _bump_article_generations(*articles):
+    """
+    Invalidates cached content, which may contain given articles.
+    """
+    # the categories themselves and all their ancestors
+    categories = set(
+        CategoryClosure.objects.filter(
+            descendant__in=Article.categories.through.objects.filter(
+                article__in=[article.pk for article in articles]
+            ).values("category")
+        ).values_list("ancestor", flat=True)
+    )
+    trees = {article.tree_id for article in articles}
+    bump_generations(
+        "articles",
+        *("tree:{}".format(tree_id) for tree_id in trees),
+        *("slugs:{}".format(tree_id) for tree_id in trees),
+        *("category:{}".format(pk) for pk in categories),
+    )
 
 
 def post_save_article(instance, raw, **kwargs):
+    # the article may have been moved to another tree
+    old_tree_id = instance.get_loaded_value("tree_id")
+    if old_tree_id and old_tree_id != instance.tree_id:
+        bump_generations("slugs:{}".format(old_tree_id), "slugs:{}".format(instance.tree_id))
+        # the tree may belong to another site
+        update_title_prefixes(Title.objects.filter(article=instance).values_list("pk", flat=True))
     if not raw:
         try:
             instance.rescan_placeholders()
@@ -21,9 +45,66 @@ def post_save_article(instance, raw, **kwargs):
             warnings.warn("Exception occurred: %s template does not exists" % e)
 
 
+def m2m_changed_article_relations(instance, action, reverse, pk_set, **kwargs):
+    """
+    Marks the draft articles as dirty, when their attributes or categories change.
+    """
+    if reverse:
+        if action in ("post_add", "post_remove") and pk_set:
+            Article.objects.filter(pk__in=pk_set).mark_dirty()
+    elif instance.publisher_is_draft:
+        if action == "post_clear" or action in ("post_add", "post_remove") and pk_set:
+            Article.objects.filter(pk=instance.pk).mark_dirty()
+            instance.language_states = get_dirty_language_states(instance.language_states)
+
+
 def pre_delete_article(instance, **kwargs):
+    # articles deleted by cms_articles.api.delete_articles are cleaned up at once
+    if is_deleting():
+        return
+    if instance.publisher_is_draft:
+        bump_generations("slugs:{}".format(instance.tree_id))
+    else:
+        _bump_article_generations(instance)
     for placeholder in instance.get_placeholders():
         for plugin in placeholder.cmsplugin_set.all().order_by("-depth"):
             plugin._no_reorder = True
             plugin.delete(no_mp=True)
         placeholder.delete()
+
+
+def _update_public_titles(articles, languages):
+    public_ids = [article.publisher_public_id for article in articles]
+    update_title_content(public_ids, languages)
+    update_title_prefixes(
+        Title.objects.filter(article__in=public_ids, language__in=languages).values_list("pk", flat=True)
+    )
+
+
+def post_publish_article(instance, language, **kwargs):
+    # the articles published in bulk are processed for the whole chunk (see post_publish_chunk)
+    if is_bulk_publishing():
+        return
+    _bump_article_generations(instance)
+    # the search tokens are made of the derived content
+    _update_public_titles([instance], [language])
+    update_search_tokens([instance.publisher_public_id], [language])
+
+
+def post_unpublish_article(instance, language, **kwargs):
+    if is_bulk_publishing():
+        return
+    _bump_article_generations(instance)
+    _update_public_titles([instance], [language])
+    remove_search_tokens([instance.publisher_public_id], [language])
+
+
+def post_publish_chunk(articles, languages, **kwargs):
+    """
+    Processes the chunk of articles published or unpublished by cms_articles.api using a fixed number of queries.
+    The languages are those of the whole chunk, so the tokens of the titles, which are still published,
+    are rebuilt rather than removed.
+    """
+    _bump_article_generations(*articles)
+    _update_public_titles(articles, languages)
+    update_search_tokens([article.publisher_public_id for article in articles], languages)
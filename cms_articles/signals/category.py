@@ -0,0 +1,23 @@
+from cms import operations
+from cms.models import TreeNode
+
+from ..models import Category, CategoryClosure
+
+
+def post_save_category(instance, raw, created, **kwargs):
+    if raw:
+        return
+    # the category itself and the categories below its page
+    categories = Category.objects.filter(page__node__path__startswith=instance.page.node.path)
+    if not created:
+        # the categories below its previous page
+        categories |= Category.objects.filter(
+            pk__in=CategoryClosure.objects.filter(ancestor=instance).values("descendant")
+        )
+    CategoryClosure.objects.rebuild(categories)
+
+
+def post_move_page(operation, **kwargs):
+    if operation == operations.MOVE_PAGE:
+        # the node has been updated in the database
+        CategoryClosure.objects.rebuild_subtree(TreeNode.objects.get(pk=kwargs["obj"].node_id).path)
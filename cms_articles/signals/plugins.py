@@ -1,23 +1,95 @@
-from cms.constants import PUBLISHER_STATE_DIRTY
-from cms.models import CMSPlugin, Placeholder
-
-
-def _set_dirty_placeholder(placeholder, language):
-    for article in placeholder.cms_articles.all():
-        article.title_set.filter(language=language).update(publisher_state=PUBLISHER_STATE_DIRTY)
-
-
-def _set_dirty_plugin(plugin):
-    if plugin.placeholder_id:
-        try:
-            placeholder = plugin.placeholder
-        except Placeholder.DoesNotExist:
-            placeholder = None
-    else:
-        placeholder = plugin.placeholder
+from functools import reduce
+from operator import or_
 
-    if placeholder:
-        _set_dirty_placeholder(placeholder, plugin.language)
+from cms.constants import PUBLISHER_STATE_DIRTY
+from cms.models import CMSPlugin
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Q
+
+from ..dispatch import is_publishing
+
+
+def _mark_dirty(pairs, using=DEFAULT_DB_ALIAS):
+    """
+    Marks the titles of the articles using given placeholders in given languages as dirty
+    using a single query to find the articles and a single update.
+    """
+    from ..models import Article, Title
+    from ..models.article import get_dirty_language_states
+
+    articles = {}
+    for placeholder_id, article_id in (
+        Article.placeholders.through.objects.using(using)
+        .filter(placeholder__in={placeholder_id for placeholder_id, language in pairs})
+        .values_list("placeholder", "article")
+    ):
+        articles.setdefault(placeholder_id, set()).add(article_id)
+    article_languages = {}
+    for placeholder_id, language in pairs:
+        article_languages.setdefault(language, set()).update(articles.get(placeholder_id, ()))
+    conditions = [Q(language=language, article__in=ids) for language, ids in article_languages.items() if ids]
+    if not conditions:
+        return
+    Title.objects.using(using).filter(reduce(or_, conditions)).update(publisher_state=PUBLISHER_STATE_DIRTY)
+    articles = list(
+        Article.objects.using(using)
+        .filter(pk__in=set().union(*article_languages.values()), publisher_is_draft=True)
+        .only("pk", "language_states")
+    )
+    for article in articles:
+        languages = [language for language, ids in article_languages.items() if article.pk in ids]
+        article.language_states = get_dirty_language_states(article.language_states, languages)
+    Article.objects.using(using).bulk_update(articles, ["language_states"])
+
+
+class DirtyPlaceholders:
+    """
+    The (placeholder id, language) pairs changed within a transaction.
+    The titles of the articles using them are marked as dirty at once, when the transaction is committed.
+    """
+
+    def __init__(self, connection):
+        # Django replaces the list of commit hooks on commit and on rollback,
+        # so it tells whether this batch still belongs to the current transaction
+        self.hooks = connection.run_on_commit
+        self.using = connection.alias
+        self.pairs = set()
+        self.flushed = False
+
+    def flush(self):
+        self.flushed = True
+        _mark_dirty(self.pairs, self.using)
+
+    @classmethod
+    def add(cls, placeholder_id, language, using=DEFAULT_DB_ALIAS):
+        connection = connections[using]
+        if not connection.in_atomic_block:
+            _mark_dirty({(placeholder_id, language)}, using)
+            return
+        batch = getattr(connection, "cms_articles_dirty_placeholders", None)
+        if batch is None or batch.hooks is not connection.run_on_commit:
+            previous, batch = batch, cls(connection)
+            if previous and not previous.flushed:
+                # the hook of the previous batch may have been discarded with a rolled back savepoint
+                batch.pairs.update(previous.pairs)
+            connection.cms_articles_dirty_placeholders = batch
+            transaction.on_commit(batch.flush, using=using)
+        batch.pairs.add((placeholder_id, language))
+
+    @classmethod
+    def discard(cls, placeholder_ids, language, using=DEFAULT_DB_ALIAS):
+        """
+        Forgets the pending changes of given placeholders in given language,
+        so that the titles are not marked as dirty again after they were published in the same transaction.
+        """
+        batch = getattr(connections[using], "cms_articles_dirty_placeholders", None)
+        if batch is not None and not batch.flushed:
+            batch.pairs.difference_update((placeholder_id, language) for placeholder_id in placeholder_ids)
+
+
+def _set_dirty_placeholder(placeholder_id, language, using=DEFAULT_DB_ALIAS):
+    if placeholder_id:
+        DirtyPlaceholders.add(placeholder_id, language, using)
 
 
 def post_reorder_plugins(**kwargs):
@@ -25,45 +97,85 @@ def post_reorder_plugins(**kwargs):
         placeholder = kwargs.get(prefix + "_placeholder")
         language = kwargs.get(prefix + "_language")
         if placeholder and language:
-            _set_dirty_placeholder(placeholder, language)
+            _set_dirty_placeholder(placeholder.pk, language)
 
     placeholder = kwargs.get("placeholder")
     if placeholder:
         for arg_name in ("plugin", "old_plugin", "new_plugin"):
             plugin = kwargs.get("plugin")
             if plugin:
-                _set_dirty_placeholder(placeholder, plugin.language)
+                _set_dirty_placeholder(placeholder.pk, plugin.language)
                 break
 
 
-def pre_save_plugins(**kwargs):
-    plugin = kwargs["instance"]
+def pre_save_plugins(instance, using, **kwargs):
+    if hasattr(instance, "_no_reorder") or is_publishing():
+        return
+
+    _set_dirty_placeholder(instance.placeholder_id, instance.language, using)
 
-    if not isinstance(plugin, CMSPlugin) or hasattr(plugin, "_no_reorder"):
+    if not instance.pk:
         return
 
-    _set_dirty_plugin(plugin)
+    # the plugin may have been moved from another placeholder
+    old_plugin = (
+        CMSPlugin.objects.using(using)
+        .exclude(placeholder=instance.placeholder_id)
+        .filter(pk=instance.pk)
+        .values_list("placeholder", "language")
+        .first()
+    )
+    if old_plugin:
+        _set_dirty_placeholder(*old_plugin, using=using)
 
-    if not plugin.pk:
+
+def pre_delete_plugins(instance, using, **kwargs):
+    if hasattr(instance, "_no_reorder") or is_publishing():
         return
 
-    try:
-        old_plugin = (
-            CMSPlugin.objects.select_related("placeholder")
-            .only("language", "placeholder")
-            .exclude(placeholder=plugin.placeholder_id)
-            .get(pk=plugin.pk)
-        )
-    except CMSPlugin.DoesNotExist:
-        pass
-    else:
-        _set_dirty_plugin(old_plugin)
+    _set_dirty_placeholder(instance.placeholder_id, instance.language, using)
 
 
-def pre_delete_plugins(**kwargs):
-    plugin = kwargs["instance"]
+def m2m_changed_plugin_relations(**kwargs):
+    if kwargs["action"] in ("post_add", "post_remove", "post_clear") and not kwargs["reverse"]:
+        kwargs["instance"].update_relation_ids()
+
+
+def pre_delete_plugin_relation(**kwargs):
+    """
+    Removes the deleted object from the plugins, so that their relation_ids are updated.
+    """
+    from ..models import ArticlesCategoryPlugin, ArticlesPlugin
+
+    instance = kwargs["instance"]
+    for model in (ArticlesPlugin, ArticlesCategoryPlugin):
+        for relation in model.relations:
+            if model._meta.get_field(relation).related_model is not type(instance):
+                continue
+            for plugin in model.objects.filter(**{relation: instance}):
+                getattr(plugin, relation).remove(instance)
+
+
+def post_delete_category(instance, **kwargs):
+    """
+    Refreshes the relation_ids of the category plugins showing the deleted category,
+    once the deletion is committed (the category may be deleted together with its page).
+    Their page gets a new category, if it still exists (see ArticlesCategoryPlugin.get_current_relation_ids).
+    """
+    from ..models import ArticlesCategoryPlugin
+
+    # the primary key of the instance is cleared after the deletion
+    category_id = instance.pk
+
+    def refresh_plugins():
+        for plugin in ArticlesCategoryPlugin.objects.select_related("placeholder"):
+            if category_id in plugin.get_relation_ids("categories"):
+                plugin.update_relation_ids()
+
+    transaction.on_commit(refresh_plugins)
 
-    if not isinstance(plugin, CMSPlugin) or hasattr(plugin, "_no_reorder"):
-        return
 
-    _set_dirty_plugin(plugin)
+def post_save_category_plugin(instance, raw, **kwargs):
+    # the plugin may have been placed on another page
+    if not raw:
+        instance.update_relation_ids()
@@ -1,24 +1,54 @@
+from ..cache import bump_generations
+from ..dispatch import is_deleting
+from ..models import Article
+from ..search import update_title_prefixes
+
+
+def _update_article_languages(article, languages, language_states):
+    """
+    Updates article.languages and article.language_states using single query.
+    """
+    languages = ",".join(languages)
+    if languages != (article.languages or "") or language_states != article.language_states:
+        Article.objects.filter(pk=article.pk).update(languages=languages, language_states=language_states)
+        article.languages = languages
+        article.language_states = language_states
+
+
 def pre_save_title(instance, **kwargs):
-    """Update article.languages"""
-    if instance.article.languages:
-        languages = instance.article.languages.split(",")
-    else:
-        languages = []
+    """Update article.languages and article.language_states"""
+    article = instance.article
+    languages = article.languages.split(",") if article.languages else []
     if instance.language not in languages:
         languages.append(instance.language)
-        instance.article.languages = ",".join(languages)
-        instance.article._publisher_keep_state = True
-        instance.article.save(no_signals=True)
+    language_states = dict(article.language_states, **{instance.language: instance.get_language_state()})
+    _update_article_languages(article, languages, language_states)
 
 
 def pre_delete_title(instance, **kwargs):
-    """Update article.languages"""
-    if instance.article.languages:
-        languages = instance.article.languages.split(",")
-    else:
-        languages = []
+    """Update article.languages and article.language_states"""
+    if is_deleting():
+        # the article is being deleted too
+        return
+    article = instance.article
+    languages = article.languages.split(",") if article.languages else []
     if instance.language in languages:
         languages.remove(instance.language)
-        instance.article.languages = ",".join(languages)
-        instance.article._publisher_keep_state = True
-        instance.article.save(no_signals=True)
+    language_states = {
+        language: state for language, state in article.language_states.items() if language != instance.language
+    }
+    _update_article_languages(article, languages, language_states)
+
+
+def post_save_title(instance, raw, **kwargs):
+    # the slug may have changed
+    bump_generations("slugs:{}".format(instance.article.tree_id))
+    # the public titles are updated, when they are published or unpublished
+    if not raw and instance.publisher_is_draft and instance.has_changed("title"):
+        update_title_prefixes([instance])
+
+
+def post_delete_title(instance, **kwargs):
+    if is_deleting():
+        return
+    bump_generations("slugs:{}".format(instance.article.tree_id))
@@ -249,3 +249,11 @@ def url_page(context, page):
     get = context["request"].GET.copy()
     get[settings.CMS_ARTICLES_PAGE_FIELD] = page
     return "{}?{}".format(context["request"].path, get.urlencode())
+
+
+@register.simple_tag(takes_context=True)
+def url_cursor(context, cursor):
+    get = context["request"].GET.copy()
+    get.pop(settings.CMS_ARTICLES_PAGE_FIELD, None)
+    get[settings.CMS_ARTICLES_CURSOR_FIELD] = cursor
+    return "{}?{}".format(context["request"].path, get.urlencode())
@@ -0,0 +1,37 @@
+import pytest
+from cms.api import create_page
+from cms.signals import post_publish, post_unpublish
+
+from cms_articles.dispatch import post_publish_articles, post_unpublish_articles
+from cms_articles.models import Article
+
+
+@pytest.fixture
+def tree(db):
+    return create_page(
+        title="News",
+        template="default.html",
+        language="en",
+        apphook="CMSArticlesApp",
+        apphook_namespace="news",
+        published=True,
+    )
+
+
+@pytest.fixture
+def sent_signals(request):
+    """
+    Records the (signal, instance, language, articles) of the publishing signals sent for the articles.
+    The recorded signals may be given using indirect parametrization, all of them are recorded by default.
+    """
+    signals = getattr(request, "param", (post_publish, post_unpublish, post_publish_articles, post_unpublish_articles))
+    sent = []
+
+    def receiver(signal, **kwargs):
+        sent.append((signal, kwargs.get("instance"), kwargs.get("language"), kwargs.get("articles")))
+
+    for signal in signals:
+        signal.connect(receiver, sender=Article)
+    yield sent
+    for signal in signals:
+        signal.disconnect(receiver, sender=Article)
@@ -40,6 +40,7 @@ INSTALLED_APPS = [
     "filer",
     "cms",
     "cms_articles",
+    "cms_articles.import_wordpress",
     "menus",
     "sekizai",
     "treebeard",
@@ -126,3 +127,7 @@ CMS_TEMPLATES = [
 ]
 
 SITE_ID = 1
+
+# the migrations of import_wordpress depend on a migration of django-filer, which is not available
+# in all the supported versions, so the tables are created from the models
+MIGRATION_MODULES = {"import_wordpress": None}
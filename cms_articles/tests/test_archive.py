@@ -0,0 +1,66 @@
+from datetime import datetime
+
+import pytest
+from django.core.cache import cache
+from django.test import RequestFactory
+from django.utils import timezone
+from django.utils.timezone import make_aware
+
+from cms_articles.api import create_article
+from cms_articles.archive import Archive
+from cms_articles.models import Article
+
+
+@pytest.fixture
+def articles(tree):
+    for i, day in enumerate([(2010, 3, 5), (2010, 3, 5), (2010, 7, 1), (2015, 1, 20)]):
+        create_article(
+            tree=tree,
+            title="Article {}".format(i),
+            template="cms_articles/default.html",
+            language="en",
+            publication_date=make_aware(datetime(*day, 12)),
+            published=True,
+        )
+    return Article.objects.public().published()
+
+
+@pytest.mark.django_db
+def test_archive_histogram(articles, django_assert_num_queries):
+    archive = Archive(articles, RequestFactory().get("/news/", {"year": "2010"}))
+    with django_assert_num_queries(1):
+        years = [
+            (y.year, y.count, [(m.month, m.count, [(d.day, d.count) for d in m.days()]) for m in y.months()])
+            for y in archive.years()
+        ]
+    assert years == [
+        (2015, 1, [(1, 1, [(20, 1)])]),
+        (2010, 3, [(7, 1, [(1, 1)]), (3, 2, [(5, 2)])]),
+    ]
+    assert archive.count == 4
+    assert [y.active for y in archive.years()] == [False, True]
+
+
+@pytest.mark.django_db
+def test_archive_cache(articles, django_assert_num_queries):
+    cache.clear()
+    request = RequestFactory().get("/news/")
+    assert Archive(articles, request, cache_key="plugin").count == 4
+    with django_assert_num_queries(0):
+        assert Archive(articles, request, cache_key="plugin").count == 4
+
+    # publishing an article invalidates the cache
+    article = Article.objects.drafts().first()
+    article.unpublish("en")
+    assert Archive(articles, request, cache_key="plugin").count == 3
+
+
+@pytest.mark.django_db
+def test_archive_cache_time_zone(articles):
+    cache.clear()
+    request = RequestFactory().get("/news/")
+    assert Archive(articles, request, cache_key="plugin").histogram[0][0].day == 20
+    # 12:00 UTC is the next day in UTC+14
+    with timezone.override("Pacific/Kiritimati"):
+        assert Archive(articles, request, cache_key="plugin").histogram[0][0].day == 21
+    assert Archive(articles, request, cache_key="plugin").histogram[0][0].day == 20
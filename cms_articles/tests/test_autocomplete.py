@@ -0,0 +1,96 @@
+import json
+
+import pytest
+from django.contrib import admin
+from django.contrib.sites.models import Site
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+
+from cms_articles import search, views
+from cms_articles.api import create_article
+from cms_articles.models import Article, TitlePrefix
+
+
+def create(tree, title, publish=True):
+    article = create_article(
+        tree=tree.get_public_object(), title=title, template="cms_articles/default.html", language="en"
+    )
+    if publish:
+        article.publish("en")
+    return article
+
+
+def complete(query, drafts=False):
+    return [title.title for title in search.autocomplete(query, "en", Site.objects.get_current(), drafts)]
+
+
+def test_get_title_prefixes():
+    assert search.get_title_prefixes("A New Hope", "en") == {"a": 0, "ne": 1, "new": 1, "ho": 2, "hop": 2, "hope": 2}
+    assert max(search.get_title_prefixes("Internationalization", "en")) == "internatio"
+
+
+@pytest.mark.django_db
+def test_autocomplete(tree):
+    create(tree, "Apple pie")
+    create(tree, "Green apples")
+    create(tree, "Pineapple")
+    draft = create(tree, "Apricot jam", publish=False)
+
+    # the titles starting with the query come first
+    assert complete("ap") == ["Apple pie", "Green apples"]
+    assert complete("APPLES gr") == ["Green apples"]
+    assert complete("ap", drafts=True) == ["Apricot jam", "Apple pie", "Green apples"]
+    assert complete("a") == []
+
+    with CaptureQueriesContext(connection) as queries:
+        complete("pie ap")
+    assert len(queries) == 2
+
+    # the index is maintained, when the titles are edited, published or unpublished
+    title = draft.title_set.get(language="en")
+    title.title = "Plum jam"
+    title.save()
+    assert complete("ap", drafts=True) == ["Apple pie", "Green apples"]
+    Article.objects.get(title_set__title="Green apples", publisher_is_draft=True).unpublish("en")
+    assert complete("ap") == ["Apple pie"]
+    assert not TitlePrefix.objects.filter(draft=False, title__title="Green apples").exists()
+
+
+@pytest.mark.django_db
+def test_autocomplete_view(tree, rf, admin_user):
+    create(tree, "Apple pie")
+    create(tree, "Apricot jam", publish=False)
+
+    response = views.autocomplete(rf.get("/", {"q": "ap", "language": "en"}))
+    assert [result["title"] for result in json.loads(response.content)["results"]] == ["Apple pie"]
+    assert "public" in response["Cache-Control"]
+
+    request = rf.get("/", {"q": "ap", "language": "en", "drafts": "1"})
+    request.user = admin_user
+    response = views.autocomplete(request)
+    assert len(json.loads(response.content)["results"]) == 2
+    assert "private" in response["Cache-Control"]
+
+
+@pytest.mark.django_db
+def test_admin_search(tree, rf, admin_user):
+    apple = create(tree, "Apple pie")
+    create(tree, "Apricot jam")
+
+    model_admin = admin.site._registry[Article]
+    request = rf.get("/admin/autocomplete/")
+    request.user = admin_user
+    request.resolver_match = resolve("/admin/autocomplete/")
+    queryset = model_admin.get_queryset(request)
+    articles, use_distinct = model_admin.get_search_results(request, queryset, "pie")
+    assert list(articles) == [apple] and not use_distinct
+    assert apple in model_admin.get_search_results(request, queryset, str(apple.pk))[0]
+    # only the beginnings of the words are matched
+    assert list(model_admin.get_search_results(request, queryset, "pple")[0]) == []
+
+    # the changelist searches all the search_fields
+    request = rf.get("/")
+    request.user = admin_user
+    assert list(model_admin.get_search_results(request, queryset, "le-p")[0]) == [apple]
+    assert list(model_admin.get_search_results(request, queryset, "pple")[0]) == [apple]
@@ -0,0 +1,42 @@
+import copy
+import json
+
+import pytest
+
+from cms_articles.benchmark import build_dataset, run_benchmarks
+from cms_articles.benchmark.runner import percentile
+from cms_articles.models import Article
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([3], 90) == 3
+
+
+@pytest.mark.django_db
+def test_benchmarks(settings):
+    templates = copy.deepcopy(settings.TEMPLATES)
+    templates[0]["OPTIONS"]["context_processors"].append("sekizai.context_processors.sekizai")
+    settings.TEMPLATES = templates
+    dataset = build_dataset(articles=5, categories=3, attributes=2)
+    assert Article.objects.public().published().count() == 5
+
+    results = json.loads(json.dumps(run_benchmarks(dataset, repeat=2)))
+    benchmarks = results["benchmarks"]
+    assert results["dataset"]["articles"] == 5
+    for name in ("article_detail", "articles_plugin", "archive", "search"):
+        assert benchmarks[name]["repeat"] == 2
+        assert benchmarks[name]["queries"]["max"] > 0
+    # rendered content is cached
+    assert benchmarks["articles_plugin_cached"]["queries"]["max"] < benchmarks["articles_plugin"]["queries"]["min"]
+    assert set(benchmarks["publish"]) == {"publish", "unpublish"}
+    assert Article.objects.public().published().count() == 5
+
+
+@pytest.mark.django_db
+def test_benchmarks_without_articles():
+    dataset = build_dataset(articles=0, categories=1, attributes=1)
+    results = run_benchmarks(dataset, repeat=2, benchmarks=["article_detail", "publish", "title_index"])
+    assert all("skipped" in result for result in results["benchmarks"].values())
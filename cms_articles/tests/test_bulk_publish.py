@@ -0,0 +1,163 @@
+import pytest
+from cms.api import add_plugin
+from cms.constants import PUBLISHER_STATE_DEFAULT, PUBLISHER_STATE_DIRTY
+from cms.models import CMSPlugin
+from cms.signals import post_publish, post_unpublish
+from django.contrib import admin
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from djangocms_text.cms_plugins import TextPlugin
+
+from cms_articles.api import create_article, create_title, publish_articles, unpublish_articles
+from cms_articles.dispatch import post_publish_articles, post_unpublish_articles
+from cms_articles.models import Article, Attribute, SearchToken, Title, TitleContent
+
+
+@pytest.fixture
+def articles(tree, settings):
+    settings.LANGUAGES = [("en", "English"), ("de", "German")]
+    settings.CMS_LANGUAGES = {1: [{"code": "en", "name": "English"}, {"code": "de", "name": "German"}]}
+    attribute = Attribute.objects.create(name="Breaking")
+    articles = []
+    for i in range(3):
+        article = create_article(
+            tree=tree.get_public_object(),
+            title="Article {}".format(i),
+            slug="article-{}".format(i),
+            template="cms_articles/default.html",
+            language="en",
+            attributes=[attribute],
+        )
+        create_title(article=article, language="de", title="Artikel {}".format(i), slug="artikel-{}".format(i))
+        placeholder = article.placeholders.get(slot="content")
+        for language in ("en", "de"):
+            add_plugin(placeholder, TextPlugin, language, body="{} {}".format(language, i))
+        articles.append(article)
+    return articles
+
+
+@pytest.mark.django_db
+def test_publish_articles(articles, sent_signals):
+    # one article was published before
+    articles[0].publish("en")
+    del sent_signals[:]
+
+    assert publish_articles(Article.objects.filter(pk__in=[a.pk for a in articles]), chunk_size=2) == 3
+
+    for article in articles:
+        article = article.reload()
+        public = article.publisher_public
+        assert public.live
+        assert public.get_languages() == ["de", "en"]
+        assert public.order_date == article.order_date == article.publication_date
+        assert list(public.attributes.all()) == list(article.attributes.all())
+        for title in article.title_set.all():
+            assert title.published
+            assert title.publisher_state == PUBLISHER_STATE_DEFAULT
+            assert title.publisher_public.slug == title.slug
+            assert title.publisher_public.published
+        assert sorted(
+            CMSPlugin.objects.filter(placeholder__cms_articles=public).values_list("language", flat=True)
+        ) == ["de", "en"]
+
+    assert Article.objects.public().published(language="en").count() == 3
+    assert Article.objects.public().published(language="de").count() == 3
+    # publishing again does not duplicate anything
+    publish_articles(articles)
+    assert CMSPlugin.objects.filter(placeholder__cms_articles__publisher_is_draft=False).count() == 6
+    assert Title.objects.filter(publisher_is_draft=False).count() == 6
+
+    # the signals are sent for every article and language, and once for every chunk
+    assert [(signal, instance, language) for signal, instance, language, _ in sent_signals[:5]] == [
+        (post_publish, articles[0], "de"),
+        (post_publish, articles[0], "en"),
+        (post_publish, articles[1], "de"),
+        (post_publish, articles[1], "en"),
+        (post_publish_articles, None, None),
+    ]
+    assert sent_signals[4][3] == articles[:2]
+
+
+@pytest.mark.django_db
+def test_unpublish_articles(articles, sent_signals):
+    publish_articles(articles)
+    del sent_signals[:]
+
+    assert unpublish_articles(articles, ["de"]) == 3
+
+    assert Article.objects.public().published(language="en").count() == 3
+    assert not Article.objects.public().published(language="de").exists()
+    for title in Title.objects.filter(language="de"):
+        assert not title.published
+    assert set(
+        Title.objects.filter(language="de", publisher_is_draft=True).values_list("publisher_state", flat=True)
+    ) == {PUBLISHER_STATE_DIRTY}
+    assert not CMSPlugin.objects.filter(placeholder__cms_articles__publisher_is_draft=False, language="de").exists()
+    assert CMSPlugin.objects.filter(placeholder__cms_articles__publisher_is_draft=False, language="en").count() == 3
+    assert [signal for signal, *_ in sent_signals] == [post_unpublish] * 3 + [post_unpublish_articles]
+
+    # nothing left to unpublish
+    assert unpublish_articles(articles, ["de"]) == 0
+
+
+@pytest.mark.django_db
+def test_publish_articles_derived_data(tree, articles):
+    more = []
+    for i in range(3, 9):
+        more.append(
+            create_article(
+                tree=tree.get_public_object(),
+                title="Article {}".format(i),
+                template="cms_articles/default.html",
+                language="en",
+            )
+        )
+
+    def count_queries(articles, process=publish_articles):
+        tables = ("cms_articles_titlecontent", "cms_articles_searchtoken", "cms_articles_titleprefix")
+        with CaptureQueriesContext(connection) as queries:
+            process(articles)
+        return len([query for query in queries if any(table in query["sql"] for table in tables)])
+
+    # the derived content, the search tokens and the title prefixes are updated for the whole chunk
+    assert count_queries(articles) == count_queries(more)
+    assert TitleContent.objects.filter(title__language="de").count() == 3
+    assert SearchToken.objects.filter(token="artikel", language="de").count() == 3
+    assert Article.objects.search("artikel", language="de").count() == 3
+    assert count_queries(articles, lambda articles: unpublish_articles(articles, ["de"])) == count_queries(
+        more, unpublish_articles
+    )
+    assert not TitleContent.objects.filter(title__language="de").exists()
+    assert not SearchToken.objects.filter(language="de").exists()
+    # the tokens of the titles still published are kept
+    assert Article.objects.search("article", language="en").count() == 3
+
+
+@pytest.mark.django_db
+def test_publish_command(articles):
+    call_command("cms_articles_publish", "--all", "--language", "en")
+    assert Article.objects.public().published(language="en").count() == 3
+    assert not Article.objects.public().published(language="de").exists()
+
+    call_command("cms_articles_publish", articles[0].pk, "--unpublish")
+    assert Article.objects.public().published(language="en").count() == 2
+
+
+@pytest.mark.django_db
+def test_publish_action(articles, rf, admin_user):
+    model_admin = admin.site._registry[Article]
+    selected = Article.objects.filter(pk__in=[article.pk for article in articles[:2]])
+
+    def run_action(action, queryset):
+        request = rf.post("/", {"language": "en"})
+        request.user = admin_user
+        request._messages = CookieStorage(request)
+        getattr(model_admin, action)(request, queryset)
+
+    run_action("publish_selected", selected)
+    assert set(Article.objects.public().published(language="en")) == {article.publisher_public for article in selected}
+
+    run_action("unpublish_selected", selected[:1])
+    assert list(Article.objects.public().published(language="en")) == [selected[1].publisher_public]
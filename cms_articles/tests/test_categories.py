@@ -0,0 +1,115 @@
+import pytest
+from cms import operations
+from cms.admin.pageadmin import PageAdmin
+from cms.api import add_plugin, create_page
+from cms.signals import post_obj_operation
+from django.test import RequestFactory
+
+from cms_articles.api import create_article
+from cms_articles.cms_plugins import ArticlesCategoryPlugin
+from cms_articles.models import Category, CategoryClosure
+
+
+@pytest.fixture
+def pages(db):
+    parent = create_page(title="Parent", template="default.html", language="en")
+    child = create_page(title="Child", template="default.html", language="en", parent=parent)
+    grandchild = create_page(title="Grandchild", template="default.html", language="en", parent=child)
+    other = create_page(title="Other", template="default.html", language="en")
+    return parent, child, grandchild, other
+
+
+def get_titles(plugin):
+    articles = plugin.get_articles({"request": RequestFactory().get("/")})
+    return sorted(article.get_title() for article in articles)
+
+
+def get_closure():
+    return sorted(
+        (ancestor.title_set.get().title, descendant.title_set.get().title, depth)
+        for ancestor, descendant, depth in (
+            (closure.ancestor.page, closure.descendant.page, closure.depth)
+            for closure in CategoryClosure.objects.select_related("ancestor__page", "descendant__page")
+        )
+    )
+
+
+@pytest.mark.django_db
+def test_category_closure(pages):
+    parent, child, grandchild, other = pages
+    Category.objects.create(page=grandchild)
+    Category.objects.create(page=parent)
+    assert get_closure() == [
+        ("Grandchild", "Grandchild", 0),
+        ("Parent", "Grandchild", 2),
+        ("Parent", "Parent", 0),
+    ]
+
+    # moving the page updates the closure of the whole subtree
+    child.move_page(other.node, position="last-child")
+    post_obj_operation.send(sender=PageAdmin, operation=operations.MOVE_PAGE, request=None, token="", obj=child)
+    assert get_closure() == [
+        ("Grandchild", "Grandchild", 0),
+        ("Parent", "Parent", 0),
+    ]
+
+    # deleting the category deletes its closure
+    Category.objects.get(page=grandchild).delete()
+    assert get_closure() == [("Parent", "Parent", 0)]
+
+
+@pytest.mark.django_db
+def test_category_plugin(tree, pages, django_assert_num_queries):
+    parent, child, grandchild, other = pages
+    for title, page in (("Parent", parent), ("Grandchild", grandchild), ("Other", other)):
+        create_article(
+            tree=tree,
+            title=title,
+            template="cms_articles/default.html",
+            language="en",
+            categories=[Category.objects.get_or_create(page=page)[0]],
+            published=True,
+        )
+
+    # the category is created with the plugin
+    placeholder = child.placeholders.get(slot="content")
+    plugin = add_plugin(placeholder, ArticlesCategoryPlugin, "en", number=5)
+    category = Category.objects.get(page=child)
+    assert plugin.relation_ids["categories"] == [category.pk]
+    assert get_titles(plugin) == []
+
+    plugin.subcategories = True
+    plugin.save()
+    assert get_titles(plugin) == ["Grandchild"]
+
+    placeholder = parent.placeholders.get(slot="content")
+    plugin = add_plugin(placeholder, ArticlesCategoryPlugin, "en", number=5, subcategories=True)
+    assert get_titles(plugin) == ["Grandchild", "Parent"]
+    assert plugin.get_cache_scopes() == ["category:{}".format(Category.objects.get(page=parent).pk)]
+
+    # rendering neither queries nor creates the category
+    with django_assert_num_queries(0):
+        plugin.get_articles({"request": RequestFactory().get("/")})
+
+
+@pytest.mark.django_db
+def test_category_plugin_deleted_category(tree, pages, django_capture_on_commit_callbacks):
+    parent, child, grandchild, other = pages
+    placeholder = parent.placeholders.get(slot="content")
+    plugin = add_plugin(placeholder, ArticlesCategoryPlugin, "en", number=5)
+    with django_capture_on_commit_callbacks(execute=True):
+        Category.objects.get(page=parent).delete()
+
+    # the page gets a new category, which the plugin shows
+    category = Category.objects.get(page=parent)
+    create_article(
+        tree=tree,
+        title="Parent",
+        template="cms_articles/default.html",
+        language="en",
+        categories=[category],
+        published=True,
+    )
+    plugin = ArticlesCategoryPlugin.model.objects.get(pk=plugin.pk)
+    assert plugin.relation_ids["categories"] == [category.pk]
+    assert get_titles(plugin) == ["Parent"]
@@ -0,0 +1,71 @@
+import pytest
+from cms.api import add_plugin
+from django.db import connection
+from django.template.loader import render_to_string
+from django.test.utils import CaptureQueriesContext
+from djangocms_text.cms_plugins import TextPlugin
+
+from cms_articles.api import create_article
+from cms_articles.conf import settings as articles_settings
+from cms_articles.models import Article, TitleContent
+
+
+def create(tree, title, paragraphs, description=""):
+    article = create_article(
+        tree=tree.get_public_object(), title=title, template="cms_articles/default.html", language="en"
+    )
+    if description:
+        article.title_set.update(description=description)
+    placeholder = article.placeholders.get(slot="content")
+    for paragraph in paragraphs:
+        add_plugin(placeholder, TextPlugin, "en", body="<p>{}</p>".format(paragraph))
+    article.publish("en")
+    return Article.objects.get(pk=article.publisher_public_id)
+
+
+def count_links(title, plugins, content):
+    content.data["links"] = content.text.count("http")
+
+
+@pytest.mark.django_db
+def test_derived_content(tree, monkeypatch):
+    monkeypatch.setattr(articles_settings, "CMS_ARTICLES_WORDS_PER_MINUTE", 4)
+    monkeypatch.setattr(articles_settings, "CMS_ARTICLES_EXCERPT_WORDS", 3)
+    monkeypatch.setattr(
+        articles_settings,
+        "CMS_ARTICLES_CONTENT_PROCESSORS",
+        articles_settings.CMS_ARTICLES_CONTENT_PROCESSORS + ["cms_articles.tests.test_content.count_links"],
+    )
+    article = create(tree, "Apples", ["Red &amp; <b>green</b> apples", "See http://example.com"])
+
+    content = article.get_derived_content("en")
+    assert content.text == "Red & green apples See http://example.com"
+    assert content.word_count == 6
+    assert content.reading_time == 2
+    assert content.excerpt == "Red & green…"
+    assert content.image is None
+    assert content.data == {"links": 1}
+    assert article.get_meta_description("en") == "Red & green…"
+    assert article.publisher_public.get_derived_content("en") is None
+
+    # the description is preferred to the content
+    article = create(tree, "Pears", ["Green pears"], description="<p>Sweet pears</p>")
+    assert article.get_derived_content("en").excerpt == "Sweet pears"
+
+    article.publisher_public.unpublish("en")
+    assert not TitleContent.objects.filter(title__article=article).exists()
+
+
+@pytest.mark.django_db
+def test_listing_uses_derived_content(tree):
+    for i in range(3):
+        create(tree, "Article {}".format(i), ["Lorem ipsum " * 150])
+
+    articles = list(Article.objects.public().for_listing("en"))
+    with CaptureQueriesContext(connection) as queries:
+        html = "".join(
+            render_to_string("cms_articles/article_preview.html", {"article": article}) for article in articles
+        )
+    assert not [query["sql"] for query in queries if "cms_articles_titlecontent" in query["sql"]]
+    assert html.count("2 minutes read") == 3
+    assert html.count("Lorem ipsum") == 3 * 25
@@ -0,0 +1,109 @@
+from io import StringIO
+
+import pytest
+from cms.api import add_plugin
+from cms.models import CMSPlugin, Placeholder
+from django.contrib import admin
+from django.contrib.admin.models import DELETION, LogEntry
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from djangocms_text.cms_plugins import TextPlugin
+
+from cms_articles.api import create_article, delete_articles
+from cms_articles.dispatch import post_delete_articles
+from cms_articles.models import Article, Title
+
+
+def create_articles(tree, count):
+    articles = []
+    for i in range(count):
+        article = create_article(
+            tree=tree.get_public_object(),
+            title="Article {}".format(i),
+            template="cms_articles/default.html",
+            language="en",
+        )
+        placeholder = article.placeholders.get(slot="content")
+        parent = add_plugin(placeholder, TextPlugin, "en", body="<p>Parent</p>")
+        add_plugin(placeholder, TextPlugin, "en", body="<p>Child</p>", target=parent)
+        article.publish("en")
+        articles.append(article)
+    return articles
+
+
+def assert_deleted(articles):
+    pks = [article.pk for article in articles] + [article.publisher_public_id for article in articles]
+    assert not Article.objects.filter(pk__in=pks).exists()
+    assert not Title.objects.filter(article__in=pks).exists()
+    assert not Placeholder.objects.filter(cms_articles__in=pks).exists()
+
+
+@pytest.mark.django_db
+def test_delete_articles(tree):
+    sent = []
+
+    def receiver(signal, **kwargs):
+        sent.append(kwargs)
+
+    post_delete_articles.connect(receiver)
+    try:
+        articles = create_articles(tree, 5)
+        kept = create_articles(tree, 1)
+        placeholders = Placeholder.objects.count()
+        plugins = CMSPlugin.objects.count()
+        assert delete_articles(articles[:2], chunk_size=10) == 2
+        assert delete_articles(Article.objects.filter(pk__in=[article.pk for article in articles[2:]])) == 3
+    finally:
+        post_delete_articles.disconnect(receiver)
+
+    assert_deleted(articles)
+    # each article has a placeholder with 2 plugins in both the draft and the public version
+    assert Placeholder.objects.count() == placeholders - 5 * 2
+    assert CMSPlugin.objects.count() == plugins - 5 * 2 * 2
+    assert Article.objects.filter(pk=kept[0].pk).exists()
+    assert len(sent) == 2
+    assert set(sent[1]["pks"]) == {pk for article in articles[2:] for pk in (article.pk, article.publisher_public_id)}
+    assert sent[1]["trees"] == {tree.get_public_object().pk}
+
+
+@pytest.mark.django_db
+def test_delete_queries(tree):
+    def count_queries(articles):
+        with CaptureQueriesContext(connection) as queries:
+            delete_articles(articles)
+        return len(queries)
+
+    assert count_queries(create_articles(tree, 1)) == count_queries(create_articles(tree, 4))
+
+
+@pytest.mark.django_db
+def test_delete_paths(tree, rf, admin_user):
+    articles = create_articles(tree, 4)
+
+    articles[0].delete()
+    assert_deleted(articles[:1])
+
+    count, counts = Article.objects.filter(pk=articles[1].publisher_public_id).delete()
+    assert_deleted(articles[1:2])
+    # both the draft and the public version with their titles, placeholders and plugins
+    assert counts["cms_articles.Article"] == 2
+    assert counts["cms_articles.Title"] == 2
+    assert counts["cms.Placeholder"] == 2
+    assert counts["cms.CMSPlugin"] == 4
+    assert count == sum(counts.values())
+
+    model_admin = admin.site._registry[Article]
+    request = rf.post("/", {"post": "yes"})
+    request.user = admin_user
+    request._messages = CookieStorage(request)
+    assert "delete_selected" not in model_admin.get_actions(request)
+    model_admin.delete_selected_articles(request, Article.objects.filter(pk=articles[2].pk))
+    assert_deleted(articles[2:3])
+    log_entry = LogEntry.objects.get(action_flag=DELETION)
+    assert (log_entry.object_id, log_entry.object_repr) == (str(articles[2].pk), "Article 2")
+    assert log_entry.user == admin_user
+
+    call_command("cms_articles_delete", str(articles[3].pk), stdout=StringIO())
+    assert_deleted(articles[3:])
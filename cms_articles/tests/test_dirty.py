@@ -0,0 +1,109 @@
+import pytest
+from cms.api import add_plugin
+from cms.constants import PUBLISHER_STATE_DEFAULT, PUBLISHER_STATE_DIRTY
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from djangocms_text.cms_plugins import TextPlugin
+
+from cms_articles.api import add_content, create_article, publish_articles
+from cms_articles.models import Article, Attribute, Title
+
+
+def get_states(article):
+    return set(Title.objects.filter(article=article).values_list("publisher_state", flat=True))
+
+
+def reads(queries, table):
+    return [
+        query["sql"]
+        for query in queries
+        if query["sql"].startswith("SELECT") and 'FROM "{}"'.format(table) in query["sql"]
+    ]
+
+
+@pytest.fixture
+def article(tree):
+    article = create_article(
+        tree=tree.get_public_object(),
+        title="Article",
+        template="cms_articles/default.html",
+        language="en",
+        published=True,
+    )
+    assert get_states(article) == {PUBLISHER_STATE_DEFAULT}
+    return article
+
+
+@pytest.mark.django_db
+def test_article_dirty(article):
+    article = Article.objects.get(pk=article.pk)
+    with CaptureQueriesContext(connection) as queries:
+        article.save()
+    assert reads(queries, "cms_articles_article") == []
+    assert get_states(article) == {PUBLISHER_STATE_DEFAULT}
+
+    article.login_required = True
+    article.save()
+    assert get_states(article) == {PUBLISHER_STATE_DIRTY}
+
+    # saved changes are not changes anymore
+    Title.objects.filter(article=article).update(publisher_state=PUBLISHER_STATE_DEFAULT)
+    article.save()
+    assert get_states(article) == {PUBLISHER_STATE_DEFAULT}
+
+
+@pytest.mark.django_db
+def test_article_relations_dirty(article):
+    attribute = Attribute.objects.create(name="Featured")
+    article.attributes.set([])
+    assert get_states(article) == {PUBLISHER_STATE_DEFAULT}
+
+    article.attributes.set([attribute])
+    assert get_states(article) == {PUBLISHER_STATE_DIRTY}
+
+    Title.objects.filter(article=article).update(publisher_state=PUBLISHER_STATE_DEFAULT)
+    attribute.articles.remove(article)
+    assert get_states(article) == {PUBLISHER_STATE_DIRTY}
+
+
+@pytest.mark.django_db
+def test_title_dirty(article):
+    title = Title.objects.get(article=article)
+    with CaptureQueriesContext(connection) as queries:
+        title.save()
+    assert reads(queries, "cms_articles_title") == []
+    assert title.publisher_state == PUBLISHER_STATE_DEFAULT
+
+    title.title = "Changed"
+    title.save()
+    assert title.publisher_state == PUBLISHER_STATE_DIRTY
+
+
+@pytest.mark.django_db
+def test_plugins_dirty(article, django_capture_on_commit_callbacks):
+    placeholder = article.placeholders.get(slot="content")
+    with CaptureQueriesContext(connection) as queries:
+        with django_capture_on_commit_callbacks(execute=True):
+            with transaction.atomic():
+                for i in range(5):
+                    add_plugin(placeholder, TextPlugin, "en", body="<p>{}</p>".format(i))
+                assert get_states(article) == {PUBLISHER_STATE_DEFAULT}
+    assert get_states(article) == {PUBLISHER_STATE_DIRTY}
+    assert len([query for query in queries if query["sql"].startswith('UPDATE "cms_articles_title"')]) == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("bulk", [False, True])
+def test_edit_and_publish_in_transaction(tree, bulk, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        with transaction.atomic():
+            article = create_article(
+                tree=tree.get_public_object(), title="Article", template="cms_articles/default.html", language="en"
+            )
+            add_content(article, language="en", slot="content", content="<p>Content</p>")
+            if bulk:
+                publish_articles([article], ["en"])
+            else:
+                article.publish("en")
+    assert get_states(article) == {PUBLISHER_STATE_DEFAULT}
+    assert Article.objects.get(pk=article.pk).language_states == {"en": "published"}
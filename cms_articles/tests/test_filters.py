@@ -0,0 +1,67 @@
+import pytest
+from cms.api import add_plugin, create_page
+from django.test import RequestFactory
+
+from cms_articles.api import create_article
+from cms_articles.cms_plugins import ArticlesPlugin
+from cms_articles.models import Attribute, Category
+
+
+@pytest.fixture
+def plugin(tree):
+    placeholder = tree.get_draft_object().placeholders.get(slot="content")
+    return add_plugin(placeholder, ArticlesPlugin, "en", number=5)
+
+
+def get_titles(plugin):
+    plugin.refresh_from_db()
+    articles = plugin.get_articles({"request": RequestFactory().get("/news/")})
+    return sorted(article.get_title() for article in articles)
+
+
+@pytest.mark.django_db
+def test_plugin_filters(tree, plugin, django_assert_num_queries):
+    red, blue, green = (Attribute.objects.create(name=name) for name in ("red", "blue", "green"))
+    sport, culture = (
+        Category.objects.create(page=create_page(title=name, template="default.html", language="en"))
+        for name in ("Sport", "Culture")
+    )
+    for title, attributes, categories in (
+        ("Both", [red, blue, green], [sport, culture]),
+        ("Red", [red], [sport]),
+        ("Sport", [red, blue], [sport]),
+        ("Nothing", [], []),
+    ):
+        create_article(
+            tree=tree,
+            title=title,
+            template="cms_articles/default.html",
+            language="en",
+            attributes=attributes,
+            categories=categories,
+            published=True,
+        )
+
+    assert get_titles(plugin) == ["Both", "Nothing", "Red", "Sport"]
+
+    # articles in several categories are not duplicated
+    plugin.categories.set([sport, culture])
+    assert get_titles(plugin) == ["Both", "Red", "Sport"]
+
+    # articles must have all the attributes
+    plugin.attributes.set([red, blue])
+    assert get_titles(plugin) == ["Both", "Sport"]
+
+    plugin.trees.set([tree.get_public_object()])
+    assert get_titles(plugin) == ["Both", "Sport"]
+
+    # the relations are not queried at all
+    with django_assert_num_queries(0):
+        plugin.get_articles({"request": RequestFactory().get("/news/")})
+        plugin.get_cache_scopes()
+
+    # deleted objects are removed from the stored relations
+    blue.delete()
+    plugin.refresh_from_db()
+    assert plugin.relation_ids["attributes"] == [red.pk]
+    assert get_titles(plugin) == ["Both", "Red", "Sport"]
@@ -0,0 +1,185 @@
+from io import BytesIO
+from xml.etree.ElementTree import ParseError
+
+import pytest
+from django.contrib.sites.models import Site
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from cms_articles.import_wordpress.models import Author, Category, Item
+from cms_articles.import_wordpress.utils import (
+    import_wordpress,
+    iter_wordpress,
+    parse_author,
+    parse_category,
+    parse_item,
+    save_batch,
+    update_or_create,
+    upsert,
+)
+
+ITEM = """
+<item>
+    <title>Post {0}</title>
+    <link>http://example.com/post-{0}/</link>
+    <pubDate>Mon, 01 Jan 2018 10:00:00 +0000</pubDate>
+    <dc:creator>admin</dc:creator>
+    <guid>http://example.com/?p={0}</guid>
+    <description></description>
+    <content:encoded><![CDATA[<p>Content {0}</p>]]></content:encoded>
+    <excerpt:encoded></excerpt:encoded>
+    <wp:post_id>{0}</wp:post_id>
+    <wp:post_date>2018-01-01 10:00:00</wp:post_date>
+    <wp:post_name>post-{0}</wp:post_name>
+    <wp:status>publish</wp:status>
+    <wp:post_parent>0</wp:post_parent>
+    <wp:post_type>post</wp:post_type>
+    <category domain="category" nicename="news"><![CDATA[News]]></category>
+    <wp:postmeta><wp:meta_key>views</wp:meta_key><wp:meta_value>{0}</wp:meta_value></wp:postmeta>
+</item>
+"""
+
+WXR = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"
+    xmlns:excerpt="http://wordpress.org/export/1.2/excerpt/"
+    xmlns:content="http://purl.org/rss/1.0/modules/content/"
+    xmlns:dc="http://purl.org/dc/elements/1.1/"
+    xmlns:wp="http://wordpress.org/export/1.2/">
+<channel>
+    <title>Blog</title>
+    <wp:author>
+        <wp:author_id>1</wp:author_id>
+        <wp:author_login>admin</wp:author_login>
+        <wp:author_email>admin@example.com</wp:author_email>
+        <wp:author_first_name>Ad</wp:author_first_name>
+        <wp:author_last_name>Min</wp:author_last_name>
+    </wp:author>
+    <wp:category>
+        <wp:term_id>2</wp:term_id>
+        <wp:category_nicename>news</wp:category_nicename>
+        <wp:category_parent></wp:category_parent>
+        <wp:cat_name>News</wp:cat_name>
+    </wp:category>
+    {items}
+</channel>
+</rss>
+"""
+
+
+def make_wxr(count):
+    return WXR.format(items="".join(ITEM.format(i) for i in range(1, count + 1))).encode()
+
+
+def test_iter_wordpress():
+    data = make_wxr(50)
+    consumed = []
+    kinds = []
+    for kind, element in iter_wordpress(BytesIO(data), lambda position, total: consumed.append(position)):
+        kinds.append(kind)
+        if kind == "author":
+            assert parse_author(element)["login"] == "admin"
+        elif kind == "category":
+            assert parse_category(element)["slug"] == "news"
+        else:
+            item = parse_item(element)
+            assert item["title"] == "Post {}".format(item["post_id"])
+            assert item["categories"] == ["news"]
+            assert item["postmeta"] == '{{"views": "{}"}}'.format(item["post_id"])
+    assert kinds == ["author", "category"] + ["item"] * 50
+    assert consumed[-1] == len(data)
+
+
+def test_iter_wordpress_clears_elements():
+    elements = []
+    for kind, element in iter_wordpress(BytesIO(make_wxr(20))):
+        # the element is complete, when it is yielded
+        assert len(element) > 0
+        elements.append(element)
+    # and it is cleared, once it was processed
+    assert len(elements) == 22
+    assert all(len(element) == 0 for element in elements)
+
+
+def test_iter_wordpress_errors():
+    with pytest.raises(ParseError):
+        list(iter_wordpress(BytesIO(b"<html></html>")))
+    with pytest.raises(ParseError):
+        list(iter_wordpress(BytesIO(make_wxr(1)[:-20])))
+
+
+@pytest.mark.django_db
+def test_upsert():
+    Site.objects.create(domain="a.example.com", name="A")
+    records = {
+        "{}.example.com".format(name): {"domain": "{}.example.com".format(name), "name": name.upper()}
+        for name in "abcdefghij"
+    }
+    records["a.example.com"]["name"] = "Renamed"
+    with CaptureQueriesContext(connection) as queries:
+        sites = upsert(Site, "domain", records)
+    assert len(queries) == 4
+    assert sorted(sites) == sorted(records)
+    assert Site.objects.get(domain="a.example.com").name == "Renamed"
+    assert Site.objects.get(domain="j.example.com").name == "J"
+
+
+@pytest.mark.django_db
+def test_save_batch_errors():
+    records = {
+        "a.example.com": {"domain": "a.example.com", "name": "A"},
+        "b.example.com": {"domain": "b.example.com", "name": None},
+    }
+    errors = []
+    saved = save_batch(
+        records,
+        lambda records: upsert(Site, "domain", records),
+        lambda data: update_or_create(Site, "domain", data),
+        "Failed to save site with domain {}: {}",
+        errors,
+    )
+    # the records are saved one by one, when the batch fails
+    assert list(saved) == ["a.example.com"]
+    assert len(errors) == 1 and errors[0].startswith("Failed to save site with domain b.example.com: ")
+    assert not Site.objects.filter(domain="b.example.com").exists()
+
+
+@pytest.mark.django_db
+def test_import_wordpress():
+    result = import_wordpress(BytesIO(make_wxr(3)), batch_size=2)
+    assert result == {"authors": 1, "categories": 1, "items": 3, "errors": []}
+    item = Item.objects.get(post_id=1)
+    assert (item.title, item.created_by.login) == ("Post 1", "admin")
+    assert [category.slug for category in item.categories.all()] == ["news"]
+
+    # the records are updated by their keys, when imported again
+    category = '<category domain="category" nicename="news"><![CDATA[News]]></category>'
+    items = ITEM.format(1).replace("Post 1", "Renamed") + ITEM.format(2).replace(category, "")
+    result = import_wordpress(BytesIO(WXR.format(items=items).encode()), batch_size=2)
+    assert result == {"authors": 1, "categories": 1, "items": 2, "errors": []}
+    assert (Author.objects.count(), Category.objects.count(), Item.objects.count()) == (1, 1, 3)
+    assert Item.objects.get(post_id=1).title == "Renamed"
+    assert list(Item.objects.get(post_id=1).categories.all()) == [Category.objects.get()]
+    assert not Item.objects.get(post_id=2).categories.exists()
+    assert Item.objects.get(post_id=3).title == "Post 3"
+
+
+@pytest.mark.django_db
+def test_import_wordpress_queries():
+    def count_queries(count):
+        with CaptureQueriesContext(connection) as queries:
+            assert import_wordpress(BytesIO(make_wxr(count)))["items"] == count
+        return len(queries)
+
+    # the author, the category and the first item are updated, the other items are inserted
+    import_wordpress(BytesIO(make_wxr(1)))
+    assert count_queries(5) == count_queries(50)
+
+
+@pytest.mark.django_db
+def test_import_wordpress_truncated():
+    with pytest.raises(Exception, match="Failed to parse file"):
+        import_wordpress(BytesIO(make_wxr(3)[:-100]))
+    # the items parsed before the syntax error are saved
+    assert sorted(Item.objects.values_list("post_id", flat=True)) == [1, 2]
+    assert import_wordpress(BytesIO(make_wxr(3)))["items"] == 3
+    assert Item.objects.count() == 3
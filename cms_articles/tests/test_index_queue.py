@@ -0,0 +1,55 @@
+from datetime import timedelta
+
+import pytest
+from django.utils.timezone import now
+
+from cms_articles.api import create_article
+from cms_articles.models import Article, IndexQueue, Title
+from cms_articles.utils.index import get_changed_titles, queue_titles
+
+
+@pytest.fixture
+def articles(tree):
+    articles = []
+    for i in range(3):
+        article = create_article(
+            tree=tree.get_public_object(),
+            title="Article {}".format(i),
+            template="cms_articles/default.html",
+            language="en",
+            published=True,
+        )
+        articles.append(article)
+    return articles
+
+
+@pytest.mark.django_db
+def test_queue_titles(articles):
+    titles = list(Title.objects.public().values_list("pk", flat=True))
+    queue_titles(titles[:2], flush=False)
+    queued = dict(IndexQueue.objects.values_list("title_id", "modified"))
+    queue_titles(titles, flush=False)
+    assert IndexQueue.objects.count() == len(titles)
+    # the titles queued already are not duplicated, only marked as modified again
+    for title_id, modified in queued.items():
+        assert IndexQueue.objects.get(title_id=title_id).modified > modified
+
+
+@pytest.mark.django_db
+def test_changed_titles(articles):
+    since = now() - timedelta(hours=1)
+    Article.objects.filter(pk__in=[article.publisher_public_id for article in articles]).update(
+        changed_date=since - timedelta(hours=1), publication_date=since - timedelta(hours=1)
+    )
+    assert not get_changed_titles(since).exists()
+
+    # changed article
+    Article.objects.filter(pk=articles[0].publisher_public_id).update(changed_date=now())
+    # expired article
+    Article.objects.filter(pk=articles[1].publisher_public_id).update(publication_end_date=now() - timedelta(minutes=1))
+    # article going to expire later
+    Article.objects.filter(pk=articles[2].publisher_public_id).update(publication_end_date=now() + timedelta(hours=1))
+    assert set(get_changed_titles(since).values_list("article", flat=True)) == {
+        articles[0].publisher_public_id,
+        articles[1].publisher_public_id,
+    }
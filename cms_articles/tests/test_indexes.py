@@ -0,0 +1,53 @@
+import pytest
+from cms.api import add_plugin
+from django.db import connection
+from django.test import RequestFactory
+
+from cms_articles.api import create_article
+from cms_articles.archive import Archive
+from cms_articles.cms_plugins import ArticlesPlugin
+from cms_articles.models import Title
+
+pytestmark = pytest.mark.skipif(connection.vendor != "sqlite", reason="query plans are checked on SQLite")
+
+
+def get_plan(queryset):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+        return " ".join(row[-1] for row in cursor.fetchall())
+
+
+@pytest.fixture
+def articles(tree):
+    create_article(tree=tree, title="First", template="cms_articles/default.html", language="en", published=True)
+    placeholder = tree.get_draft_object().placeholders.get(slot="content")
+    plugin = add_plugin(placeholder, ArticlesPlugin, "en", number=5)
+    plugin.trees.set([tree.get_public_object()])
+    return plugin.get_articles({"request": RequestFactory().get("/news/")})
+
+
+@pytest.mark.django_db
+def test_slug_indexes(tree):
+    titles = Title.objects.filter(article__tree=tree.get_public_object(), slug="first")
+    # live slugs use the partial index
+    assert "cms_articles_public_slug" in get_plan(titles.filter(published=True, publisher_is_draft=False))
+    # draft slugs use the full one
+    assert "cms_articles_title_slug" in get_plan(titles.filter(publisher_is_draft=True))
+
+
+@pytest.mark.django_db
+def test_listing_indexes(articles):
+    plan = get_plan(articles)
+    assert "cms_articles_live_listing" in plan
+    # the articles are read in the index order
+    assert "TEMP B-TREE FOR ORDER BY" not in plan
+
+
+@pytest.mark.django_db
+def test_archive_indexes(articles):
+    archive = Archive(articles, RequestFactory().get("/news/", {"year": "2010"}))
+    assert "cms_articles_live_listing (tree_id=? AND order_date>? AND order_date<?)" in get_plan(
+        archive.filter_articles()
+    )
+    assert "cms_articles_live_listing" in get_plan(archive.get_day_counts())
@@ -0,0 +1,78 @@
+import pytest
+from cms.api import add_plugin
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from djangocms_text.cms_plugins import TextPlugin
+
+from cms_articles.api import create_article, publish_articles, unpublish_articles
+from cms_articles.models import Article, Attribute, Title
+
+
+def get_states(article):
+    return Article.objects.get(pk=article.pk).language_states
+
+
+@pytest.fixture
+def article(tree):
+    return create_article(
+        tree=tree.get_public_object(),
+        title="Article",
+        template="cms_articles/default.html",
+        language="en",
+        published=True,
+    )
+
+
+@pytest.mark.django_db
+def test_states_follow_titles(tree):
+    article = create_article(
+        tree=tree.get_public_object(), title="Article", template="cms_articles/default.html", language="en"
+    )
+    assert get_states(article) == {"en": "draft"}
+
+    article.publish("en")
+    assert get_states(article) == {"en": "published"}
+    assert get_states(article.publisher_public) == {"en": "published"}
+
+    title = Title.objects.get(article=article)
+    title.title = "Changed"
+    title.save()
+    assert get_states(article) == {"en": "dirty"}
+
+    article = Article.objects.get(pk=article.pk)
+    article.unpublish("en")
+    assert get_states(article) == {"en": "draft"}
+    assert get_states(article.publisher_public) == {"en": "draft"}
+
+
+@pytest.mark.django_db
+def test_states_follow_bulk_publishing(article):
+    unpublish_articles([article])
+    assert get_states(article) == {"en": "draft"}
+    assert get_states(article.publisher_public) == {"en": "draft"}
+
+    publish_articles([article])
+    assert get_states(article) == {"en": "published"}
+    assert get_states(article.publisher_public) == {"en": "published"}
+
+
+@pytest.mark.django_db
+def test_states_follow_dirty_marking(article, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        add_plugin(article.placeholders.get(slot="content"), TextPlugin, "en", body="<p>Text</p>")
+    assert get_states(article) == {"en": "dirty"}
+
+    article.publish("en")
+    assert get_states(article) == {"en": "published"}
+    article.attributes.add(Attribute.objects.create(name="Attribute"))
+    assert get_states(article) == {"en": "dirty"}
+
+
+@pytest.mark.django_db
+def test_states_without_titles(article):
+    public = Article.objects.get(pk=article.publisher_public_id)
+    with CaptureQueriesContext(connection) as queries:
+        assert public.get_published_languages() == ["en"]
+        assert public.is_published("en")
+        assert Article.objects.get(pk=article.pk).get_publisher_state("en") == 0
+    assert not [query for query in queries if 'FROM "cms_articles_title"' in query["sql"]]
@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+
+import pytest
+from django.utils.timezone import make_aware
+
+from cms_articles.api import create_article
+from cms_articles.models import Article
+from cms_articles.pagination import CursorPaginator
+
+
+@pytest.fixture
+def articles(tree):
+    publication_date = make_aware(datetime(2020, 1, 1))
+    for i in range(7):
+        create_article(
+            tree=tree,
+            title="Article {}".format(i),
+            template="cms_articles/default.html",
+            language="en",
+            # two articles share the same date to test the tie breaker
+            publication_date=publication_date + timedelta(days=i // 2),
+            published=True,
+        )
+    return Article.objects.public().published()
+
+
+@pytest.mark.django_db
+def test_cursor_pagination(articles, django_assert_num_queries):
+    expected = list(articles.order_by("-order_date", "-pk"))
+    paginator = CursorPaginator(articles, 3)
+
+    pages = [paginator.page(None)]
+    while pages[-1].has_next():
+        with django_assert_num_queries(1):
+            pages.append(paginator.page(pages[-1].next_cursor))
+    assert [list(page) for page in pages] == [expected[:3], expected[3:6], expected[6:]]
+    assert [page.has_previous() for page in pages] == [False, True, True]
+
+    # walk back
+    assert list(paginator.page(pages[2].previous_cursor)) == expected[3:6]
+    assert list(paginator.page(pages[1].previous_cursor)) == expected[:3]
+    assert not paginator.page(pages[1].previous_cursor).has_previous()
+
+    # invalid cursor results in the first page
+    assert list(paginator.page("invalid")) == expected[:3]
+    assert paginator.num_pages == 3
@@ -0,0 +1,55 @@
+import pytest
+from cms.models import Placeholder
+
+from cms_articles.api import create_article
+from cms_articles.utils import placeholder as placeholder_utils
+
+
+@pytest.fixture
+def scans(monkeypatch):
+    scans = []
+    scan_template = placeholder_utils._scan_template
+
+    def counting_scan_template(template, compiled_template):
+        scans.append(template)
+        return scan_template(template, compiled_template)
+
+    placeholder_utils.clear_placeholders_memo()
+    monkeypatch.setattr(placeholder_utils, "_scan_template", counting_scan_template)
+    yield scans
+    placeholder_utils.clear_placeholders_memo()
+
+
+def test_placeholders_memo(scans, monkeypatch):
+    def get_slots():
+        return [placeholder.slot for placeholder in placeholder_utils.get_placeholders("cms_articles/default.html")]
+
+    slots = get_slots()
+    assert slots
+    assert get_slots() == slots
+    assert scans == ["cms_articles/default.html"]
+
+    # the template source was modified
+    monkeypatch.setattr(placeholder_utils, "_get_mtime", lambda compiled_template: 0)
+    assert get_slots() == slots
+    assert len(scans) == 2
+
+    placeholder_utils.clear_placeholders_memo()
+    assert get_slots() == slots
+    assert len(scans) == 3
+
+
+@pytest.mark.django_db
+def test_rescan_placeholders(tree, scans):
+    article = create_article(
+        tree=tree.get_public_object(), title="Article", template="cms_articles/default.html", language="en"
+    )
+    slots = [placeholder.slot for placeholder in article.get_declared_placeholders()]
+    assert sorted(article.placeholders.values_list("slot", flat=True)) == sorted(slots)
+
+    article.placeholders.all().delete()
+    existing = article.rescan_placeholders()
+    assert list(existing) == slots
+    assert sorted(article.placeholders.values_list("slot", flat=True)) == sorted(slots)
+    assert Placeholder.objects.filter(cms_articles=article).count() == len(slots)
+    assert scans == ["cms_articles/default.html"]
@@ -0,0 +1,78 @@
+from datetime import datetime
+
+import pytest
+from cms.api import add_plugin
+from cms.plugin_rendering import ContentRenderer
+from django.contrib.auth.models import AnonymousUser
+from django.template import Context
+from django.test import RequestFactory
+from django.utils import timezone
+from django.utils.timezone import make_aware
+
+from cms_articles.api import create_article
+from cms_articles.cms_plugins import ArticlesPlugin
+from cms_articles.models import Article
+
+
+@pytest.fixture(params=["locmem", "filebased"])
+def plugin_cache(request, settings, tmp_path):
+    backends = {
+        "locmem": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "filebased": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": str(tmp_path)},
+    }
+    settings.CACHES = {"default": backends[request.param]}
+
+
+def render_plugin(plugin, **params):
+    request = RequestFactory().get("/news/", params)
+    request.user = AnonymousUser()
+    request.current_page = plugin.placeholder.page
+    renderer = ContentRenderer(request)
+    return renderer.render_plugin(plugin, Context({"request": request}))
+
+
+@pytest.mark.django_db
+def test_render_cache(tree, plugin_cache, django_assert_num_queries):
+    create_article(tree=tree, title="First", template="cms_articles/default.html", language="en", published=True)
+    placeholder = tree.get_draft_object().placeholders.get(slot="content")
+    plugin = add_plugin(placeholder, ArticlesPlugin, "en", number=5)
+    plugin.trees.set([tree.get_public_object()])
+
+    content = render_plugin(plugin)
+    assert "First" in content
+
+    # cached
+    with django_assert_num_queries(0):
+        assert render_plugin(plugin) == content
+
+    # different page has separate cache entry
+    assert render_plugin(plugin, page=2) == content
+
+    # publishing an article invalidates the cache
+    create_article(tree=tree, title="Second", template="cms_articles/default.html", language="en", published=True)
+    assert "Second" in render_plugin(plugin)
+
+    # unpublishing as well
+    Article.objects.drafts().get(title_set__title="First").unpublish("en")
+    assert "First" not in render_plugin(plugin)
+
+
+@pytest.mark.django_db
+def test_render_cache_time_zone(tree, plugin_cache):
+    create_article(
+        tree=tree,
+        title="First",
+        template="cms_articles/default.html",
+        language="en",
+        publication_date=make_aware(datetime(2020, 1, 20, 12)),
+        published=True,
+    )
+    placeholder = tree.get_draft_object().placeholders.get(slot="content")
+    plugin = add_plugin(placeholder, ArticlesPlugin, "en", number=5)
+    plugin.trees.set([tree.get_public_object()])
+
+    assert "Jan. 20, 2020" in render_plugin(plugin)
+    # 12:00 UTC is the next day in UTC+14
+    with timezone.override("Pacific/Kiritimati"):
+        assert "Jan. 21, 2020" in render_plugin(plugin)
+    assert "Jan. 20, 2020" in render_plugin(plugin)
@@ -0,0 +1,96 @@
+import pytest
+from cms.api import add_plugin
+from cms.models import CMSPlugin
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from djangocms_text.cms_plugins import TextPlugin
+from djangocms_text.utils import plugin_to_tag
+
+from cms_articles.api import create_article
+from cms_articles.utils.plugins import _get_fingerprint
+
+
+def get_public_plugins(article):
+    public = article.reload().get_public_object()
+    return {
+        plugin.pk: (plugin.position, plugin.parent_id, plugin.get_plugin_instance()[0].body)
+        for plugin in CMSPlugin.objects.filter(placeholder__cms_articles=public, language="en")
+    }
+
+
+@pytest.mark.django_db
+def test_publish_changed_plugins_only(tree):
+    article = create_article(
+        tree=tree.get_public_object(),
+        title="Long read",
+        template="cms_articles/default.html",
+        language="en",
+    )
+    placeholder = article.placeholders.get(slot="content")
+    first = add_plugin(placeholder, TextPlugin, "en", body="<p>first</p>")
+    second = add_plugin(placeholder, TextPlugin, "en", body="")
+    child = add_plugin(placeholder, TextPlugin, "en", target=second, body="<p>child</p>")
+    second.body = "<p>second {}</p>".format(plugin_to_tag(child))
+    second.save()
+    article.publish("en")
+
+    plugins = get_public_plugins(article)
+    assert len(plugins) == 3
+    (public_child,) = [pk for pk, (position, parent_id, body) in plugins.items() if parent_id]
+    (public_second,) = [pk for pk, (position, parent_id, body) in plugins.items() if "second" in body]
+    assert 'id="{}"'.format(public_child) in plugins[public_second][2]
+
+    # nothing has changed, so the public plugins are not touched at all
+    with CaptureQueriesContext(connection) as queries:
+        article.reload().publish("en")
+    assert not [
+        query["sql"]
+        for query in queries.captured_queries
+        if "cmsplugin" in query["sql"] and query["sql"].split()[0] in ("INSERT", "UPDATE", "DELETE")
+    ]
+    assert get_public_plugins(article) == plugins
+
+    # a changed plugin is updated in place
+    first.body = "<p>first changed</p>"
+    first.save()
+    article.reload().publish("en")
+    changed = get_public_plugins(article)
+    assert changed.keys() == plugins.keys()
+    assert [body for position, parent_id, body in changed.values() if "first" in body] == ["<p>first changed</p>"]
+
+    # reordered plugins are moved
+    CMSPlugin.objects.filter(pk=first.pk).update(position=1)
+    CMSPlugin.objects.filter(pk=second.pk).update(position=0)
+    article.reload().publish("en")
+    moved = get_public_plugins(article)
+    assert moved.keys() == plugins.keys()
+    assert moved[public_second][0] == 0
+
+    # removed plugins are deleted and new plugins are inserted
+    first.delete()
+    add_plugin(placeholder, TextPlugin, "en", body="<p>third</p>")
+    article.reload().publish("en")
+    final = get_public_plugins(article)
+    assert public_second in final and public_child in final
+    assert sorted(body for position, parent_id, body in final.values() if not parent_id) == [
+        "<p>second {}</p>".format(plugin_to_tag(CMSPlugin.objects.get(pk=public_child))),
+        "<p>third</p>",
+    ]
+
+
+@pytest.mark.django_db
+def test_fingerprint_child_references(tree):
+    article = create_article(
+        tree=tree.get_public_object(), title="Rooms", template="cms_articles/default.html", language="en"
+    )
+    placeholder = article.placeholders.get(slot="content")
+
+    def get_fingerprint(text):
+        parent = add_plugin(placeholder, TextPlugin, "en", body="")
+        child = add_plugin(placeholder, TextPlugin, "en", target=parent, body="<p>child</p>")
+        parent.body = "<p>{}</p>{}".format(text.format(child.pk), plugin_to_tag(child))
+        return _get_fingerprint(parent, [child])
+
+    # only the references of the children are normalized
+    assert get_fingerprint("Room 7") == get_fingerprint("Room 7")
+    assert get_fingerprint("Room {}") != get_fingerprint("Room {}")
@@ -0,0 +1,40 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from cms_articles.api import create_article
+from cms_articles.models import Article
+
+
+def render_list(articles):
+    return [
+        (article.get_title(), article.get_description(), article.get_image(), article.get_absolute_url())
+        for article in articles
+    ]
+
+
+@pytest.mark.django_db
+def test_for_listing_query_count(tree):
+    def count_queries(number):
+        with CaptureQueriesContext(connection) as queries:
+            render_list(Article.objects.public().published().for_listing("en")[:number])
+        return len(queries)
+
+    create_article(tree=tree, title="Article", template="cms_articles/default.html", language="en", published=True)
+    # warm up url resolvers
+    count_queries(1)
+    single = count_queries(1)
+
+    for i in range(4):
+        create_article(
+            tree=tree, title="Article {}".format(i), template="cms_articles/default.html", language="en", published=True
+        )
+    assert count_queries(5) == single
+
+
+@pytest.mark.django_db
+def test_for_listing_title_cache(tree):
+    create_article(tree=tree, title="Article", template="cms_articles/default.html", language="en", published=True)
+
+    expected = render_list(Article.objects.public().published())
+    assert render_list(Article.objects.public().published().for_listing("en", description=False)) == expected
@@ -0,0 +1,151 @@
+import json
+from datetime import timedelta
+
+import pytest
+from django.contrib import admin
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.utils.timezone import now
+
+from cms_articles import queue
+from cms_articles.api import create_article
+from cms_articles.cms_toolbars import CMSArticlesToolbar
+from cms_articles.conf import settings as articles_settings
+from cms_articles.models import Article, PublishJob
+
+
+@pytest.fixture
+def article(tree):
+    return create_article(
+        tree=tree.get_public_object(), title="Article", template="cms_articles/default.html", language="en"
+    )
+
+
+@pytest.fixture
+def database_queue(monkeypatch):
+    monkeypatch.setattr(articles_settings, "CMS_ARTICLES_PUBLISH_QUEUE", "cms_articles.queue.DatabaseBackend")
+
+
+@pytest.mark.django_db
+def test_jobs_are_coalesced(article, database_queue):
+    job = queue.enqueue(article, "en")
+    assert queue.enqueue(article, "en", PublishJob.ACTION_UNPUBLISH) == job
+    assert queue.enqueue(article, "en") == job
+    assert PublishJob.objects.count() == 1
+
+    assert queue.run_pending() == 1
+    assert queue.get_status(article, "en")["status"] == PublishJob.STATUS_DONE
+    assert Article.objects.get(pk=article.pk).is_published("en")
+
+    # a new job is queued once the previous one was started
+    assert queue.enqueue(article, "en", PublishJob.ACTION_UNPUBLISH) != job
+    assert queue.run_pending() == 1
+    assert not Article.objects.get(pk=article.pk).is_published("en")
+
+
+@pytest.mark.django_db
+def test_enqueue_race(article, database_queue, monkeypatch):
+    pending = queue.enqueue(article, "en")
+    get_or_create = PublishJob.objects.get_or_create
+
+    def concurrent_get_or_create(**kwargs):
+        result = get_or_create(**kwargs)
+        if PublishJob.objects.count() == 1:
+            # the pending job is started by a worker and another request queues a new one
+            PublishJob.objects.filter(pk=pending.pk).update(status=PublishJob.STATUS_RUNNING, started=now())
+            PublishJob.objects.create(article=article, language="en", changed_by="other")
+        return result
+
+    monkeypatch.setattr(PublishJob.objects, "get_or_create", concurrent_get_or_create)
+    job = queue.enqueue(article, "en", PublishJob.ACTION_UNPUBLISH)
+    assert job.pk != pending.pk
+    assert PublishJob.objects.get(status=PublishJob.STATUS_PENDING) == job
+    assert job.action == PublishJob.ACTION_UNPUBLISH
+
+
+@pytest.mark.django_db
+def test_job_errors(article, database_queue, monkeypatch):
+    def publish(self, language):
+        raise RuntimeError("Publishing failed")
+
+    monkeypatch.setattr(Article, "publish", publish)
+    queue.enqueue(article, "en")
+    assert queue.run_pending() == 1
+    status = queue.get_status(article, "en")
+    assert status["status"] == PublishJob.STATUS_FAILED
+    assert "Publishing failed" in status["error"]
+
+
+@pytest.mark.django_db
+def test_stale_jobs(article, database_queue, monkeypatch):
+    monkeypatch.setattr(articles_settings, "CMS_ARTICLES_PUBLISH_QUEUE_TIMEOUT", 10)
+    running = PublishJob.objects.create(
+        article=article, language="en", status=PublishJob.STATUS_RUNNING, started=now() - timedelta(minutes=5)
+    )
+    assert list(queue.get_active_jobs()) == [running]
+
+    # the worker of the job was killed
+    PublishJob.objects.filter(pk=running.pk).update(started=now() - timedelta(minutes=15))
+    assert not queue.get_active_jobs().exists()
+    queue.enqueue(article, "en")
+    assert queue.run_pending() == 1
+    running.refresh_from_db()
+    assert running.status == PublishJob.STATUS_FAILED
+    assert "10 minutes" in running.error
+    assert Article.objects.get(pk=article.pk).is_published("en")
+
+
+@pytest.mark.django_db
+def test_admin_queues_publishing(article, database_queue, rf, admin_user):
+    model_admin = admin.site._registry[Article]
+
+    request = rf.post("/?redirect=/news/")
+    request.user = admin_user
+    request._messages = CookieStorage(request)
+    response = model_admin.publish_article(request, article.pk, "en")
+    assert response.status_code == 302
+    assert not Article.objects.get(pk=article.pk).is_published("en")
+
+    request = rf.get("/")
+    request.user = admin_user
+    status = json.loads(model_admin.publish_status(request, article.pk, "en").content)
+    assert status["job"]["status"] == PublishJob.STATUS_PENDING
+    assert status["job"]["queue_position"] == 0
+
+    queue.run_pending()
+    status = json.loads(model_admin.publish_status(request, article.pk, "en").content)
+    assert status["job"]["status"] == PublishJob.STATUS_DONE
+    assert not status["dirty"]
+
+
+@pytest.mark.django_db
+def test_toolbar_button(article, database_queue, rf, admin_user):
+    class Toolbar:
+        RIGHT = "right"
+        edit_mode_active = True
+
+        def add_button(self, title, disabled, **kwargs):
+            self.button = (str(title), disabled)
+
+    def get_button():
+        request = rf.get("/")
+        request.user = admin_user
+        toolbar = CMSArticlesToolbar(request, Toolbar(), True, "/")
+        toolbar.article = article
+        toolbar.post_template_populate()
+        return toolbar.toolbar.button
+
+    assert get_button() == ("Publish article now", False)
+    queue.enqueue(article, "en", PublishJob.ACTION_UNPUBLISH)
+    assert get_button() == ("Unpublishing article...", True)
+    queue.enqueue(article, "en")
+    assert get_button() == ("Publishing article...", True)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_thread_pool_backend(article):
+    backend = queue.ThreadPoolBackend(max_workers=1)
+    job = PublishJob.objects.create(article=article, language="en", changed_by="script")
+    assert backend.submit(job.pk).result(timeout=30)
+    job.refresh_from_db()
+    assert job.status == PublishJob.STATUS_DONE, job.error
+    assert Article.objects.get(pk=article.pk).is_published("en")
@@ -0,0 +1,43 @@
+import pytest
+from django.core.cache import cache
+
+from cms_articles.api import create_article
+from cms_articles.models import Title
+from cms_articles.utils.article import get_article_from_slug
+
+
+@pytest.mark.django_db
+def test_get_article_from_slug(tree, django_assert_num_queries):
+    cache.clear()
+    tree = tree.get_public_object()
+    article = create_article(
+        tree=tree, title="Article", slug="2020-01-article", template="cms_articles/default.html", language="en"
+    )
+
+    # unknown slugs are cached too
+    assert get_article_from_slug(tree, "2020-01-unknown") is None
+    with django_assert_num_queries(0):
+        assert get_article_from_slug(tree, "2020-01-unknown") is None
+
+    # not published yet
+    assert get_article_from_slug(tree, "2020-01-article") is None
+    assert get_article_from_slug(tree, "2020-01-article", draft=True) == article
+
+    article.publish("en")
+    public = get_article_from_slug(tree, "2020-01-article")
+    assert public == article.publisher_public
+    with django_assert_num_queries(1):
+        resolved = get_article_from_slug(tree, "2020-01-article")
+        # the matched title is cached
+        assert resolved.get_title("en") == "Article"
+    assert resolved == public
+
+    # slug change
+    title = Title.objects.get(article=article)
+    title.slug = "2020-01-changed"
+    title.save()
+    assert get_article_from_slug(tree, "2020-01-changed", draft=True) == article
+    assert get_article_from_slug(tree, "2020-01-article", draft=True) is None
+
+    article.unpublish("en")
+    assert get_article_from_slug(tree, "2020-01-article") is None
@@ -0,0 +1,79 @@
+from datetime import timedelta
+
+import pytest
+from cms.signals import post_publish, post_unpublish
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+
+from cms_articles.api import create_article
+from cms_articles.models import Article
+from cms_articles.utils.article import get_article_from_slug
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("sent_signals", [(post_publish, post_unpublish)], indirect=True)
+def test_scheduler(tree, sent_signals):
+    cache.clear()
+    tree = tree.get_public_object()
+    article = create_article(
+        tree=tree,
+        title="Embargoed",
+        slug="embargoed",
+        template="cms_articles/default.html",
+        language="en",
+        publication_date=now() + timedelta(hours=1),
+        published=True,
+    )
+    public = article.get_public_object()
+    assert not public.live
+    assert get_article_from_slug(tree, "embargoed") is None
+    assert not Article.objects.public().published().exists()
+
+    # nothing to do
+    del sent_signals[:]
+    call_command("cms_articles_scheduler")
+    assert sent_signals == []
+
+    # the embargo lifts
+    Article.objects.filter(pk__in=[article.pk, public.pk]).update(publication_date=now() - timedelta(seconds=1))
+    call_command("cms_articles_scheduler")
+    assert sent_signals == [(post_publish, article, "en", None)]
+    assert list(Article.objects.public().published()) == [public]
+    assert get_article_from_slug(tree, "embargoed") == public
+
+    # the article expires
+    del sent_signals[:]
+    Article.objects.filter(pk__in=[article.pk, public.pk]).update(publication_end_date=now() - timedelta(seconds=1))
+    call_command("cms_articles_scheduler")
+    assert sent_signals == [(post_unpublish, article, "en", None)]
+    assert not Article.objects.public().published().exists()
+    assert get_article_from_slug(tree, "embargoed") is None
+
+
+@pytest.mark.django_db
+def test_update_live_queries(tree, monkeypatch):
+    # only the queries of update_live itself are counted
+    for signal in (post_publish, post_unpublish):
+        monkeypatch.setattr(signal, "receivers", [])
+        monkeypatch.setattr(signal, "sender_receivers_cache", {})
+
+    def count_queries(count):
+        for i in range(count):
+            create_article(
+                tree=tree.get_public_object(),
+                title="Embargoed",
+                template="cms_articles/default.html",
+                language="en",
+                publication_date=now() + timedelta(hours=1),
+                published=True,
+            )
+        Article.objects.update(publication_date=now() - timedelta(seconds=1))
+        with CaptureQueriesContext(connection) as queries:
+            assert Article.objects.all().update_live() == count
+        return len(queries)
+
+    # one update per article (which is skipped, if it was updated by a concurrent run)
+    assert count_queries(3) - count_queries(1) == 2
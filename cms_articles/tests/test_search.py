@@ -0,0 +1,101 @@
+from datetime import timedelta
+
+import pytest
+from cms.api import add_plugin
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+from djangocms_text.cms_plugins import TextPlugin
+
+from cms_articles import search
+from cms_articles.api import create_article
+from cms_articles.conf import settings as articles_settings
+from cms_articles.models import Article, SearchToken
+
+
+def create(tree, title, content):
+    article = create_article(
+        tree=tree.get_public_object(), title=title, template="cms_articles/default.html", language="en"
+    )
+    add_plugin(article.placeholders.get(slot="content"), TextPlugin, "en", body="<p>{}</p>".format(content))
+    article.publish("en")
+    return article
+
+
+def found(query, language="en"):
+    return [article.publisher_public_id for article in Article.objects.search(query, language)]
+
+
+@pytest.mark.django_db
+def test_search(tree):
+    apples = create(tree, "Apples", "Red and green fruit")
+    pears = create(tree, "Pears", "Green fruit, unlike apples")
+    create(tree, "Plums", "Blue fruit")
+
+    # title matches are ranked higher than content matches
+    assert found("apples") == [apples.pk, pears.pk]
+    # all the words must match
+    assert found("green APPLES") == [apples.pk, pears.pk]
+    assert found("red apples") == [apples.pk]
+    assert found("blue apples") == []
+    assert found("") == []
+    assert found("apples", "de") == []
+
+    with CaptureQueriesContext(connection) as queries:
+        found("green fruit")
+    assert len(queries) == 1
+
+    pears.unpublish("en")
+    assert found("apples") == [apples.pk]
+    assert not SearchToken.objects.filter(article=pears.publisher_public_id).exists()
+
+
+@pytest.mark.django_db
+def test_search_scheduled(tree):
+    article = create_article(
+        tree=tree.get_public_object(),
+        title="Embargoed",
+        template="cms_articles/default.html",
+        language="en",
+        publication_date=now() + timedelta(hours=1),
+        published=True,
+    )
+    assert found("embargoed") == []
+
+    # the embargo lifts
+    Article.objects.filter(pk__in=[article.pk, article.publisher_public_id]).update(
+        publication_date=now() - timedelta(seconds=1)
+    )
+    Article.objects.all().update_live()
+    assert found("embargoed") == [article.pk]
+
+
+@pytest.mark.django_db
+def test_update_search_tokens(tree):
+    article = create(tree, "Crème brûlée", "Dessert")
+    assert found("creme brulee") == [article.pk]
+
+    # the content is indexed, when the article is published
+    add_plugin(article.placeholders.get(slot="content"), TextPlugin, "en", body="<p>Caramel</p>")
+    assert found("caramel") == []
+    Article.objects.get(pk=article.pk).publish("en")
+    assert found("caramel") == [article.pk]
+
+    weights = dict(
+        SearchToken.objects.filter(article=article.publisher_public_id).values_list("field", "weight").distinct()
+    )
+    assert weights == {"title": 10, "content": 1}
+
+
+def split_tokenize(text, language):
+    return text.split()
+
+
+def test_language_tokenizer(monkeypatch):
+    monkeypatch.setattr(
+        articles_settings, "CMS_ARTICLES_SEARCH_TOKENIZERS", {"de": "cms_articles.tests.test_search.split_tokenize"}
+    )
+    monkeypatch.setattr(search, "_tokenizers", {})
+    assert search.get_tokenizer("de-at") is split_tokenize
+    assert search.get_tokenizer("en") is search.tokenize
+    assert search.tokenize("<p>Ärger, über-Straße</p>") == ["arger", "uber", "straße"]
@@ -0,0 +1,62 @@
+import pytest
+from cms.api import add_plugin
+from djangocms_text.cms_plugins import TextPlugin
+
+from cms_articles.api import create_article, publish_articles
+
+pytest.importorskip("aldryn_search")
+
+
+@pytest.fixture
+def index():
+    from cms_articles.search_indexes import TitleIndex
+
+    class StubIndex(TitleIndex):
+        # the text of the plugins without rendering them
+        def get_plugin_search_text(self, base_plugin, request):
+            return base_plugin.get_plugin_instance()[0].body
+
+    return StubIndex()
+
+
+@pytest.mark.django_db
+def test_chunked_search_data(tree, index):
+    for i in range(3):
+        article = create_article(
+            tree=tree.get_public_object(),
+            title="Article {}".format(i),
+            template="cms_articles/default.html",
+            language="en",
+        )
+        placeholder = article.placeholders.get(slot="content")
+        first = add_plugin(placeholder, TextPlugin, "en", body="first {}".format(i))
+        add_plugin(placeholder, TextPlugin, "en", body="second {}".format(i))
+        # the first plugin is moved to the end, so that the plugin ids are not in the document order
+        first.move(placeholder.get_plugins("en").last(), pos="right")
+        article.publish("en")
+
+    titles = list(index.get_index_queryset("en"))
+    assert len(titles) == 3
+    serial = [index.get_search_data(title, "en", None) for title in titles]
+    index.prefetch_search_plugins(titles)
+    assert [index.get_search_data(title, "en", None) for title in titles] == serial
+    assert serial[0].index("second 0") < serial[0].index("first 0")
+
+
+@pytest.mark.django_db
+def test_bulk_publish_updates_index_once(tree, monkeypatch):
+    from cms_articles import search_indexes
+
+    updated = []
+    monkeypatch.setattr(search_indexes, "update_titles", updated.append)
+    articles = [
+        create_article(
+            tree=tree.get_public_object(),
+            title="Article {}".format(i),
+            template="cms_articles/default.html",
+            language="en",
+        )
+        for i in range(3)
+    ]
+    publish_articles(articles, chunk_size=10)
+    assert len(updated) == 1 and len(updated[0]) == 3
@@ -9,5 +9,6 @@ else:
     regexp = r"^(?P<slug>{})$".format(settings.CMS_ARTICLES_SLUG_REGEXP)
 
 urlpatterns = [
+    url(r"^autocomplete/$", views.autocomplete, name="autocomplete"),
     url(regexp, views.article, name="article"),
 ]
@@ -1,7 +1,43 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
-from cms.utils.page import _page_is_published
+from django.core.cache import cache
+
+from ..cache import get_generations, make_key
+from ..conf import settings
+
+
+def get_slug_candidates(tree_id, slug, mode):
+    """
+    Returns list of (article_id, language) of the articles with given slug in given tree.
+    """
+    from ..models import Title
+
+    titles = Title.objects.filter(article__tree_id=tree_id)
+
+    if mode == "draft":
+        titles = titles.filter(publisher_is_draft=True)
+    elif mode == "preview":
+        titles = titles.filter(publisher_is_draft=False)
+    else:
+        titles = titles.filter(published=True, publisher_is_draft=False, article__live=True)
+    titles = titles.filter(slug=slug)
+
+    return list(titles.values_list("article_id", "language"))
+
+
+def resolve_slug(tree_id, slug, mode):
+    """
+    Cached version of get_slug_candidates.
+    Both hits and misses are cached until some article in the tree is published,
+    unpublished, goes live, expires, is deleted, or its slug is changed.
+    """
+    key = make_key("slug", tree_id, slug, mode, *get_generations("slugs:{}".format(tree_id)))
+    candidates = cache.get(key)
+    if candidates is None:
+        candidates = get_slug_candidates(tree_id, slug, mode)
+        cache.set(key, candidates, settings.CMS_ARTICLES_SLUG_CACHE_TIMEOUT)
+    return candidates
 
 
 def get_article_from_slug(tree, slug, preview=False, draft=False):
@@ -11,21 +47,19 @@ def get_article_from_slug(tree, slug, preview=False, draft=False):
     """
     from ..models import Title
 
-    titles = Title.objects.select_related("article").filter(article__tree=tree)
-    published_only = not draft and not preview
-
     if draft:
-        titles = titles.filter(publisher_is_draft=True)
+        mode = "draft"
     elif preview:
-        titles = titles.filter(publisher_is_draft=False)
+        mode = "preview"
     else:
-        titles = titles.filter(published=True, publisher_is_draft=False)
-    titles = titles.filter(slug=slug)
+        mode = "live"
 
-    for title in titles.iterator():
-        if published_only and not _page_is_published(title.article):
+    for article_id, language in resolve_slug(tree.pk, slug, mode):
+        title = Title.objects.select_related("article").filter(article=article_id, language=language).first()
+        if title is None:
             continue
-
-        title.article.title_cache = {title.language: title}
-        return title.article
+        article = title.article
+        article.tree = tree
+        article.title_cache = {language: title}
+        return article
     return
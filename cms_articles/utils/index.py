@@ -0,0 +1,70 @@
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Q
+from django.utils.timezone import now
+
+from ..conf import settings
+
+
+def queue_titles(title_ids, using=DEFAULT_DB_ALIAS, flush=True):
+    """
+    Queues given (public) titles to be updated in the search index.
+    Unless flush is False, the queue is flushed once the current transaction is committed.
+    """
+    from ..models import IndexQueue
+
+    title_ids = set(title_ids)
+    if not title_ids:
+        return
+    queue = IndexQueue.objects.using(using)
+    # the titles queued already are only marked as modified again
+    queued = set(queue.filter(title_id__in=title_ids).values_list("title_id", flat=True))
+    if queued:
+        queue.filter(title_id__in=queued).update(modified=now())
+    queue.bulk_create([IndexQueue(title_id=title_id) for title_id in title_ids - queued], ignore_conflicts=True)
+
+    connection = connections[using]
+    if not flush:
+        return
+    if not connection.in_atomic_block:
+        flush_index_queue(using=using)
+    # flush the queue only once per transaction
+    # (Django replaces the list of commit hooks on commit and on rollback)
+    elif getattr(connection, "cms_articles_index_hooks", None) is not connection.run_on_commit:
+        connection.cms_articles_index_hooks = connection.run_on_commit
+        transaction.on_commit(lambda: flush_index_queue(using=using), using=using)
+
+
+def flush_index_queue(batch_size=None, using=DEFAULT_DB_ALIAS):
+    """
+    Updates the queued titles in the search index in batches. Returns the number of processed titles.
+    """
+    from ..models import IndexQueue
+    from ..search_indexes import update_titles
+
+    batch_size = batch_size or settings.CMS_ARTICLES_INDEX_BATCH_SIZE
+    queue = IndexQueue.objects.using(using)
+    processed = 0
+    while True:
+        started = now()
+        batch = list(queue.order_by("pk").values_list("pk", "title_id")[:batch_size])
+        if not batch:
+            return processed
+        update_titles([title_id for pk, title_id in batch])
+        # the titles queued again meanwhile stay in the queue
+        queue.filter(pk__in=[pk for pk, title_id in batch], modified__lt=started).delete()
+        processed += len(batch)
+
+
+def get_changed_titles(since):
+    """
+    Returns the public titles, which may need to be updated in the search index,
+    because their article was changed (published or unpublished) or went live or expired since given time.
+    """
+    from ..models import Title
+
+    window = (since, now())
+    return Title.objects.public().filter(
+        Q(article__changed_date__gte=since)
+        | Q(article__publication_date__range=window)
+        | Q(article__publication_end_date__range=window)
+    )
@@ -1,15 +1,50 @@
 # -*- coding: utf-8 -*-
+import os
 import warnings
 
 from cms.exceptions import DuplicatePlaceholderWarning
 from cms.utils.placeholder import _get_nodelist, _scan_placeholders, validate_placeholder_name
 from django.template.loader import get_template
 
+# the placeholders declared in templates: {template name: (source mtime, placeholders)}
+_declared_placeholders = {}
+
+
+def _get_mtime(compiled_template):
+    """
+    Returns the modification time of the template source (or None if it is not a file).
+    """
+    try:
+        return os.path.getmtime(compiled_template.origin.name)
+    except (AttributeError, OSError, TypeError, ValueError):
+        return None
+
+
+def clear_placeholders_memo(**kwargs):
+    """
+    Forgets the scanned templates (connected to the autoreload file_changed signal).
+    """
+    _declared_placeholders.clear()
 
-def get_placeholders(template):
-    from ..templatetags.cms_articles import ArticlePlaceholder
 
+def get_placeholders(template):
+    """
+    Returns the placeholders declared in given template.
+    The template is scanned only once per process, unless its source is modified.
+    """
     compiled_template = get_template(template)
+    mtime = _get_mtime(compiled_template)
+    memo = _declared_placeholders.get(template)
+    if memo is not None and memo[0] == mtime:
+        return list(memo[1])
+
+    placeholders = _scan_template(template, compiled_template)
+    _declared_placeholders[template] = (mtime, placeholders)
+    return list(placeholders)
+
+
+def _scan_template(template, compiled_template):
+    from ..templatetags.cms_articles import ArticlePlaceholder
 
     placeholders = []
     nodes = _scan_placeholders(_get_nodelist(compiled_template), ArticlePlaceholder)
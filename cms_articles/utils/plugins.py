@@ -0,0 +1,215 @@
+import hashlib
+import json
+import re
+from collections import defaultdict
+from operator import attrgetter
+
+from cms.models import CMSPlugin
+from cms.plugin_pool import plugin_pool
+from cms.utils.copy_plugins import copy_plugins_to
+
+from ..dispatch import publishing
+
+# the references to the child plugins in the text plugins (see djangocms_text.utils.plugin_to_tag)
+CHILD_REFERENCE_RE = re.compile(r'(<cms-plugin\b[^>]*?\sid=")(\d+)(")')
+
+
+def _downcast(plugins):
+    """
+    Returns the instances of the plugin models for given plugins (in the same order).
+    The plugins of unknown types are returned as they are.
+    """
+    pks_by_type = defaultdict(list)
+    for plugin in plugins:
+        pks_by_type[plugin.plugin_type].append(plugin.pk)
+    instances = {}
+    for plugin_type, pks in pks_by_type.items():
+        try:
+            model = plugin_pool.get_plugin(plugin_type).model
+        except KeyError:
+            continue
+        instances.update(model._default_manager.in_bulk(pks))
+    return [instances.get(plugin.pk, plugin) for plugin in plugins]
+
+
+def _get_content_fields(model):
+    """
+    Returns the fields of given plugin model except of the fields of CMSPlugin.
+    """
+    return [
+        field
+        for field in model._meta.concrete_fields
+        if field.model is not CMSPlugin and not (field.one_to_one and field.remote_field.parent_link)
+    ]
+
+
+def _get_related_objects(model):
+    """
+    Returns the reverse foreign keys pointing to given plugin model (e.g. inline items).
+    """
+    return [
+        rel
+        for rel in model._meta.related_objects
+        if rel.one_to_many and rel.model is not CMSPlugin and not rel.related_model._meta.auto_created
+    ]
+
+
+def _get_fingerprint(instance, children):
+    """
+    Returns hash of the content of given plugin instance including its relations.
+    The ids of its children referenced by text plugins are replaced by their types and order,
+    so that the fingerprints of a draft plugin and of its public copy are the same.
+    """
+    model = type(instance)
+    child_ids = {str(child.pk): "<{}:{}>".format(i, child.plugin_type) for i, child in enumerate(children)}
+
+    def replace(match):
+        return match.group(1) + child_ids.get(match.group(2), match.group(2)) + match.group(3)
+
+    def normalize(value):
+        if child_ids and isinstance(value, str):
+            return CHILD_REFERENCE_RE.sub(replace, value)
+        return value
+
+    content = [instance.plugin_type]
+    content += [normalize(field.value_from_object(instance)) for field in _get_content_fields(model)]
+    content += [
+        sorted(getattr(instance, field.name).values_list("pk", flat=True)) for field in model._meta.many_to_many
+    ]
+    for rel in _get_related_objects(model):
+        fields = [field.attname for field in rel.related_model._meta.concrete_fields if not field.primary_key]
+        fields.remove(rel.field.attname)
+        objects = rel.related_model._default_manager.filter(**{rel.field.name: instance}).order_by("pk")
+        content.append(list(objects.values_list(*fields)))
+    return hashlib.md5(json.dumps(content, default=str, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class PluginTree:
+    """
+    The plugins of a placeholder in a language with their fingerprints.
+    """
+
+    def __init__(self, placeholder, language):
+        self.placeholder = placeholder
+        self.language = language
+        self.children = defaultdict(list)
+        plugins = _downcast(list(placeholder.get_plugins(language)))
+        for plugin in plugins:
+            self.children[plugin.parent_id].append(plugin)
+        for siblings in self.children.values():
+            # the plugins are rendered in the order of their position
+            siblings.sort(key=attrgetter("position"))
+        self.fingerprints = {plugin.pk: _get_fingerprint(plugin, self.children[plugin.pk]) for plugin in plugins}
+
+    def get_children(self, plugin):
+        return self.children[plugin.pk if plugin else None]
+
+
+def _match_children(source_tree, target_tree, source_parent, target_parent):
+    """
+    Pairs the children of given source and target plugins.
+    Returns tuple of lists: unchanged (target, source) pairs, changed (target, source) pairs,
+    source plugins to be inserted and target plugins to be deleted.
+    """
+    targets = target_tree.get_children(target_parent)
+    by_fingerprint = defaultdict(list)
+    for plugin in targets:
+        by_fingerprint[target_tree.fingerprints[plugin.pk]].append(plugin)
+
+    unchanged, changed, inserted = [], [], []
+    unmatched = []
+    for plugin in source_tree.get_children(source_parent):
+        candidates = by_fingerprint[source_tree.fingerprints[plugin.pk]]
+        if candidates:
+            unchanged.append((candidates.pop(0), plugin))
+        else:
+            unmatched.append(plugin)
+
+    # the remaining plugins of the same type are updated
+    matched = {target.pk for target, source in unchanged}
+    by_type = defaultdict(list)
+    for plugin in targets:
+        if plugin.pk not in matched:
+            by_type[plugin.plugin_type].append(plugin)
+    for plugin in unmatched:
+        candidates = by_type[plugin.plugin_type]
+        if candidates:
+            changed.append((candidates.pop(0), plugin))
+        else:
+            inserted.append(plugin)
+
+    deleted = [plugin for plugins in by_type.values() for plugin in plugins]
+    return unchanged, changed, inserted, deleted
+
+
+def _update_plugin(target, source):
+    for field in _get_content_fields(type(source)):
+        setattr(target, field.attname, getattr(source, field.attname))
+    target.position = source.position
+    target._no_reorder = True
+    target.save()
+    # the relations are copied from scratch
+    for field in type(target)._meta.many_to_many:
+        getattr(target, field.name).clear()
+    for rel in _get_related_objects(type(target)):
+        rel.related_model._default_manager.filter(**{rel.field.name: target}).delete()
+    target.copy_relations(source)
+
+
+def sync_plugins(source, target, language):
+    """
+    Makes the plugins of the target placeholder in given language the same as the plugins of the source placeholder.
+
+    The plugin trees are compared using fingerprints of the plugins
+    and only the plugins, which differ, are inserted, updated, moved (within the same parent) or deleted.
+    If nothing has changed, the target plugins are left untouched.
+
+    Returns list of (target plugin, source plugin) tuples.
+    """
+    source_tree = PluginTree(source, language)
+    target_tree = PluginTree(target, language)
+
+    pairs, updated, inserted, deleted = [], [], [], []
+    parents = [(None, None)]
+    while parents:
+        target_parent, source_parent = parents.pop()
+        unchanged, changed, new, old = _match_children(source_tree, target_tree, source_parent, target_parent)
+        pairs += unchanged + changed
+        updated += changed
+        inserted += [(plugin, target_parent) for plugin in new]
+        deleted += old
+        parents += unchanged + changed
+
+    with publishing():
+        for target_plugin, source_plugin in updated:
+            _update_plugin(target_plugin, source_plugin)
+
+        if deleted:
+            # treebeard deletes the descendants too and updates the parents
+            CMSPlugin.objects.filter(pk__in=[plugin.pk for plugin in deleted]).delete()
+
+        for plugin, target_parent in inserted:
+            subtree = CMSPlugin.objects.filter(
+                placeholder=source, language=language, path__startswith=plugin.path
+            ).order_by("path")
+            pairs += copy_plugins_to(
+                list(subtree),
+                target,
+                to_language=language,
+                parent_plugin_id=target_parent.pk if target_parent else None,
+                no_signals=True,
+            )
+
+        # move the plugins within their parents
+        positions = dict(CMSPlugin.objects.filter(pk__in=[t.pk for t, s in pairs]).values_list("pk", "position"))
+        for target_plugin, source_plugin in pairs:
+            if positions[target_plugin.pk] != source_plugin.position:
+                CMSPlugin.objects.filter(pk=target_plugin.pk).update(position=source_plugin.position)
+
+        # fix references to the children (e.g. in text plugins)
+        for target_plugin, source_plugin in updated:
+            instance = type(target_plugin)._default_manager.get(pk=target_plugin.pk)
+            instance._no_reorder = True
+            instance.post_copy(source_plugin, pairs)
+
+    return pairs
@@ -12,11 +12,15 @@ from cms.utils.moderator import use_draft
 from cms.views import details as page
 from django.conf import settings
 from django.contrib.auth.views import redirect_to_login
-from django.http import HttpResponseRedirect
+from django.contrib.sites.shortcuts import get_current_site
+from django.http import HttpResponseRedirect, JsonResponse
+from django.utils.cache import add_never_cache_headers, patch_cache_control, patch_vary_headers
 from django.utils.http import urlquote
 from django.utils.translation import get_language_from_request
 
 from .article_rendering import render_article
+from .conf import settings as articles_settings
+from .search import autocomplete as autocomplete_titles
 from .utils.article import get_article_from_slug
 
 
@@ -119,3 +123,39 @@ def article(request, slug):
     if article.has_change_permission(request) and structure_requested:
         return render_object_structure(request, article)
     return render_article(request, article, current_language=request_language, slug=slug)
+
+
+def autocomplete(request):
+    """
+    Returns JSON with the titles starting with the words of the query (parameter q) in the current site.
+    The staff members may get the draft titles using the parameter drafts.
+    """
+    query = request.GET.get("q", "")
+    language = request.GET.get("language") or get_language_from_request(request)
+    try:
+        limit = min(int(request.GET["limit"]), articles_settings.CMS_ARTICLES_AUTOCOMPLETE_LIMIT)
+    except (KeyError, ValueError):
+        limit = articles_settings.CMS_ARTICLES_AUTOCOMPLETE_LIMIT
+    user = getattr(request, "user", None)
+    drafts = "drafts" in request.GET and user is not None and user.has_perm("cms_articles.change_article")
+
+    titles = autocomplete_titles(query, language, get_current_site(request), drafts, max(limit, 1))
+    response = JsonResponse(
+        {
+            "results": [
+                {
+                    "id": title.article_id,
+                    "title": title.title,
+                    "url": title.article.get_absolute_url(title.language, fallback=False),
+                }
+                for title in titles
+            ]
+        }
+    )
+    if drafts:
+        add_never_cache_headers(response)
+        patch_cache_control(response, private=True)
+    else:
+        patch_cache_control(response, public=True, max_age=articles_settings.CMS_ARTICLES_AUTOCOMPLETE_CACHE_TIMEOUT)
+        patch_vary_headers(response, ["Accept-Language"])
+    return response